@@ -0,0 +1,66 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "interval_program",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("repeat_count", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("current_phase_index", sa.Integer(), nullable=True),
+        sa.Column("current_round", sa.Integer(), nullable=True),
+        sa.Column("phase_started_at", sa.DateTime(), nullable=True),
+        sa.Column("phase_deadline", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_interval_program_status", "interval_program", ["status"], unique=False)
+
+    op.create_table(
+        "program_phase",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("program_id", sa.UUID(), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("kind", sa.String(50), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["program_id"],
+            ["interval_program.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_program_phase_program_id", "program_phase", ["program_id"], unique=False)
+
+    op.add_column("timer", sa.Column("program_id", sa.UUID(), nullable=True))
+    op.create_foreign_key(
+        "fk_timer_program_id",
+        "timer",
+        "interval_program",
+        ["program_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_index("ix_timer_program_id", "timer", ["program_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_program_id", table_name="timer")
+    op.drop_constraint("fk_timer_program_id", "timer", type_="foreignkey")
+    op.drop_column("timer", "program_id")
+
+    op.drop_index("ix_program_phase_program_id", table_name="program_phase")
+    op.drop_table("program_phase")
+
+    op.drop_index("ix_interval_program_status", table_name="interval_program")
+    op.drop_table("interval_program")
@@ -0,0 +1,48 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("timer_event", sa.Column("remaining_seconds", sa.Integer(), nullable=True))
+    op.add_column("timer_event", sa.Column("duration_seconds", sa.Integer(), nullable=True))
+    op.add_column("timer_event", sa.Column("sequence", sa.Integer(), nullable=True))
+    op.create_unique_constraint("uq_timer_event_sequence", "timer_event", ["timer_id", "sequence"])
+
+    op.create_table(
+        "timer_checkpoint",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("timer_id", sa.UUID(), nullable=False),
+        sa.Column("sequence", sa.Integer(), nullable=False),
+        sa.Column("duration_seconds", sa.Integer(), nullable=False),
+        sa.Column("remaining_seconds", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("paused_at", sa.DateTime(), nullable=True),
+        sa.Column("reset_count", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["timer_id"],
+            ["timer.id"],
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_timer_checkpoint_timer_sequence", "timer_checkpoint", ["timer_id", "sequence"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_checkpoint_timer_sequence", table_name="timer_checkpoint")
+    op.drop_table("timer_checkpoint")
+
+    op.drop_constraint("uq_timer_event_sequence", "timer_event", type_="unique")
+    op.drop_column("timer_event", "sequence")
+    op.drop_column("timer_event", "duration_seconds")
+    op.drop_column("timer_event", "remaining_seconds")
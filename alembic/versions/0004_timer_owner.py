@@ -0,0 +1,18 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("timer", sa.Column("owner_id", sa.String(255), nullable=True))
+    op.create_index("ix_timer_owner_created", "timer", ["owner_id", "created_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_owner_created", table_name="timer")
+    op.drop_column("timer", "owner_id")
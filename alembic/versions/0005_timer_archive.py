@@ -0,0 +1,50 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "timer_archive",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("name", sa.String(255), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=False),
+        sa.Column("remaining_seconds", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("paused_at", sa.DateTime(), nullable=True),
+        sa.Column("reset_count", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(50), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("program_id", sa.UUID(), nullable=True),
+        sa.Column("owner_id", sa.String(255), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "timer_event_archive",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("timer_id", sa.UUID(), nullable=False),
+        sa.Column("event_type", sa.String(50), nullable=False),
+        sa.Column("urgency_level", sa.Integer(), nullable=True),
+        sa.Column("recorded_at", sa.DateTime(), nullable=True),
+        sa.Column("remaining_seconds", sa.Integer(), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("sequence", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_timer_event_archive_timer", "timer_event_archive", ["timer_id"], unique=False)
+    # The reaper looks for timers by last update.
+    op.create_index("ix_timer_updated_at", "timer", ["updated_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_updated_at", table_name="timer")
+    op.drop_index("ix_timer_event_archive_timer", table_name="timer_event_archive")
+    op.drop_table("timer_event_archive")
+    op.drop_table("timer_archive")
@@ -0,0 +1,16 @@
+from alembic import op
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Incremental exports and cache refreshes range-scan events by time.
+    op.create_index("ix_timer_event_recorded_at", "timer_event", ["recorded_at"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_event_recorded_at", table_name="timer_event")
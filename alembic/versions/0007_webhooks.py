@@ -0,0 +1,50 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "webhook_subscription",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("timer_id", sa.UUID(), nullable=False),
+        sa.Column("url", sa.String(2048), nullable=False),
+        sa.Column("events", sa.String(255), nullable=False),
+        sa.Column("secret", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["timer_id"], ["timer.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_webhook_subscription_timer_id", "webhook_subscription", ["timer_id"], unique=False
+    )
+    op.create_table(
+        "webhook_delivery",
+        sa.Column("id", sa.UUID(), nullable=False),
+        sa.Column("subscription_id", sa.UUID(), nullable=False),
+        sa.Column("event", sa.String(50), nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.String(255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["subscription_id"], ["webhook_subscription.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_webhook_delivery_next_attempt", "webhook_delivery", ["next_attempt_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_webhook_delivery_next_attempt", table_name="webhook_delivery")
+    op.drop_table("webhook_delivery")
+    op.drop_index("ix_webhook_subscription_timer_id", table_name="webhook_subscription")
+    op.drop_table("webhook_subscription")
@@ -0,0 +1,18 @@
+from alembic import op
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Timelines look up a timer's latest event and read its events in order.
+    op.create_index(
+        "ix_timer_event_timer_recorded", "timer_event", ["timer_id", "recorded_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_timer_event_timer_recorded", table_name="timer_event")
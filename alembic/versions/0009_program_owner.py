@@ -0,0 +1,16 @@
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("interval_program", sa.Column("owner_id", sa.String(255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("interval_program", "owner_id")
@@ -16,6 +16,62 @@ class Settings(BaseSettings):
     cors_origins: list[str] = Field(default=["http://localhost:5173", "http://localhost:3000"], env="CORS_ORIGINS")
     api_version: str = "v1"
     environment: str = Field(default="development", env="ENVIRONMENT")
+    schema_mode: str = Field(default="create_all", env="SCHEMA_MODE")
+    batch_max_commands: int = Field(default=500, env="BATCH_MAX_COMMANDS")
+    snapshot_path: str = Field(default="var/timer_snapshot.bin", env="SNAPSHOT_PATH")
+    snapshot_interval_seconds: float = Field(default=30.0, env="SNAPSHOT_INTERVAL_SECONDS")
+    event_sourced: bool = Field(default=False, env="EVENT_SOURCED")
+    checkpoint_interval: int = Field(default=50, env="CHECKPOINT_INTERVAL")
+    db_pool_size: int = Field(default=5, env="DB_POOL_SIZE")
+    db_max_overflow: int = Field(default=10, env="DB_MAX_OVERFLOW")
+    health_check_interval_seconds: float = Field(default=5.0, env="HEALTH_CHECK_INTERVAL_SECONDS")
+    health_require_database: bool = Field(default=False, env="HEALTH_REQUIRE_DATABASE")
+    repo_offload_threads: int = Field(default=0, env="REPO_OFFLOAD_THREADS")
+    admin_token: Optional[str] = Field(default=None, env="ADMIN_TOKEN")
+    compression_minimum_bytes: int = Field(default=1024, env="COMPRESSION_MINIMUM_BYTES")
+    rate_limit_enabled: bool = Field(default=True, env="RATE_LIMIT_ENABLED")
+    rate_limit_read_per_second: float = Field(default=20.0, env="RATE_LIMIT_READ_PER_SECOND")
+    rate_limit_read_burst: int = Field(default=40, env="RATE_LIMIT_READ_BURST")
+    rate_limit_command_per_second: float = Field(default=2.0, env="RATE_LIMIT_COMMAND_PER_SECOND")
+    rate_limit_command_burst: int = Field(default=10, env="RATE_LIMIT_COMMAND_BURST")
+    rate_limit_idle_seconds: float = Field(default=300.0, env="RATE_LIMIT_IDLE_SECONDS")
+    # Anonymous clients share a bucket per address, e.g. every display behind one NAT
+    rate_limit_anonymous: bool = Field(default=False, env="RATE_LIMIT_ANONYMOUS")
+    rate_limit_trusted_proxies: list[str] = Field(default=[], env="RATE_LIMIT_TRUSTED_PROXIES")
+    auth_enabled: bool = Field(default=False, env="AUTH_ENABLED")
+    auth_token_cache_size: int = Field(default=10000, env="AUTH_TOKEN_CACHE_SIZE")
+    db_connect_timeout_seconds: float = Field(default=2.0, env="DB_CONNECT_TIMEOUT_SECONDS")
+    db_circuit_failure_threshold: int = Field(default=3, env="DB_CIRCUIT_FAILURE_THRESHOLD")
+    db_circuit_reset_seconds: float = Field(default=5.0, env="DB_CIRCUIT_RESET_SECONDS")
+    command_journal_size: int = Field(default=1000, env="COMMAND_JOURNAL_SIZE")
+    archive_enabled: bool = Field(default=False, env="ARCHIVE_ENABLED")
+    archive_after_hours: float = Field(default=168.0, env="ARCHIVE_AFTER_HOURS")
+    archive_batch_size: int = Field(default=500, env="ARCHIVE_BATCH_SIZE")
+    archive_max_batches: int = Field(default=20, env="ARCHIVE_MAX_BATCHES")
+    archive_batch_pause_seconds: float = Field(default=0.5, env="ARCHIVE_BATCH_PAUSE_SECONDS")
+    archive_interval_seconds: float = Field(default=600.0, env="ARCHIVE_INTERVAL_SECONDS")
+    export_dir: str = Field(default="var/export", env="EXPORT_DIR")
+    export_batch_size: int = Field(default=10000, env="EXPORT_BATCH_SIZE")
+    export_settle_seconds: float = Field(default=60.0, env="EXPORT_SETTLE_SECONDS")
+    export_grace_seconds: float = Field(default=900.0, env="EXPORT_GRACE_SECONDS")
+    leaderboard_reconcile_seconds: float = Field(default=300.0, env="LEADERBOARD_RECONCILE_SECONDS")
+    leaderboard_min_intervals: int = Field(default=3, env="LEADERBOARD_MIN_INTERVALS")
+    face_intensity_steps: int = Field(default=20, env="FACE_INTENSITY_STEPS")
+    timeline_cache_size: int = Field(default=500, env="TIMELINE_CACHE_SIZE")
+    timeline_max_points: int = Field(default=2000, env="TIMELINE_MAX_POINTS")
+    timeline_default_points: int = Field(default=300, env="TIMELINE_DEFAULT_POINTS")
+    webhooks_enabled: bool = Field(default=True, env="WEBHOOKS_ENABLED")
+    webhook_poll_interval_seconds: float = Field(default=0.5, env="WEBHOOK_POLL_INTERVAL_SECONDS")
+    webhook_batch_size: int = Field(default=200, env="WEBHOOK_BATCH_SIZE")
+    webhook_max_concurrency: int = Field(default=10, env="WEBHOOK_MAX_CONCURRENCY")
+    webhook_timeout_seconds: float = Field(default=5.0, env="WEBHOOK_TIMEOUT_SECONDS")
+    webhook_max_attempts: int = Field(default=8, env="WEBHOOK_MAX_ATTEMPTS")
+    # Hosts allowed to resolve to private addresses, for internal receivers
+    webhook_allowed_hosts: list[str] = Field(default=[], env="WEBHOOK_ALLOWED_HOSTS")
+    webhook_retired_retention_hours: float = Field(default=72.0, env="WEBHOOK_RETIRED_RETENTION_HOURS")
+    shard_socket_dir: Optional[str] = Field(default=None, env="SHARD_SOCKET_DIR")
+    shard_refresh_seconds: float = Field(default=2.0, env="SHARD_REFRESH_SECONDS")
+    sql_statement_budget: int = Field(default=25, env="SQL_STATEMENT_BUDGET")
 
     class Config:
         env_file = ".env"
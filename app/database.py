@@ -10,16 +10,34 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from app.config import get_settings
+from app.services.metrics import instrument_engine
 
 
 settings = get_settings()
 
 
+database_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
+# SQLite stand-ins (benchmarks, local runs) do not use a sized pool.
+# Connection attempts and pool waits are capped so an unreachable server
+# trips the circuit breaker quickly instead of hanging requests.
+pool_options = (
+    {}
+    if database_url.startswith("sqlite")
+    else {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_connect_timeout_seconds,
+        "connect_args": {"timeout": settings.db_connect_timeout_seconds},
+    }
+)
+
 async_engine = create_async_engine(
-    settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
+    database_url,
     echo=settings.debug,
     pool_pre_ping=True,
+    **pool_options,
 )
+instrument_engine(async_engine)
 
 async_session_factory = async_sessionmaker(
     async_engine,
@@ -29,7 +47,11 @@ async_session_factory = async_sessionmaker(
 
 
 async def get_session() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get async database session."""
+    """Dependency to get async database session.
+
+    No connection is made until the session is first used, so routes that
+    can degrade decide what to do before touching the database.
+    """
     async with async_session_factory() as session:
         yield session
 
@@ -43,6 +65,10 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
 
 Base = sa.orm.declarative_base()
 
+# Alembic head the models match; tests keep it in step with alembic/versions
+# so startup never has to import Alembic to find it.
+SCHEMA_REVISION = "0009"
+
 
 async def init_db() -> None:
     """Initialize database tables."""
@@ -50,6 +76,24 @@ async def init_db() -> None:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def check_schema_version() -> None:
+    """Fail fast unless the database is migrated to the Alembic head.
+
+    One query in place of the per-table catalog checks of ``init_db``.
+    """
+    expected = SCHEMA_REVISION
+    async with async_engine.connect() as conn:
+        try:
+            current = (await conn.execute(sa.text("SELECT version_num FROM alembic_version"))).scalar()
+        except sa.exc.DBAPIError:
+            current = None
+    if current != expected:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {expected}; "
+            "run `alembic upgrade head`"
+        )
+
+
 async def drop_db() -> None:
     """Drop all database tables."""
     async with async_engine.begin() as conn:
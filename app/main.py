@@ -4,8 +4,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.database import init_db, close_db
-from app.routers import timer, urgency
+from app.database import check_schema_version, close_db, init_db
+from app.middleware import (
+    CompressionMiddleware,
+    MetricsMiddleware,
+    QueryBudgetMiddleware,
+    RateLimitMiddleware,
+)
+from app.routers import admin, clock, face, health, leaderboard, metrics, program, timeline, timer, webhooks
+from app.services.auth import authenticator
+from app.services.degraded import command_journal
+from app.services.health import health_monitor
+from app.services.leaderboard import leaderboards
+from app.services.offload import configure_repo_executor
+from app.services.program_engine import program_engine
+from app.services.rate_limit import command_limiter, read_limiter
+from app.services.reaper import timer_reaper
+from app.services.sharding import shard_node
+from app.services.timer_cache import timer_cache
+from app.services.webhooks import webhook_dispatcher
 
 
 settings = get_settings()
@@ -14,8 +31,35 @@ settings = get_settings()
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup on app startup/shutdown."""
-    await init_db()
+    if settings.schema_mode == "migrations":
+        await check_schema_version()
+    else:
+        await init_db()
+    configure_repo_executor(
+        settings.database_url, settings.repo_offload_threads, settings.db_connect_timeout_seconds
+    )
+    await timer_cache.start()
+    await command_journal.start(timer.run_journaled)
+    await leaderboards.start()
+    await program_engine.start()
+    if shard_node is not None:
+        await shard_node.start()
+    await health_monitor.start()
+    if settings.archive_enabled or settings.webhooks_enabled:
+        await timer_reaper.start()
+    if settings.webhooks_enabled:
+        await webhook_dispatcher.start()
     yield
+    await webhook_dispatcher.stop()
+    await timer_reaper.stop()
+    await health_monitor.stop()
+    if shard_node is not None:
+        await shard_node.stop()
+    await program_engine.stop()
+    await leaderboards.stop()
+    await command_journal.stop()
+    await timer_cache.stop()
+    configure_repo_executor(settings.database_url, 0)
     await close_db()
 
 
@@ -25,6 +69,22 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_minimum_bytes)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(
+    QueryBudgetMiddleware,
+    budget=settings.sql_statement_budget,
+    server_timing=settings.debug,
+)
+app.add_middleware(
+    RateLimitMiddleware,
+    reads=read_limiter,
+    commands=command_limiter,
+    authenticator=authenticator if settings.auth_enabled else None,
+    limit_anonymous=settings.rate_limit_anonymous,
+    trusted_proxies=settings.rate_limit_trusted_proxies,
+)
+# Added last so it is outermost: 429s and other early responses still carry CORS headers.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
@@ -33,11 +93,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.include_router(timer.router, prefix="/api/timer", tags=["timer"])
-app.include_router(urgency.router, prefix="/api/urgency", tags=["urgency"])
+app.include_router(timer.router)
+app.include_router(program.router)
+app.include_router(leaderboard.router)
+app.include_router(webhooks.router)
+app.include_router(timeline.router)
+app.include_router(face.router)
+app.include_router(clock.router)
+app.include_router(metrics.router)
+app.include_router(health.router)
+app.include_router(admin.router)
 
 
 @app.get("/health", tags=["health"])
 async def health_check() -> dict[str, str]:
-    """Health check endpoint."""
+    """Health check endpoint; see /health/ready for dependency checks."""
     return {"status": "ok"}
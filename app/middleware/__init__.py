@@ -0,0 +1,6 @@
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.query_budget import QueryBudgetMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+
+__all__ = ["CompressionMiddleware", "MetricsMiddleware", "QueryBudgetMiddleware", "RateLimitMiddleware"]
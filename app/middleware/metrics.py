@@ -0,0 +1,42 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import http_request_seconds
+
+
+class MetricsMiddleware:
+    """Records request latency per route template.
+
+    A plain ASGI middleware rather than ``BaseHTTPMiddleware`` so the
+    response is not buffered through an extra task per request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """Wrap an ASGI app."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route in the scope; unmatched
+            # paths share one label to keep cardinality bounded.
+            route = scope.get("route")
+            http_request_seconds.observe(
+                time.perf_counter() - started,
+                (scope["method"], route.path if route else "unmatched", str(status_code)),
+            )
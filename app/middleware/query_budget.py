@@ -0,0 +1,58 @@
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.metrics import QueryStats, current_query_stats
+
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """Counts SQL statements per request and flags routes over budget.
+
+    Statements are collected by the engine hooks in ``instrument_engine``.
+    With ``server_timing`` on, the count and DB time are returned in a
+    ``Server-Timing`` header. A request that runs more than ``budget``
+    statements logs a warning naming its most repeated statement, which is
+    usually the N+1 query.
+    """
+
+    def __init__(self, app: ASGIApp, budget: int, server_timing: bool = False):
+        """Wrap an ASGI app."""
+        self.app = app
+        self.budget = budget
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if self.server_timing and message["type"] == "http.response.start":
+                timing = f'db;dur={stats.seconds * 1000:.2f};desc="{stats.statements} statements"'
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            if stats.statements > self.budget:
+                route = scope.get("route")
+                statement, repeats = stats.most_repeated()
+                logger.warning(
+                    "%s %s ran %d SQL statements (budget %d); most repeated x%d: %s",
+                    scope["method"],
+                    route.path if route else scope["path"],
+                    stats.statements,
+                    self.budget,
+                    repeats,
+                    " ".join(statement.split())[:200],
+                )
@@ -0,0 +1,110 @@
+import ipaddress
+import json
+from typing import Hashable, Iterable, Optional
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.services.auth import Authenticator
+from app.services.rate_limit import TokenBucketLimiter, retry_after_header
+
+
+READ_METHODS = frozenset({"GET", "HEAD"})
+
+
+class RateLimitMiddleware:
+    """Token-bucket limits per client on ``/api`` routes.
+
+    Reads and commands have separate buckets, so a kiosk polling hard never
+    starves its own commands and a command loop is throttled well before it
+    floods the event log. With an ``authenticator`` clients holding a
+    valid bearer token are keyed by its subject. Anonymous clients are only
+    limited with ``limit_anonymous``, keyed by address since any header
+    they choose could mint a fresh bucket; every display behind one NAT
+    shares that address, so it is off by default. Behind ``trusted_proxies``
+    the address is the client they forwarded for in ``X-Forwarded-For``.
+    CORS preflights are never charged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        reads: TokenBucketLimiter,
+        commands: TokenBucketLimiter,
+        authenticator: Optional[Authenticator] = None,
+        limit_anonymous: bool = False,
+        trusted_proxies: Iterable[str] = (),
+    ):
+        """Wrap an ASGI app; ``trusted_proxies`` are addresses or CIDR networks."""
+        self.app = app
+        self.reads = reads
+        self.commands = commands
+        self.authenticator = authenticator
+        self.limit_anonymous = limit_anonymous
+        self.trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in trusted_proxies]
+
+    def _trusted(self, address: str) -> bool:
+        try:
+            ip = ipaddress.ip_address(address)
+        except ValueError:
+            return False
+        return any(ip in network for network in self.trusted_proxies)
+
+    def client_address(self, scope: Scope) -> str:
+        """Peer address, or the nearest untrusted hop a trusted proxy forwarded for."""
+        client = scope.get("client")
+        address = client[0] if client else "unknown"
+        if not self._trusted(address):
+            return address
+        forwarded = ",".join(Headers(scope=scope).getlist("x-forwarded-for"))
+        for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+            address = hop
+            if not self._trusted(hop):
+                break
+        return address
+
+    def client_key(self, scope: Scope) -> Optional[Hashable]:
+        """Bucket key: the authenticated subject, else the client address.
+
+        None for anonymous clients when they are not limited.
+        """
+        if self.authenticator is not None:
+            scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                try:
+                    return ("subject", self.authenticator.authenticate(token).subject)
+                except ValueError:
+                    pass
+        if not self.limit_anonymous:
+            return None
+        return ("address", self.client_address(scope))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith("/api/")
+            or scope["method"] == "OPTIONS"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        key = self.client_key(scope)
+        limiter = self.reads if scope["method"] in READ_METHODS else self.commands
+        wait = limiter.acquire(key) if key is not None else 0.0
+        if not wait:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Rate limit exceeded"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", retry_after_header(wait).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,16 @@
+from app.models.timer import Timer, TimerCheckpoint, TimerEvent
+from app.models.program import IntervalProgram, ProgramPhase
+from app.models.archive import TimerArchive, TimerEventArchive
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+
+__all__ = [
+    "Timer",
+    "TimerCheckpoint",
+    "TimerEvent",
+    "IntervalProgram",
+    "ProgramPhase",
+    "TimerArchive",
+    "TimerEventArchive",
+    "WebhookDelivery",
+    "WebhookSubscription",
+]
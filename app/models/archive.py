@@ -0,0 +1,41 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Uuid, Index
+from app.database import Base
+
+
+class TimerArchive(Base):
+    """Timer row moved out of ``timer`` after going untouched for the retention period.
+
+    No foreign keys or secondary indexes, so archiving costs one insert per
+    row and the archive never slows down writes to the hot tables.
+    """
+    __tablename__ = "timer_archive"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True)
+    name = Column(String(255))
+    duration_seconds = Column(Integer, nullable=False)
+    remaining_seconds = Column(Integer, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    paused_at = Column(DateTime, nullable=True)
+    reset_count = Column(Integer)
+    status = Column(String(50))
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    program_id = Column(Uuid(as_uuid=True), nullable=True)
+    owner_id = Column(String(255), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow)
+
+
+class TimerEventArchive(Base):
+    """Event of an archived timer, kept for history queries."""
+    __tablename__ = "timer_event_archive"
+    __table_args__ = (Index("ix_timer_event_archive_timer", "timer_id"),)
+
+    id = Column(Uuid(as_uuid=True), primary_key=True)
+    timer_id = Column(Uuid(as_uuid=True), nullable=False)
+    event_type = Column(String(50), nullable=False)
+    urgency_level = Column(Integer)
+    recorded_at = Column(DateTime)
+    remaining_seconds = Column(Integer, nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+    sequence = Column(Integer, nullable=True)
@@ -0,0 +1,70 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Uuid, ForeignKey
+from sqlalchemy.orm import relationship
+import uuid
+from app.database import Base
+
+
+class IntervalProgram(Base):
+    """Ordered work/rest phases repeated for a group of station timers."""
+    __tablename__ = "interval_program"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    name = Column(String(255), default="Intervals")
+    repeat_count = Column(Integer, nullable=False, default=1)
+    status = Column(String(50), default="stopped")
+    current_phase_index = Column(Integer, default=0)
+    current_round = Column(Integer, default=0)
+    phase_started_at = Column(DateTime, nullable=True)
+    phase_deadline = Column(DateTime, nullable=True)
+    owner_id = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    phases = relationship(
+        "ProgramPhase",
+        back_populates="program",
+        cascade="all, delete-orphan",
+        order_by="ProgramPhase.position",
+        lazy="selectin",
+    )
+    timers = relationship("Timer", back_populates="program")
+
+    def to_dict(self) -> dict:
+        """Convert program to dictionary."""
+        return {
+            "id": str(self.id),
+            "name": self.name,
+            "repeat_count": self.repeat_count,
+            "status": self.status,
+            "current_phase_index": self.current_phase_index,
+            "current_round": self.current_round,
+            "phase_started_at": self.phase_started_at.isoformat() if self.phase_started_at else None,
+            "phase_deadline": self.phase_deadline.isoformat() if self.phase_deadline else None,
+            "phases": [phase.to_dict() for phase in self.phases],
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+        }
+
+
+class ProgramPhase(Base):
+    """Single work or rest interval within a program."""
+    __tablename__ = "program_phase"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    program_id = Column(Uuid(as_uuid=True), ForeignKey("interval_program.id", ondelete="CASCADE"), nullable=False)
+    position = Column(Integer, nullable=False)
+    name = Column(String(255), default="Work")
+    kind = Column(String(50), default="work")
+    duration_seconds = Column(Integer, nullable=False)
+
+    program = relationship("IntervalProgram", back_populates="phases")
+
+    def to_dict(self) -> dict:
+        """Convert phase to dictionary."""
+        return {
+            "position": self.position,
+            "name": self.name,
+            "kind": self.kind,
+            "duration_seconds": self.duration_seconds,
+        }
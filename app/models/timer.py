@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, UUID, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Uuid, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 import uuid
 from app.database import Base
@@ -8,8 +8,12 @@ from app.database import Base
 class Timer(Base):
     """Countdown timer state for workout sessions."""
     __tablename__ = "timer"
+    __table_args__ = (
+        Index("ix_timer_owner_created", "owner_id", "created_at"),
+        Index("ix_timer_updated_at", "updated_at"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(255), default="Workout")
     duration_seconds = Column(Integer, nullable=False)
     remaining_seconds = Column(Integer, nullable=False)
@@ -19,8 +23,12 @@ class Timer(Base):
     status = Column(String(50), default="stopped")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    program_id = Column(Uuid(as_uuid=True), ForeignKey("interval_program.id", ondelete="SET NULL"), nullable=True)
+    # Token subject of the creator; NULL for timers created without auth
+    owner_id = Column(String(255), nullable=True)
 
     events = relationship("TimerEvent", back_populates="timer", cascade="all, delete-orphan")
+    program = relationship("IntervalProgram", back_populates="timers")
 
     def to_dict(self) -> dict:
         """Convert timer to dictionary."""
@@ -41,12 +49,22 @@ class Timer(Base):
 class TimerEvent(Base):
     """Log of reset and state transitions for tracking workout cadence."""
     __tablename__ = "timer_event"
+    __table_args__ = (
+        UniqueConstraint("timer_id", "sequence", name="uq_timer_event_sequence"),
+        Index("ix_timer_event_recorded_at", "recorded_at"),
+        Index("ix_timer_event_timer_recorded", "timer_id", "recorded_at"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    timer_id = Column(UUID(as_uuid=True), ForeignKey("timer.id", ondelete="CASCADE"), nullable=False)
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    timer_id = Column(Uuid(as_uuid=True), ForeignKey("timer.id", ondelete="CASCADE"), nullable=False)
     event_type = Column(String(50), nullable=False)
     urgency_level = Column(Integer, default=0)
     recorded_at = Column(DateTime, default=datetime.utcnow)
+    # State after the transition, so history can be replayed
+    remaining_seconds = Column(Integer, nullable=True)
+    duration_seconds = Column(Integer, nullable=True)
+    # Per-timer position in event-sourced mode
+    sequence = Column(Integer, nullable=True)
 
     timer = relationship("Timer", back_populates="events")
 
@@ -57,5 +75,24 @@ class TimerEvent(Base):
             "timer_id": str(self.timer_id),
             "event_type": self.event_type,
             "urgency_level": self.urgency_level,
+            "remaining_seconds": self.remaining_seconds,
+            "duration_seconds": self.duration_seconds,
+            "sequence": self.sequence,
             "recorded_at": self.recorded_at.isoformat(),
         }
+
+
+class TimerCheckpoint(Base):
+    """Folded timer state as of an event sequence number."""
+    __tablename__ = "timer_checkpoint"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    timer_id = Column(Uuid(as_uuid=True), ForeignKey("timer.id", ondelete="CASCADE"), nullable=False)
+    sequence = Column(Integer, nullable=False)
+    duration_seconds = Column(Integer, nullable=False)
+    remaining_seconds = Column(Integer, nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    paused_at = Column(DateTime, nullable=True)
+    reset_count = Column(Integer, default=0)
+    status = Column(String(50), nullable=False)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Uuid, ForeignKey, Index
+import uuid
+from app.database import Base
+
+
+class WebhookSubscription(Base):
+    """Endpoint notified of selected transitions of one timer."""
+    __tablename__ = "webhook_subscription"
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    timer_id = Column(
+        Uuid(as_uuid=True), ForeignKey("timer.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    url = Column(String(2048), nullable=False)
+    # Comma-separated webhook event names
+    events = Column(String(255), nullable=False)
+    # Signs deliveries with HMAC-SHA256 when set
+    secret = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    def to_dict(self) -> dict:
+        """Convert subscription to dictionary, without its secret."""
+        return {
+            "id": str(self.id),
+            "timer_id": str(self.timer_id),
+            "url": self.url,
+            "events": self.events.split(","),
+            "signed": self.secret is not None,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+class WebhookDelivery(Base):
+    """Outbox row for a notification, written in the transaction of its transition.
+
+    Removed once delivered. ``next_attempt_at`` is NULL after the last
+    retry failed, leaving the row for inspection until the reaper prunes it.
+    """
+    __tablename__ = "webhook_delivery"
+    __table_args__ = (Index("ix_webhook_delivery_next_attempt", "next_attempt_at"),)
+
+    id = Column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    subscription_id = Column(
+        Uuid(as_uuid=True), ForeignKey("webhook_subscription.id", ondelete="CASCADE"), nullable=False
+    )
+    event = Column(String(50), nullable=False)
+    # JSON body of the notification
+    payload = Column(Text, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=True)
+    last_error = Column(String(255), nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
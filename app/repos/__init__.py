@@ -0,0 +1,18 @@
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.repos.event_store_repo import EventSourcedTimerRepo
+from app.repos.timer_repo import TimerRepo
+from app.services.clock import Clock, system_clock
+
+
+def get_timer_repo(
+    db: Session, owner_id: Optional[str] = None, clock: Clock = system_clock
+) -> TimerRepo:
+    """Build the timer repository for the configured storage mode, scoped to ``owner_id``."""
+    settings = get_settings()
+    if settings.event_sourced:
+        return EventSourcedTimerRepo(db, settings.checkpoint_interval, owner_id, clock)
+    return TimerRepo(db, owner_id)
@@ -0,0 +1,111 @@
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session, aliased
+from app.models.archive import TimerArchive, TimerEventArchive
+from app.models.timer import Timer, TimerCheckpoint, TimerEvent
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+from app.services.metrics import instrument_repo
+
+
+@instrument_repo
+class ArchiveRepo:
+    """Repository moving cold timers and their events into the archive tables."""
+
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+
+    def archive_untouched(
+        self, cutoff: datetime, limit: int, archived_at: datetime
+    ) -> tuple[List[UUID], int]:
+        """Move up to ``limit`` timers untouched since ``cutoff`` to the archive.
+
+        A timer counts as touched by an update of its row or by an event,
+        which is all event-sourced mode writes. Timers in a program and each
+        owner's newest timer, which displays fetch as the active one, are
+        kept however long they sit idle. Candidate rows are locked
+        and skipped if another worker holds them, then removed with
+        ``DELETE ... RETURNING`` and inserted into the archive in the same
+        transaction, so each row is read once. Checkpoints are dropped
+        since the archived events replay to the same state, and webhook
+        subscriptions with their pending deliveries are dropped too. Returns the
+        archived timer ids and the number of events moved.
+        """
+        touched = (
+            select(TimerEvent.id)
+            .where(TimerEvent.timer_id == Timer.id, TimerEvent.recorded_at >= cutoff)
+            .exists()
+        )
+        newer = aliased(Timer)
+        superseded = (
+            select(newer.id)
+            .where(
+                newer.owner_id.is_not_distinct_from(Timer.owner_id),
+                newer.created_at > Timer.created_at,
+            )
+            .exists()
+        )
+        ids = self.db.execute(
+            select(Timer.id)
+            .where(Timer.updated_at < cutoff, ~touched, Timer.program_id.is_(None), superseded)
+            .order_by(Timer.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not ids:
+            return [], 0
+
+        # Events go first: deleting the timers would cascade to them.
+        events = self.db.execute(
+            delete(TimerEvent)
+            .where(TimerEvent.timer_id.in_(ids))
+            .returning(*TimerEvent.__table__.columns)
+            .execution_options(synchronize_session=False)
+        ).mappings().all()
+        self.db.execute(
+            delete(TimerCheckpoint)
+            .where(TimerCheckpoint.timer_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        # Archived timers have nobody left to notify.
+        subscriptions = select(WebhookSubscription.id).where(WebhookSubscription.timer_id.in_(ids))
+        self.db.execute(
+            delete(WebhookDelivery)
+            .where(WebhookDelivery.subscription_id.in_(subscriptions))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            delete(WebhookSubscription)
+            .where(WebhookSubscription.timer_id.in_(ids))
+            .execution_options(synchronize_session=False)
+        )
+        timers = self.db.execute(
+            delete(Timer)
+            .where(Timer.id.in_(ids))
+            .returning(*Timer.__table__.columns)
+            .execution_options(synchronize_session=False)
+        ).mappings().all()
+
+        if timers:
+            self.db.execute(
+                insert(TimerArchive), [{**timer, "archived_at": archived_at} for timer in timers]
+            )
+        if events:
+            self.db.execute(insert(TimerEventArchive), [dict(event) for event in events])
+        self.db.commit()
+        return [timer["id"] for timer in timers], len(events)
+
+    def get_archived_timer(self, timer_id: UUID) -> Optional[TimerArchive]:
+        """Fetch an archived timer by ID."""
+        return self.db.get(TimerArchive, timer_id)
+
+    def get_archived_events(self, timer_id: UUID) -> List[TimerEventArchive]:
+        """Fetch the archived events of a timer in recorded order."""
+        return (
+            self.db.query(TimerEventArchive)
+            .filter(TimerEventArchive.timer_id == timer_id)
+            .order_by(TimerEventArchive.recorded_at, TimerEventArchive.sequence)
+            .all()
+        )
@@ -0,0 +1,356 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, Optional, List
+from uuid import UUID
+from sqlalchemy import and_, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.timer import Timer, TimerCheckpoint, TimerEvent
+from app.repos.timer_repo import TimerRepo
+from app.schemas.timer import TimerStatus, UrgencyLevel
+from app.services.clock import Clock, system_clock
+from app.services.metrics import instrument_repo
+
+
+STATE_FIELDS = (
+    "duration_seconds",
+    "remaining_seconds",
+    "started_at",
+    "paused_at",
+    "reset_count",
+    "status",
+)
+
+
+def fold_events(state: dict, events: Iterable[TimerEvent]) -> dict:
+    """Apply events in sequence order to a timer state dict."""
+    for event in events:
+        if event.duration_seconds is not None:
+            state["duration_seconds"] = event.duration_seconds
+        if event.remaining_seconds is not None:
+            state["remaining_seconds"] = event.remaining_seconds
+
+        if event.event_type in ("started", "phase"):
+            state["status"] = TimerStatus.running.value
+            state["started_at"] = event.recorded_at
+            state["paused_at"] = None
+        elif event.event_type == "paused":
+            state["status"] = TimerStatus.paused.value
+            state["paused_at"] = event.recorded_at
+        elif event.event_type == "reset":
+            state["status"] = TimerStatus.stopped.value
+            state["started_at"] = None
+            state["paused_at"] = None
+            state["reset_count"] = (state["reset_count"] or 0) + 1
+        elif event.event_type == "expired":
+            state["status"] = TimerStatus.expired.value
+            state["remaining_seconds"] = 0
+
+        state["sequence"] = event.sequence
+        state["updated_at"] = event.recorded_at
+    return state
+
+
+class SequenceConflict(Exception):
+    """Another writer appended an event with the same sequence number first."""
+
+
+def retry_on_conflict(db: Session, call, attempts: int = 3):
+    """Run ``call`` until it commits without an integrity error, at most ``attempts`` times.
+
+    Two writers that fold the same state append the same sequence number
+    and the slower one violates ``uq_timer_event_sequence``, at commit or
+    at any autoflush before it. The session is rolled back and ``call``,
+    which must build its repository afresh, folds the winning events and
+    decides again. Raises SequenceConflict once the attempts run out.
+    """
+    for attempt in range(attempts):
+        try:
+            return call()
+        except IntegrityError as e:
+            db.rollback()
+            if attempt == attempts - 1:
+                raise SequenceConflict("Timer was changed concurrently; try again") from e
+
+
+@instrument_repo
+class EventSourcedTimerRepo(TimerRepo):
+    """Timer repository where transitions are append-only event inserts.
+
+    The timer row keeps the state it was created with. Current state is the
+    latest checkpoint folded forward with the events after it, and a new
+    checkpoint is written every ``checkpoint_interval`` events per timer.
+    Timers returned by this repo are transient copies; mutating them never
+    issues an UPDATE.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        checkpoint_interval: int = 50,
+        owner_id: Optional[str] = None,
+        clock: Clock = system_clock,
+    ):
+        """Initialize repository with database session."""
+        super().__init__(db, owner_id)
+        self.checkpoint_interval = checkpoint_interval
+        self.clock = clock
+        self._states: dict[UUID, dict] = {}
+        self._timers: dict[UUID, Timer] = {}
+
+    def _load(self, rows: List[Timer]) -> List[Timer]:
+        """Fold checkpoints and later events for many timers with three queries."""
+        if not rows:
+            return []
+        ids = [row.id for row in rows]
+
+        latest = (
+            select(TimerCheckpoint.timer_id, func.max(TimerCheckpoint.sequence).label("sequence"))
+            .where(TimerCheckpoint.timer_id.in_(ids))
+            .group_by(TimerCheckpoint.timer_id)
+            .subquery()
+        )
+        checkpoints = {
+            checkpoint.timer_id: checkpoint
+            for checkpoint in self.db.query(TimerCheckpoint).join(
+                latest,
+                and_(
+                    TimerCheckpoint.timer_id == latest.c.timer_id,
+                    TimerCheckpoint.sequence == latest.c.sequence,
+                ),
+            )
+        }
+        events = defaultdict(list)
+        for event in (
+            self.db.query(TimerEvent)
+            .outerjoin(latest, TimerEvent.timer_id == latest.c.timer_id)
+            .filter(
+                TimerEvent.timer_id.in_(ids),
+                TimerEvent.sequence > func.coalesce(latest.c.sequence, 0),
+            )
+            .order_by(TimerEvent.timer_id, TimerEvent.sequence)
+        ):
+            events[event.timer_id].append(event)
+
+        timers = []
+        for row in rows:
+            checkpoint = checkpoints.get(row.id)
+            base = checkpoint or row
+            state = {field: getattr(base, field) for field in STATE_FIELDS}
+            state["sequence"] = checkpoint.sequence if checkpoint else 0
+            state["updated_at"] = checkpoint.recorded_at if checkpoint else row.updated_at
+            state = fold_events(state, events[row.id])
+            timers.append(self._track(row, state))
+        return timers
+
+    def _track(self, row: Timer, state: dict) -> Timer:
+        """Remember folded state and hand out a transient copy of the timer."""
+        self._states[row.id] = state
+        timer = Timer(
+            id=row.id,
+            name=row.name,
+            created_at=row.created_at,
+            updated_at=state["updated_at"],
+            program_id=row.program_id,
+            owner_id=row.owner_id,
+            **{field: state[field] for field in STATE_FIELDS},
+        )
+        self._timers[row.id] = timer
+        return timer
+
+    def _append(
+        self,
+        timer_id: UUID,
+        event_type: str,
+        urgency_level: int,
+        remaining_seconds: int,
+        duration_seconds: int,
+        recorded_at: datetime,
+    ) -> TimerEvent:
+        """Stage the next event for a timer and a checkpoint when one is due."""
+        state = self._states[timer_id]
+        event = TimerEvent(
+            timer_id=timer_id,
+            event_type=event_type,
+            urgency_level=urgency_level,
+            remaining_seconds=remaining_seconds,
+            duration_seconds=duration_seconds,
+            sequence=state["sequence"] + 1,
+            recorded_at=recorded_at,
+        )
+        self.db.add(event)
+        fold_events(state, [event])
+
+        if event.sequence % self.checkpoint_interval == 0:
+            self.db.add(
+                TimerCheckpoint(
+                    timer_id=timer_id,
+                    sequence=event.sequence,
+                    recorded_at=recorded_at,
+                    **{field: state[field] for field in STATE_FIELDS},
+                )
+            )
+        return event
+
+    def _current(self, timer_id: UUID) -> Optional[Timer]:
+        """Fetch the tracked copy of a timer, folding it on first use."""
+        return self._timers.get(timer_id) or self.get_timer(timer_id)
+
+    def create_timer(self, duration_seconds: int, name: str = "Workout") -> Timer:
+        """Create a new timer; its row is the base state for later folds."""
+        row = super().create_timer(duration_seconds, name)
+        state = {field: getattr(row, field) for field in STATE_FIELDS}
+        state["sequence"] = 0
+        state["updated_at"] = row.updated_at
+        return self._track(row, state)
+
+    def get_timer(self, timer_id: UUID) -> Optional[Timer]:
+        """Fetch folded timer state by ID."""
+        row = super().get_timer(timer_id)
+        return self._load([row])[0] if row else None
+
+    def get_timers(self, timer_ids: Iterable[UUID]) -> List[Timer]:
+        """Fetch folded state for many timers."""
+        return self._load(super().get_timers(timer_ids))
+
+    def get_active_timer(self) -> Optional[Timer]:
+        """Fetch folded state of the most recently created timer."""
+        row = super().get_active_timer()
+        return self._load([row])[0] if row else None
+
+    def list_timers(self) -> List[Timer]:
+        """Fetch folded state of all timers."""
+        return self._load(super().list_timers())
+
+    def list_active_timers(self) -> List[Timer]:
+        """Fetch folded state of timers that have not expired."""
+        return [timer for timer in self.list_timers() if timer.status != TimerStatus.expired]
+
+    def update_timer(
+        self,
+        timer_id: UUID,
+        remaining_seconds: int,
+        status: str,
+        started_at=None,
+        paused_at=None,
+        reset_count: Optional[int] = None,
+    ) -> Optional[Timer]:
+        """Apply new state to the tracked copy.
+
+        Transitions are persisted by the ``record_event`` call that follows.
+        A plain countdown (running to running with no restart) has no such
+        call, so it is appended here as a tick event.
+        """
+        timer = self._current(timer_id)
+        if not timer:
+            return None
+
+        was_running = self._states[timer_id]["status"] == TimerStatus.running
+        timer.remaining_seconds = remaining_seconds
+        timer.status = status
+        if started_at is not None:
+            timer.started_at = started_at
+        if paused_at is not None:
+            timer.paused_at = paused_at
+        if reset_count is not None:
+            timer.reset_count = reset_count
+
+        if status == TimerStatus.running and was_running and started_at is None and reset_count is None:
+            self._append_tick(timer)
+            self.db.commit()
+        return timer
+
+    def _append_tick(self, timer: Timer) -> None:
+        """Append the countdown progress of a tracked timer."""
+        self._append(
+            timer.id,
+            "tick",
+            UrgencyLevel.from_ratio(timer.remaining_seconds, timer.duration_seconds),
+            timer.remaining_seconds,
+            timer.duration_seconds,
+            self.clock.now(),
+        )
+
+    def delete_timer(self, timer_id: UUID) -> bool:
+        """Delete timer by ID."""
+        self._states.pop(timer_id, None)
+        self._timers.pop(timer_id, None)
+        return super().delete_timer(timer_id)
+
+    def record_event(
+        self,
+        timer_id: UUID,
+        event_type: str,
+        urgency_level: int = 0,
+        remaining_seconds: Optional[int] = None,
+        duration_seconds: Optional[int] = None,
+    ) -> TimerEvent:
+        """Append a transition event carrying the timer's new state."""
+        timer = self._current(timer_id)
+        if event_type == "started":
+            recorded_at = timer.started_at
+        elif event_type == "paused":
+            recorded_at = timer.paused_at
+        else:
+            recorded_at = None
+        event = self._append(
+            timer_id,
+            event_type,
+            urgency_level,
+            remaining_seconds if remaining_seconds is not None else timer.remaining_seconds,
+            duration_seconds if duration_seconds is not None else timer.duration_seconds,
+            recorded_at or self.clock.now(),
+        )
+        self.stage_webhooks([event])
+        self.db.commit()
+        return event
+
+    def save_batch(self, events: List[dict]) -> None:
+        """Append batch events in order, plus ticks for tracked timers left without one."""
+        appended = [
+            self._append(
+                event["timer_id"],
+                event["event_type"],
+                event["urgency_level"],
+                event["remaining_seconds"],
+                event["duration_seconds"],
+                event["recorded_at"],
+            )
+            for event in events
+        ]
+        self.stage_webhooks(appended)
+        for timer in self._timers.values():
+            state = self._states[timer.id]
+            if (timer.status, timer.remaining_seconds) != (state["status"], state["remaining_seconds"]):
+                self._append_tick(timer)
+        self.db.commit()
+
+    def update_group_timers(
+        self,
+        program_id: UUID,
+        event_type: str,
+        urgency_level: int,
+        recorded_at: datetime,
+        **values,
+    ) -> int:
+        """Append the transition to every timer in a program, each with its next sequence.
+
+        The event type sets the status when folded, so only remaining and
+        duration are taken from ``values``. Webhook deliveries are staged
+        with the events; the commit is left to the caller.
+        """
+        rows = self.db.query(Timer).filter(Timer.program_id == program_id).all()
+        timers = self._load(rows)
+        events = [
+            self._append(
+                timer.id,
+                event_type,
+                urgency_level,
+                values.get("remaining_seconds", timer.remaining_seconds),
+                values.get("duration_seconds", timer.duration_seconds),
+                recorded_at,
+            )
+            for timer in timers
+        ]
+        self.stage_webhooks(events)
+        return len(timers)
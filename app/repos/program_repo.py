@@ -0,0 +1,98 @@
+from datetime import datetime
+from typing import Optional, List
+from uuid import UUID
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from app.models.program import IntervalProgram, ProgramPhase
+from app.models.timer import Timer
+from app.repos import get_timer_repo
+from app.repos.timer_repo import TimerRepo
+from app.services.metrics import instrument_repo
+
+
+@instrument_repo
+class ProgramRepo:
+    """Repository for interval program data access.
+
+    With an ``owner_id`` programs and their timers are limited to that
+    owner, and new programs are created for that owner.
+    """
+
+    def __init__(
+        self, db: Session, timers: Optional[TimerRepo] = None, owner_id: Optional[str] = None
+    ):
+        """Initialize repository with database session and the configured timer repository."""
+        self.db = db
+        self.owner_id = owner_id
+        self.timers = timers if timers is not None else get_timer_repo(db, owner_id)
+
+    def _query(self):
+        """Program query limited to the repository's owner, if any."""
+        query = self.db.query(IntervalProgram)
+        if self.owner_id is not None:
+            query = query.filter(IntervalProgram.owner_id == self.owner_id)
+        return query
+
+    def create_program(
+        self,
+        name: str,
+        repeat_count: int,
+        phases: List[dict],
+        timer_ids: List[UUID],
+    ) -> IntervalProgram:
+        """Create a program and attach its station timers."""
+        program = IntervalProgram(
+            name=name,
+            repeat_count=repeat_count,
+            status="stopped",
+            owner_id=self.owner_id,
+            phases=[ProgramPhase(position=i, **phase) for i, phase in enumerate(phases)],
+        )
+        self.db.add(program)
+        self.db.flush()
+        if timer_ids:
+            statement = update(Timer).where(Timer.id.in_(timer_ids))
+            if self.owner_id is not None:
+                statement = statement.where(Timer.owner_id == self.owner_id)
+            self.db.execute(
+                statement.values(program_id=program.id).execution_options(
+                    synchronize_session=False
+                )
+            )
+        self.db.commit()
+        self.db.refresh(program)
+        return program
+
+    def get_program(self, program_id: UUID) -> Optional[IntervalProgram]:
+        """Fetch program by ID."""
+        return self._query().filter(IntervalProgram.id == program_id).first()
+
+    def list_running_programs(self) -> List[IntervalProgram]:
+        """Fetch programs with a pending phase deadline."""
+        return self._query().filter(IntervalProgram.status == "running").all()
+
+    def get_timers(self, timer_ids: List[UUID]) -> List[Timer]:
+        """Fetch timers visible to the repository's owner."""
+        return self.timers.get_timers(timer_ids)
+
+    def update_group_timers(
+        self,
+        program_id: UUID,
+        event_type: str,
+        urgency_level: int,
+        recorded_at: datetime,
+        **values,
+    ) -> int:
+        """Apply a transition to every timer in the program through the timer repository.
+
+        In event-sourced mode each timer gets its own numbered event, so
+        the change survives the next fold of its state.
+        """
+        return self.timers.update_group_timers(
+            program_id, event_type, urgency_level, recorded_at, **values
+        )
+
+    def save_program(self, program: IntervalProgram) -> IntervalProgram:
+        """Commit pending program and timer changes."""
+        self.db.commit()
+        return program
@@ -1,15 +1,32 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Iterable, Optional, List
 from uuid import UUID
+from sqlalchemy import func, insert, select, update
 from sqlalchemy.orm import Session
 from app.models.timer import Timer, TimerEvent
+from app.repos.webhook_repo import WebhookRepo
+from app.services.metrics import instrument_repo
 
 
+@instrument_repo
 class TimerRepo:
-    """Repository for timer data access."""
+    """Repository for timer data access.
 
-    def __init__(self, db: Session):
+    With an ``owner_id`` every lookup is limited to that owner's timers, in
+    the same query, and new timers are created for that owner.
+    """
+
+    def __init__(self, db: Session, owner_id: Optional[str] = None):
         """Initialize repository with database session."""
         self.db = db
+        self.owner_id = owner_id
+
+    def _query(self):
+        """Timer query limited to the repository's owner, if any."""
+        query = self.db.query(Timer)
+        if self.owner_id is not None:
+            query = query.filter(Timer.owner_id == self.owner_id)
+        return query
 
     def create_timer(
         self,
@@ -22,6 +39,7 @@ class TimerRepo:
             duration_seconds=duration_seconds,
             remaining_seconds=duration_seconds,
             status="stopped",
+            owner_id=self.owner_id,
         )
         self.db.add(timer)
         self.db.commit()
@@ -30,11 +48,26 @@ class TimerRepo:
 
     def get_timer(self, timer_id: UUID) -> Optional[Timer]:
         """Fetch timer by ID."""
-        return self.db.query(Timer).filter(Timer.id == timer_id).first()
+        return self._query().filter(Timer.id == timer_id).first()
+
+    def get_timers(self, timer_ids: Iterable[UUID]) -> List[Timer]:
+        """Fetch many timers in a single query."""
+        ids = list(timer_ids)
+        if not ids:
+            return []
+        return self._query().filter(Timer.id.in_(ids)).all()
+
+    def get_active_timer(self) -> Optional[Timer]:
+        """Fetch the most recently created timer."""
+        return self._query().order_by(Timer.created_at.desc()).first()
 
     def list_timers(self) -> List[Timer]:
         """Fetch all timers."""
-        return self.db.query(Timer).all()
+        return self._query().all()
+
+    def list_active_timers(self) -> List[Timer]:
+        """Fetch timers that have not expired."""
+        return self._query().filter(Timer.status != "expired").all()
 
     def update_timer(
         self,
@@ -78,18 +111,116 @@ class TimerRepo:
         timer_id: UUID,
         event_type: str,
         urgency_level: int = 0,
+        remaining_seconds: Optional[int] = None,
+        duration_seconds: Optional[int] = None,
     ) -> TimerEvent:
         """Record timer event."""
         event = TimerEvent(
             timer_id=timer_id,
             event_type=event_type,
             urgency_level=urgency_level,
+            remaining_seconds=remaining_seconds,
+            duration_seconds=duration_seconds,
         )
         self.db.add(event)
+        self.stage_webhooks([event])
         self.db.commit()
         self.db.refresh(event)
         return event
 
+    def save_batch(self, events: List[dict]) -> None:
+        """Flush pending timer changes and bulk-insert events in one commit.
+
+        The session flushes the changed timers as one executemany UPDATE
+        per set of changed columns, so a batch costs a fixed number of
+        statements however many timers it touches.
+        """
+        if events:
+            self.db.execute(insert(TimerEvent), events)
+            WebhookRepo(self.db).stage_deliveries(events)
+        self.db.commit()
+
+    def stage_webhooks(self, events: List[TimerEvent]) -> None:
+        """Queue notifications for subscribers of events about to be committed."""
+        WebhookRepo(self.db).stage_deliveries(
+            [
+                {
+                    "timer_id": event.timer_id,
+                    "event_type": event.event_type,
+                    "urgency_level": event.urgency_level,
+                    "remaining_seconds": event.remaining_seconds,
+                    "duration_seconds": event.duration_seconds,
+                    "recorded_at": event.recorded_at,
+                }
+                for event in events
+            ]
+        )
+
+    def update_group_timers(
+        self,
+        program_id: UUID,
+        event_type: str,
+        urgency_level: int,
+        recorded_at: datetime,
+        **values,
+    ) -> int:
+        """Update every timer in a program with one statement and log an event for each.
+
+        Webhook deliveries for the transition are staged with the events.
+        Leaves the commit to the caller so the program row changes with them.
+        """
+        timer_ids = self.db.execute(
+            update(Timer)
+            .where(Timer.program_id == program_id)
+            .values(updated_at=recorded_at, **values)
+            .returning(Timer.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        if timer_ids:
+            events = [
+                {
+                    "timer_id": timer_id,
+                    "event_type": event_type,
+                    "urgency_level": urgency_level,
+                    "remaining_seconds": values.get("remaining_seconds"),
+                    "duration_seconds": values.get("duration_seconds"),
+                    "recorded_at": recorded_at,
+                }
+                for timer_id in timer_ids
+            ]
+            self.db.execute(insert(TimerEvent), events)
+            WebhookRepo(self.db).stage_deliveries(events)
+        return len(timer_ids)
+
+    def get_touched_timer_ids(self, since: datetime) -> List[tuple[UUID, datetime]]:
+        """Fetch timers with events recorded after ``since`` and their latest event time."""
+        return (
+            self.db.query(TimerEvent.timer_id, func.max(TimerEvent.recorded_at))
+            .filter(TimerEvent.recorded_at > since)
+            .group_by(TimerEvent.timer_id)
+            .all()
+        )
+
+    def get_updated_timer_ids(self, since: datetime) -> List[UUID]:
+        """Fetch timers whose row was written after ``since``, such as new or ticked ones."""
+        return self.db.execute(select(Timer.id).where(Timer.updated_at > since)).scalars().all()
+
     def get_timer_events(self, timer_id: UUID) -> List[TimerEvent]:
-        """Fetch all events for a timer."""
-        return self.db.query(TimerEvent).filter(TimerEvent.timer_id == timer_id).all()
+        """Fetch all events for a timer in recorded order."""
+        return (
+            self.db.query(TimerEvent)
+            .filter(TimerEvent.timer_id == timer_id)
+            .order_by(TimerEvent.recorded_at, TimerEvent.sequence, TimerEvent.id)
+            .all()
+        )
+
+    def get_last_event_id(self, timer_id: UUID) -> Optional[UUID]:
+        """ID of a timer's most recently recorded event, or None if it has none."""
+        return self.db.execute(
+            select(TimerEvent.id)
+            .where(TimerEvent.timer_id == timer_id)
+            .order_by(
+                TimerEvent.recorded_at.desc(), TimerEvent.sequence.desc(), TimerEvent.id.desc()
+            )
+            .limit(1)
+        ).scalar()
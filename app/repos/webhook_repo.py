@@ -0,0 +1,191 @@
+import json
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional
+from uuid import UUID
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+from app.schemas.timer import UrgencyLevel
+from app.schemas.webhook import WebhookEvent
+from app.services.metrics import instrument_repo
+
+
+def webhook_events(event_type: str, urgency_level: int) -> list[str]:
+    """Webhook events a recorded transition fires; ticks and phases fire none."""
+    if event_type not in WebhookEvent.__members__:
+        return []
+    fired = [event_type]
+    if urgency_level == UrgencyLevel.alarm:
+        fired.append("alarm")
+    return fired
+
+
+@instrument_repo
+class WebhookRepo:
+    """Repository for webhook subscriptions and their delivery outbox."""
+
+    def __init__(self, db: Session):
+        """Initialize repository with database session."""
+        self.db = db
+
+    def create_subscription(
+        self, timer_id: UUID, url: str, events: Iterable[str], secret: Optional[str] = None
+    ) -> WebhookSubscription:
+        """Subscribe ``url`` to events of a timer."""
+        subscription = WebhookSubscription(
+            timer_id=timer_id, url=url, events=",".join(events), secret=secret
+        )
+        self.db.add(subscription)
+        self.db.commit()
+        self.db.refresh(subscription)
+        return subscription
+
+    def list_subscriptions(self, timer_id: UUID) -> List[WebhookSubscription]:
+        """Fetch the subscriptions of a timer."""
+        return (
+            self.db.query(WebhookSubscription)
+            .filter(WebhookSubscription.timer_id == timer_id)
+            .order_by(WebhookSubscription.created_at)
+            .all()
+        )
+
+    def delete_subscription(self, timer_id: UUID, subscription_id: UUID) -> bool:
+        """Remove a subscription and its pending deliveries."""
+        subscription = (
+            self.db.query(WebhookSubscription)
+            .filter(WebhookSubscription.id == subscription_id, WebhookSubscription.timer_id == timer_id)
+            .first()
+        )
+        if not subscription:
+            return False
+        self.db.execute(
+            delete(WebhookDelivery)
+            .where(WebhookDelivery.subscription_id == subscription_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.delete(subscription)
+        self.db.commit()
+        return True
+
+    def stage_deliveries(self, events: List[dict]) -> int:
+        """Add outbox rows for subscriptions matching recorded events, without committing.
+
+        Called by the timer repositories just before they commit the
+        events, so a notification exists exactly when its transition does.
+        One query covers every event in the list, and none is made when
+        the events are all ticks.
+        """
+        events = [
+            event for event in events if webhook_events(event["event_type"], event["urgency_level"])
+        ]
+        if not events:
+            return 0
+        subscriptions = (
+            self.db.query(WebhookSubscription)
+            .filter(WebhookSubscription.timer_id.in_({event["timer_id"] for event in events}))
+            .all()
+        )
+        if not subscriptions:
+            return 0
+        staged = 0
+        for event in events:
+            recorded_at = event.get("recorded_at") or datetime.utcnow()
+            for name in webhook_events(event["event_type"], event["urgency_level"]):
+                payload = json.dumps(
+                    {
+                        "event": name,
+                        "timer_id": str(event["timer_id"]),
+                        "urgency_level": UrgencyLevel(event["urgency_level"]).name,
+                        "remaining_seconds": event.get("remaining_seconds"),
+                        "duration_seconds": event.get("duration_seconds"),
+                        "recorded_at": recorded_at.isoformat(),
+                    }
+                )
+                for subscription in subscriptions:
+                    if (
+                        subscription.timer_id == event["timer_id"]
+                        and name in subscription.events.split(",")
+                    ):
+                        self.db.add(
+                            WebhookDelivery(
+                                subscription_id=subscription.id,
+                                event=name,
+                                payload=payload,
+                                attempts=0,
+                                next_attempt_at=recorded_at,
+                            )
+                        )
+                        staged += 1
+        return staged
+
+    def claim_due(
+        self, now: datetime, limit: int, lease: timedelta
+    ) -> List[tuple[WebhookDelivery, WebhookSubscription]]:
+        """Lease up to ``limit`` due deliveries, oldest first, with their subscriptions.
+
+        Rows are locked with SKIP LOCKED and pushed ``lease`` into the
+        future, so other workers skip them while they are in flight and
+        pick them up again if this worker dies.
+        """
+        rows = self.db.execute(
+            select(WebhookDelivery, WebhookSubscription)
+            .join(WebhookSubscription, WebhookSubscription.id == WebhookDelivery.subscription_id)
+            .where(WebhookDelivery.next_attempt_at <= now)
+            .order_by(WebhookDelivery.next_attempt_at)
+            .limit(limit)
+            .with_for_update(of=WebhookDelivery, skip_locked=True)
+        ).all()
+        if rows:
+            self.db.execute(
+                update(WebhookDelivery)
+                .where(WebhookDelivery.id.in_([delivery.id for delivery, _ in rows]))
+                .values(next_attempt_at=now + lease)
+                .execution_options(synchronize_session=False)
+            )
+        self.db.commit()
+        return [(delivery, subscription) for delivery, subscription in rows]
+
+    def mark_delivered(self, delivery_ids: List[UUID]) -> None:
+        """Remove delivered rows from the outbox."""
+        self.db.execute(
+            delete(WebhookDelivery)
+            .where(WebhookDelivery.id.in_(delivery_ids))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def mark_failed(
+        self,
+        delivery_ids: List[UUID],
+        next_attempt_at: Optional[datetime],
+        error: str,
+        attempted: bool = True,
+    ) -> None:
+        """Schedule failed deliveries for another attempt, or retire them with None.
+
+        ``attempted`` is False when the endpoint was skipped without a
+        request, which does not use up a retry.
+        """
+        values = {"next_attempt_at": next_attempt_at, "last_error": error[:255]}
+        if attempted:
+            values["attempts"] = WebhookDelivery.attempts + 1
+        self.db.execute(
+            update(WebhookDelivery)
+            .where(WebhookDelivery.id.in_(delivery_ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
+    def prune_retired(self, cutoff: datetime, limit: int) -> int:
+        """Delete up to ``limit`` retired deliveries created before ``cutoff``."""
+        ids = select(WebhookDelivery.id).where(
+            WebhookDelivery.next_attempt_at.is_(None), WebhookDelivery.created_at < cutoff
+        ).limit(limit)
+        deleted = self.db.execute(
+            delete(WebhookDelivery)
+            .where(WebhookDelivery.id.in_(ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return deleted
@@ -0,0 +1,54 @@
+import secrets
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+
+from app.config import get_settings
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+settings = get_settings()
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Allow only requests carrying the configured admin token."""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Admin endpoints are disabled")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.post(
+    "/profile",
+    response_class=PlainTextResponse,
+    dependencies=[Depends(require_admin)],
+)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0, le=60),
+    interval_ms: float = Query(default=5.0, ge=1, le=100),
+) -> PlainTextResponse:
+    """Sample the event loop thread and return a collapsed-stack flamegraph file.
+
+    Feed the file to ``flamegraph.pl`` or speedscope. Event-loop lag over
+    the same window is returned in ``X-Loop-Lag-*`` headers.
+    """
+    # The profiler is rarely used, so it is only imported on first use.
+    from app.services.profiler import profile_event_loop, profile_running
+
+    if profile_running():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    result = await profile_event_loop(seconds, interval_ms / 1000)
+    filename = f"profile-{datetime.utcnow():%Y%m%dT%H%M%S}.folded"
+    return PlainTextResponse(
+        result.collapsed,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(result.samples),
+            "X-Loop-Lag-P50-Ms": str(result.lag_p50_ms),
+            "X-Loop-Lag-P99-Ms": str(result.lag_p99_ms),
+            "X-Loop-Lag-Max-Ms": str(result.lag_max_ms),
+        },
+    )
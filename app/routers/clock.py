@@ -0,0 +1,24 @@
+from datetime import timedelta
+from typing import Optional
+
+from fastapi import APIRouter
+
+from app.schemas.clock import ServerTime
+from app.services.clock import EPOCH, system_clock
+
+router = APIRouter(prefix="/api", tags=["time"])
+
+
+@router.get("/time", response_model=ServerTime)
+async def get_server_time(client_time_ms: Optional[float] = None) -> ServerTime:
+    """Get server time with sub-millisecond precision.
+
+    Clients pass their send time as ``client_time_ms`` and estimate their
+    offset as ``epoch_ms - (client_time_ms + round_trip / 2)``.
+    """
+    epoch_ms = system_clock.epoch_ms()
+    return ServerTime(
+        epoch_ms=epoch_ms,
+        server_time=EPOCH + timedelta(milliseconds=epoch_ms),
+        client_time_ms=client_time_ms,
+    )
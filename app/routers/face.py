@@ -0,0 +1,44 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import RedirectResponse, Response
+
+from app.schemas.timer import UrgencyLevel
+from app.services.face import face_catalog
+
+router = APIRouter(prefix="/api", tags=["face"])
+
+SVG = "image/svg+xml"
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def parse_level(level: str) -> UrgencyLevel:
+    """Urgency level from its name (as in ``urgency_level``) or number."""
+    try:
+        return UrgencyLevel(int(level)) if level.isdigit() else UrgencyLevel[level]
+    except (KeyError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown urgency level: {level}")
+
+
+@router.get("/face", status_code=307, response_class=RedirectResponse)
+async def get_face(level: str, intensity: float) -> RedirectResponse:
+    """Redirect to the cached face for an urgency level and colour intensity.
+
+    Urgency responses already carry this URL as ``face_url``.
+    """
+    url = face_catalog.url_for(parse_level(level), intensity)
+    return RedirectResponse(url, status_code=307, headers={"Cache-Control": "public, max-age=300"})
+
+
+@router.get(
+    "/face/{digest}.svg",
+    response_class=Response,
+    responses={200: {"content": {SVG: {}}, "description": "Face SVG"}},
+)
+async def get_face_svg(digest: str, request: Request) -> Response:
+    """Serve a pre-rendered face by content hash, cacheable forever."""
+    variant = face_catalog.get(digest)
+    if variant is None:
+        raise HTTPException(status_code=404, detail="Unknown face")
+    headers = {"Cache-Control": IMMUTABLE, "ETag": f'"{variant.digest}"'}
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(variant.svg, media_type=SVG, headers=headers)
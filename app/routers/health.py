@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Response
+
+from app.schemas.health import ComponentHealth, Readiness
+from app.services.health import health_monitor
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live")
+async def liveness() -> dict[str, str]:
+    """Answer as long as the event loop is serving requests."""
+    return {"status": "ok"}
+
+
+@router.get("/ready", response_model=Readiness)
+async def readiness(response: Response) -> Readiness:
+    """Report whether this worker should receive traffic (503 when not).
+
+    Every check reads state kept by background tasks, so probing never
+    touches the database. Checks marked not required are only reported.
+    """
+    checks = {
+        name: ComponentHealth(ok=ok, detail=detail, required=health_monitor.required(name))
+        for name, (ok, detail) in health_monitor.readiness().items()
+    }
+    ready = all(check.ok for check in checks.values() if check.required)
+    if not ready:
+        response.status_code = 503
+    return Readiness(status="ok" if ready else "unavailable", checks=checks)
@@ -0,0 +1,28 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.routers.timer import get_principal, owner_of
+from app.schemas.leaderboard import Leaderboard, LeaderboardName
+from app.services.auth import Principal
+from app.services.leaderboard import leaderboards
+
+router = APIRouter(prefix="/api", tags=["leaderboard"])
+
+
+@router.get("/leaderboard", response_model=Leaderboard)
+async def get_leaderboard(
+    board: LeaderboardName = LeaderboardName.resets,
+    limit: int = Query(default=10, ge=1, le=100),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> Leaderboard:
+    """Top timers by reset count or by steadiest reset cadence, among the caller's own.
+
+    Served from rankings kept in memory, so page views never query the
+    database.
+    """
+    return Leaderboard(
+        board=board,
+        entries=leaderboards.top(board.value, limit, owner_of(principal)),
+        reconciled_at=leaderboards.reconciled_at,
+    )
@@ -0,0 +1,101 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_session
+from app.repos.event_store_repo import SequenceConflict, retry_on_conflict
+from app.repos.program_repo import ProgramRepo
+from app.routers.timer import get_principal, owner_of
+from app.schemas.program import ProgramCreate, ProgramResponse
+from app.services.auth import Principal
+from app.services.clock import system_clock
+from app.services.program_engine import program_engine
+from app.services.program_service import ProgramService, TimersNotFound
+
+router = APIRouter(prefix="/api", tags=["program"])
+
+
+async def run_program_service(
+    session: AsyncSession, call, principal: Optional[Principal] = None
+):
+    """Run a ProgramService call and return the program as a dict.
+
+    The repository only sees programs and timers owned by ``principal``.
+    The program engine is updated with the resulting deadline so the next
+    phase boundary is armed as soon as the transition commits.
+    """
+    owner_id = owner_of(principal)
+
+    def _call(db):
+        program = retry_on_conflict(
+            db, lambda: call(ProgramService(ProgramRepo(db, owner_id=owner_id)))
+        )
+        if not program:
+            return None
+        program_engine.track(program)
+        return program.to_dict()
+
+    try:
+        result = await session.run_sync(_call)
+    except SequenceConflict as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    except TimersNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    if result is None:
+        raise HTTPException(status_code=404, detail="Program not found")
+    return result
+
+
+@router.post("/programs", response_model=ProgramResponse)
+async def create_program(
+    config: ProgramCreate,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> ProgramResponse:
+    """Create an interval program for a group of station timers."""
+    phases = [phase.model_dump(mode="json") for phase in config.phases]
+    return await run_program_service(
+        session,
+        lambda service: service.create_program(
+            config.name, phases, config.repeat_count, config.timer_ids
+        ),
+        principal,
+    )
+
+
+@router.get("/programs/{program_id}", response_model=ProgramResponse)
+async def get_program(
+    program_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> ProgramResponse:
+    """Get program state and current phase."""
+    return await run_program_service(
+        session, lambda service: service.get_program(program_id), principal
+    )
+
+
+@router.post("/programs/{program_id}/start", response_model=ProgramResponse)
+async def start_program(
+    program_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> ProgramResponse:
+    """Start the program from its first phase."""
+    return await run_program_service(
+        session, lambda service: service.start_program(program_id, system_clock.now()), principal
+    )
+
+
+@router.post("/programs/{program_id}/stop", response_model=ProgramResponse)
+async def stop_program(
+    program_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> ProgramResponse:
+    """Stop the program and pause its timers."""
+    return await run_program_service(
+        session, lambda service: service.stop_program(program_id, system_clock.now()), principal
+    )
@@ -0,0 +1,59 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_session
+from app.repos.timer_repo import TimerRepo
+from app.routers.timer import get_principal, owner_of
+from app.schemas.timer import TimerTimeline
+from app.services.auth import Principal
+from app.services.clock import system_clock
+from app.services.timeline import timeline_cache
+
+router = APIRouter(prefix="/api", tags=["timeline"])
+
+settings = get_settings()
+
+
+@router.get("/timer/{timer_id}/timeline", response_model=TimerTimeline)
+async def get_timeline(
+    timer_id: UUID,
+    resolution: Optional[int] = Query(default=None, ge=1, le=86400),
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> TimerTimeline:
+    """Remaining time and urgency over a timer's history, one point per ``resolution`` seconds.
+
+    The curve is rebuilt from the timer's events and cached until it
+    records another, so replaying a finished session costs one lookup of
+    its latest event id. Without ``resolution`` the history is spread over
+    about ``TIMELINE_DEFAULT_POINTS`` points.
+    """
+    def _load(db):
+        repo = TimerRepo(db, owner_of(principal))
+        if repo.get_timer(timer_id) is None:
+            return None
+        return timeline_cache.load(repo, timer_id)
+
+    timeline = await session.run_sync(_load)
+    if timeline is None:
+        raise HTTPException(status_code=404, detail="Timer not found")
+
+    now = system_clock.now()
+    if resolution is None:
+        resolution = timeline.default_resolution(now, settings.timeline_default_points)
+    try:
+        points = timeline.series(resolution, now)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return TimerTimeline(
+        timer_id=str(timer_id),
+        started_at=timeline.segments[0].start if timeline.segments else None,
+        ended_at=timeline.ends_at(now),
+        resolution_seconds=resolution,
+        final=timeline.is_final(now),
+        points=points,
+    )
@@ -1,54 +1,372 @@
-from fastapi import APIRouter, HTTPException
-from app.services.timer_service import TimerService, TimerRepo
-from app.schemas.timer import TimerConfig, TimerState, UrgencyState
+import math
+import time
+from typing import Optional
+
+import msgpack
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session_factory, get_session
+from app.repos import get_timer_repo
+from app.repos.event_store_repo import SequenceConflict, retry_on_conflict
+from app.services.auth import Principal, authenticator
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.degraded import (
+    DATABASE_ERRORS,
+    DatabaseUnavailable,
+    JournalFull,
+    JournaledCommand,
+    command_journal,
+    db_breaker,
+    degraded_responses,
+    last_known_states,
+)
+from app.services.metrics import db_checkout_seconds
+from app.services.leaderboard import leaderboards
+from app.services.offload import get_repo_executor
+from app.services.sharding import shard_node
+from app.services.timer_cache import timer_cache
+from app.services.timer_service import TimerService
+from app.schemas.timer import (
+    CompactTimerState,
+    TimerCommand,
+    TimerCommandResult,
+    TimerConfig,
+    TimerState,
+    UrgencyState,
+)
 
 router = APIRouter(prefix="/api", tags=["timer"])
 
-# In-memory repo for Phase 0 (replaced by DB-backed repo later)
-timer_repo = TimerRepo()
-timer_service = TimerService(timer_repo)
+settings = get_settings()
+
+MSGPACK = "application/x-msgpack"
+
+COMPACT_RESPONSES = {
+    200: {
+        "description": "Full state, selected ``fields``, or the compact state "
+        "as JSON (``compact=true``) or MessagePack (``Accept: application/x-msgpack``).",
+        "content": {MSGPACK: {"schema": CompactTimerState.model_json_schema()}},
+    }
+}
+
+
+async def get_principal(request: Request) -> Optional[Principal]:
+    """Caller identified by a bearer token, or None when auth is disabled.
+
+    Declared async so the check runs inline rather than on the thread pool.
+    """
+    if not settings.auth_enabled:
+        return None
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        raise HTTPException(
+            status_code=401, detail="Missing bearer token", headers={"WWW-Authenticate": "Bearer"}
+        )
+    try:
+        return authenticator.authenticate(token)
+    except ValueError as e:
+        raise HTTPException(status_code=401, detail=str(e), headers={"WWW-Authenticate": "Bearer"})
+
+
+def owner_of(principal: Optional[Principal]) -> Optional[str]:
+    """Owner id that scopes timer queries for a caller."""
+    return principal.subject if principal else None
+
+
+async def run_service(session: AsyncSession, call, principal: Optional[Principal] = None):
+    """Run a TimerService call against a sync session.
+
+    With offloading enabled the call runs on the repository thread pool;
+    otherwise it uses the sync view of the request session on the loop.
+    The repository only sees timers owned by ``principal``. Event-sourced
+    appends that lose a sequence race are retried on fresh state, then
+    answered with 409. Raises DatabaseUnavailable without touching the
+    database while the breaker is open, and when the call fails to reach it;
+    this is the only place a request records the outcome on the breaker.
+    Only a completed call counts as a success: other errors prove nothing
+    about the database and are left unrecorded.
+    """
+    if not db_breaker.allow():
+        raise DatabaseUnavailable("Database circuit is open")
+    owner_id = owner_of(principal)
+    executor = get_repo_executor()
+    apply = lambda db: retry_on_conflict(
+        db, lambda: call(TimerService(get_timer_repo(db, owner_id), boards=leaderboards))
+    )
+    try:
+        if executor is not None:
+            result = await executor.run(apply)
+        else:
+            started = time.perf_counter()
+            await session.connection()
+            db_checkout_seconds.observe(time.perf_counter() - started)
+            result = await session.run_sync(apply)
+    except DATABASE_ERRORS as e:
+        db_breaker.record_failure()
+        raise DatabaseUnavailable(str(e)) from e
+    except SequenceConflict as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    db_breaker.record_success()
+    return result
+
+
+async def run_journaled(command: JournaledCommand) -> None:
+    """Apply a command replayed from the journal in a session of its own."""
+    executor = get_repo_executor()
+    apply = lambda db: retry_on_conflict(
+        db,
+        lambda: command.call(
+            TimerService(get_timer_repo(db, command.owner_id), boards=leaderboards)
+        ),
+    )
+    if executor is not None:
+        await executor.run(apply)
+        return
+    async with async_session_factory() as session:
+        await session.run_sync(apply)
+
+
+def unavailable(detail: str = "Database unavailable") -> HTTPException:
+    """503 telling the client when the database will next be tried."""
+    retry_after = max(1, math.ceil(db_breaker.retry_after_seconds()))
+    return HTTPException(status_code=503, detail=detail, headers={"Retry-After": str(retry_after)})
+
+
+async def read_state(
+    session: AsyncSession, kind: str, call, principal: Optional[Principal]
+) -> tuple[dict, Optional[float]]:
+    """Read a state, falling back to the last known one while the database is down.
+
+    Returns the state and, when it is stale, its age in seconds.
+    """
+    owner_id = owner_of(principal)
+    try:
+        state = await run_service(session, call, principal)
+    except DatabaseUnavailable:
+        known = last_known_states.get(kind, owner_id)
+        if known is None:
+            degraded_responses.inc(("unavailable",))
+            raise unavailable()
+        degraded_responses.inc(("stale",))
+        return known.state, last_known_states.age_seconds(known)
+    last_known_states.remember(kind, owner_id, state)
+    return state, None
+
+
+def mark_stale(result, response: Response, age: Optional[float]):
+    """Add staleness headers to a read answered from last known state."""
+    if age is not None:
+        target = result if isinstance(result, Response) else response
+        target.headers["Age"] = str(int(age))
+        target.headers["X-Degraded"] = "read-only"
+    return result
+
+
+async def run_command(
+    session: AsyncSession, description: str, call, principal: Optional[Principal]
+):
+    """Run a timer command, or journal it for replay while the database is down.
+
+    Commands already journaled are replayed first, so they apply in order,
+    and the command runs directly once the journal is empty. A command is
+    journaled only when commands are still queued ahead of it or the
+    breaker is open; a failure below the breaker threshold is answered with
+    503 and Retry-After instead. Queued commands are answered with 202 and
+    their journal position.
+    """
+    owner_id = owner_of(principal)
+    if len(command_journal):
+        await command_journal.replay(run_journaled)
+    if not len(command_journal):
+        try:
+            state = await run_service(session, call, principal)
+        except DatabaseUnavailable:
+            if db_breaker.state != CircuitBreaker.OPEN:
+                degraded_responses.inc(("unavailable",))
+                raise unavailable()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        else:
+            if isinstance(state, dict):
+                last_known_states.replace("state", owner_id, state)
+            return state
+    try:
+        position = command_journal.append(JournaledCommand(owner_id, description, call))
+    except JournalFull as e:
+        degraded_responses.inc(("unavailable",))
+        raise unavailable(str(e))
+    degraded_responses.inc(("queued",))
+    return JSONResponse(
+        {"queued": True, "command": description, "position": position}, status_code=202
+    )
+
+
+def wants_compact(request: Request, compact: bool) -> bool:
+    """Whether the client asked for the compact polling state."""
+    return compact or MSGPACK in request.headers.get("accept", "")
+
+
+def compact_response(request: Request, state: dict) -> Response:
+    """Encode compact state as MessagePack when accepted, else JSON."""
+    if MSGPACK in request.headers.get("accept", ""):
+        return Response(msgpack.packb(state), media_type=MSGPACK)
+    return JSONResponse(state)
+
+
+def select_fields(state: dict, fields: Optional[str], model) -> dict | JSONResponse:
+    """Trim a state dict to a comma-separated field list."""
+    if not fields:
+        return state
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in selected if field not in model.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return JSONResponse(jsonable_encoder({field: state[field] for field in selected}))
 
 
-@router.get("/timer", response_model=TimerState)
-async def get_timer() -> TimerState:
-    """Get current timer state."""
-    return await timer_service.get_state()
+@router.get("/timer", response_model=TimerState, responses=COMPACT_RESPONSES)
+async def get_timer(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    compact: bool = False,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+):
+    """Get current timer state, optionally trimmed for high-frequency polling.
+
+    While the database is unavailable the last known state is served with
+    ``Age`` and ``X-Degraded`` headers.
+    """
+    if wants_compact(request, compact):
+        state, age = await read_state(
+            session, "compact", lambda service: service.get_compact_state(), principal
+        )
+        return mark_stale(compact_response(request, state), response, age)
+    state, age = await read_state(session, "state", lambda service: service.get_state(), principal)
+    return mark_stale(select_fields(state, fields, TimerState), response, age)
 
 
 @router.post("/timer", response_model=TimerState)
-async def configure_timer(config: TimerConfig) -> TimerState:
-    """Configure timer duration and start countdown."""
-    return await timer_service.configure(config)
+async def configure_timer(
+    config: TimerConfig,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> TimerState:
+    """Configure timer duration."""
+    return await run_command(
+        session,
+        "configure",
+        lambda service: service.configure(config.duration, config.name),
+        principal,
+    )
 
 
 @router.post("/timer/reset", response_model=TimerState)
-async def reset_timer() -> TimerState:
+async def reset_timer(
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> TimerState:
     """Reset countdown to configured duration (fails if expired)."""
-    try:
-        return await timer_service.reset()
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return await run_command(session, "reset", lambda service: service.reset(), principal)
 
 
 @router.post("/timer/pause", response_model=TimerState)
-async def pause_timer() -> TimerState:
+async def pause_timer(
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> TimerState:
     """Pause active countdown without reset."""
-    try:
-        return await timer_service.pause()
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return await run_command(session, "pause", lambda service: service.pause(), principal)
 
 
 @router.post("/timer/resume", response_model=TimerState)
-async def resume_timer() -> TimerState:
+async def resume_timer(
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> TimerState:
     """Resume paused countdown."""
-    try:
-        return await timer_service.resume()
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
+    return await run_command(session, "resume", lambda service: service.resume(), principal)
 
 
-@router.get("/urgency", response_model=UrgencyState)
-async def get_urgency() -> UrgencyState:
+@router.get("/urgency", response_model=UrgencyState, responses=COMPACT_RESPONSES)
+async def get_urgency(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    compact: bool = False,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+):
     """Get current urgency level and visual feedback state."""
-    return await timer_service.get_urgency()
+    if wants_compact(request, compact):
+        state, age = await read_state(
+            session, "compact", lambda service: service.get_compact_state(), principal
+        )
+        return mark_stale(compact_response(request, state), response, age)
+    state, age = await read_state(
+        session, "urgency", lambda service: service.get_urgency(), principal
+    )
+    return mark_stale(select_fields(state, fields, UrgencyState), response, age)
+
+
+@router.post("/timers/batch", response_model=list[TimerCommandResult])
+async def apply_timer_batch(
+    commands: list[TimerCommand],
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> list[TimerCommandResult]:
+    """Apply many timer commands in one transaction, returning results in order.
+
+    In sharded mode commands are applied by the worker owning each timer,
+    and are answered with 503 rather than journaled while this worker's
+    database breaker is open.
+    Commands for timers the cache knows to belong to someone else are
+    rejected before any query; the rest are checked by the scoped repository.
+    """
+    if not commands:
+        raise HTTPException(status_code=400, detail="Batch is empty")
+    if len(commands) > settings.batch_max_commands:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.batch_max_commands} commands",
+        )
+    payload = [command.model_dump(exclude_none=True) for command in commands]
+    results: list[Optional[dict]] = [None] * len(payload)
+    owned = []
+    for index, command in enumerate(payload):
+        if principal and timer_cache.is_foreign(command["id"], principal.owner_key):
+            results[index] = {
+                "id": str(command["id"]),
+                "op": command["op"],
+                "ok": False,
+                "error": "Timer not found",
+            }
+        else:
+            owned.append(index)
+    if not owned:
+        return results
+
+    owned_payload = [payload[index] for index in owned]
+    if shard_node is not None and shard_node.running:
+        try:
+            applied = await shard_node.apply_batch(owned_payload, owner_of(principal))
+        except DatabaseUnavailable:
+            degraded_responses.inc(("unavailable",))
+            raise unavailable()
+    else:
+        applied = await run_command(
+            session,
+            f"batch of {len(owned_payload)}",
+            lambda service: service.apply_batch(owned_payload),
+            principal,
+        )
+        if isinstance(applied, Response):
+            return applied
+    for index, result in zip(owned, applied):
+        results[index] = result
+    return results
@@ -0,0 +1,93 @@
+from typing import Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import get_session
+from app.repos.timer_repo import TimerRepo
+from app.repos.webhook_repo import WebhookRepo
+from app.routers.timer import get_principal, owner_of
+from app.schemas.webhook import WebhookCreate, WebhookSubscriptionResponse
+from app.services.auth import Principal
+from app.services.webhooks import UnsafeDestination, check_destination
+
+router = APIRouter(prefix="/api", tags=["webhooks"])
+
+settings = get_settings()
+
+
+async def run_webhook_repo(
+    session: AsyncSession, timer_id: UUID, principal: Optional[Principal], call
+):
+    """Run a WebhookRepo call for a timer the caller owns, 404 otherwise."""
+    def _call(db):
+        if TimerRepo(db, owner_of(principal)).get_timer(timer_id) is None:
+            return None, False
+        return call(WebhookRepo(db)), True
+
+    result, found = await session.run_sync(_call)
+    if not found:
+        raise HTTPException(status_code=404, detail="Timer not found")
+    return result
+
+
+@router.post(
+    "/timer/{timer_id}/webhooks", response_model=WebhookSubscriptionResponse, status_code=201
+)
+async def create_webhook(
+    timer_id: UUID,
+    config: WebhookCreate,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> WebhookSubscriptionResponse:
+    """Subscribe a URL to a timer's transitions.
+
+    Notifications are POSTed as ``{"deliveries": [...]}`` and signed with
+    an ``X-Timer-Signature`` HMAC-SHA256 header when a secret is given.
+    URLs whose host resolves to a loopback, private or link-local address
+    are refused unless the host is in ``WEBHOOK_ALLOWED_HOSTS``.
+    """
+    try:
+        await check_destination(config.url, settings.webhook_allowed_hosts)
+    except UnsafeDestination as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events = [event.value for event in config.events]
+    return await run_webhook_repo(
+        session,
+        timer_id,
+        principal,
+        lambda repo: repo.create_subscription(timer_id, config.url, events, config.secret).to_dict(),
+    )
+
+
+@router.get("/timer/{timer_id}/webhooks", response_model=list[WebhookSubscriptionResponse])
+async def list_webhooks(
+    timer_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> list[WebhookSubscriptionResponse]:
+    """List a timer's webhook subscriptions."""
+    return await run_webhook_repo(
+        session,
+        timer_id,
+        principal,
+        lambda repo: [subscription.to_dict() for subscription in repo.list_subscriptions(timer_id)],
+    )
+
+
+@router.delete("/timer/{timer_id}/webhooks/{subscription_id}", status_code=204)
+async def delete_webhook(
+    timer_id: UUID,
+    subscription_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    principal: Optional[Principal] = Depends(get_principal),
+) -> Response:
+    """Unsubscribe, dropping any notifications still pending for it."""
+    deleted = await run_webhook_repo(
+        session, timer_id, principal, lambda repo: repo.delete_subscription(timer_id, subscription_id)
+    )
+    if not deleted:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return Response(status_code=204)
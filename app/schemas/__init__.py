@@ -0,0 +1,3 @@
+from app.schemas.timer import TimerConfig, TimerState, UrgencyState
+
+__all__ = ["TimerConfig", "TimerState", "UrgencyState"]
@@ -0,0 +1,10 @@
+from typing import Optional
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class ServerTime(BaseModel):
+    """Server clock reading for client offset estimation."""
+    epoch_ms: float
+    server_time: datetime
+    client_time_ms: Optional[float] = None
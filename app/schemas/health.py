@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class ComponentHealth(BaseModel):
+    """Result of one readiness check."""
+    ok: bool
+    detail: str
+    # False for checks reported without affecting readiness
+    required: bool = True
+
+
+class Readiness(BaseModel):
+    """Aggregate readiness of this worker."""
+    status: str
+    checks: dict[str, ComponentHealth]
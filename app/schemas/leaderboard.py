@@ -0,0 +1,29 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class LeaderboardName(str, Enum):
+    """Available rankings."""
+    resets = "resets"
+    consistency = "consistency"
+
+
+class LeaderboardEntry(BaseModel):
+    """One ranked timer."""
+    rank: int
+    timer_id: str
+    name: Optional[str]
+    resets: int
+    mean_interval_seconds: Optional[float]
+    # Coefficient of variation of reset intervals; lower is steadier
+    variation: Optional[float]
+
+
+class Leaderboard(BaseModel):
+    """Top timers on a board."""
+    board: LeaderboardName
+    entries: list[LeaderboardEntry]
+    reconciled_at: Optional[datetime] = None
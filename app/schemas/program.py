@@ -0,0 +1,56 @@
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class PhaseKind(str, Enum):
+    """Interval phase type."""
+    work = "work"
+    rest = "rest"
+
+
+class ProgramStatus(str, Enum):
+    """Interval program operational state."""
+    stopped = "stopped"
+    running = "running"
+    finished = "finished"
+
+
+class ProgramPhaseCreate(BaseModel):
+    """Single phase of a new program."""
+    name: str = Field(default="Work", min_length=1, max_length=255)
+    kind: PhaseKind = PhaseKind.work
+    duration_seconds: int = Field(ge=1, le=3600)
+
+
+class ProgramCreate(BaseModel):
+    """Create an interval program for a group of timers."""
+    name: str = Field(default="Intervals", min_length=1, max_length=255)
+    phases: list[ProgramPhaseCreate] = Field(min_length=1, max_length=50)
+    repeat_count: int = Field(default=1, ge=1, le=100)
+    timer_ids: list[UUID] = Field(default_factory=list, max_length=500)
+
+
+class ProgramPhaseResponse(BaseModel):
+    """Phase as stored in a program."""
+    position: int
+    name: str
+    kind: PhaseKind
+    duration_seconds: int
+
+
+class ProgramResponse(BaseModel):
+    """Interval program state for API response."""
+    id: str
+    name: str
+    repeat_count: int
+    status: ProgramStatus
+    current_phase_index: int
+    current_round: int
+    phase_started_at: Optional[datetime] = None
+    phase_deadline: Optional[datetime] = None
+    phases: list[ProgramPhaseResponse]
+    created_at: datetime
+    updated_at: datetime
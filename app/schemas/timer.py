@@ -1,6 +1,7 @@
 from enum import Enum
 from typing import Optional
-from pydantic import BaseModel, Field
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 
 
@@ -18,6 +19,26 @@ class UrgencyLevel(int, Enum):
     alert = 1
     caution = 2
     alarm = 3
+    # Names used by TimerService thresholds
+    elevated = 1
+    anxious = 2
+
+    @classmethod
+    def from_ratio(cls, remaining_seconds: int, duration_seconds: int) -> "UrgencyLevel":
+        """Urgency for the fraction of the duration still remaining."""
+        if duration_seconds == 0:
+            return cls.calm
+
+        ratio = remaining_seconds / duration_seconds
+
+        if ratio > 0.5:
+            return cls.calm
+        elif ratio > 0.25:
+            return cls.elevated
+        elif ratio > 0.0:
+            return cls.anxious
+        else:
+            return cls.alarm
 
 
 class TimerEventType(str, Enum):
@@ -26,6 +47,8 @@ class TimerEventType(str, Enum):
     started = "started"
     paused = "paused"
     expired = "expired"
+    phase = "phase"
+    tick = "tick"
 
 
 class TimerEventCreate(BaseModel):
@@ -41,6 +64,9 @@ class TimerEventResponse(BaseModel):
     timer_id: str
     event_type: TimerEventType
     urgency_level: UrgencyLevel
+    remaining_seconds: Optional[int] = None
+    duration_seconds: Optional[int] = None
+    sequence: Optional[int] = None
     recorded_at: datetime
 
     class Config:
@@ -82,3 +108,93 @@ class UrgencyResponse(BaseModel):
     remaining_seconds: int
     duration_seconds: int
     intensity_percent: float = Field(ge=0, le=100)
+
+
+class TimerConfig(BaseModel):
+    """Configure the active timer."""
+    duration: int = Field(ge=1, le=3600)
+    name: str = Field(default="Workout", min_length=1, max_length=255)
+
+
+class TimerState(BaseModel):
+    """Active timer state for the countdown display."""
+    id: str
+    countdown: int
+    duration: int
+    is_paused: bool
+    is_expired: bool
+    urgency_level: str
+    colour_intensity: float = Field(ge=0, le=1)
+    last_reset_at: Optional[datetime] = None
+
+
+class UrgencyState(BaseModel):
+    """Urgency level and face for the active timer."""
+    urgency_level: str
+    colour_intensity: float = Field(ge=0, le=1)
+    remaining_percent: float = Field(ge=0, le=100)
+    facial_expression: str
+    # Content-addressed face SVG; see /api/face
+    face_url: Optional[str] = None
+
+
+class CompactTimerState(BaseModel):
+    """Minimal polling state; ``version`` is the last update in epoch milliseconds."""
+    remaining: int
+    status: TimerStatus
+    urgency: UrgencyLevel
+    version: int
+
+
+class TimerCommandOp(str, Enum):
+    """Operations accepted by the batch command endpoint."""
+    start = "start"
+    pause = "pause"
+    resume = "resume"
+    reset = "reset"
+    tick = "tick"
+
+
+class TimerCommandArgs(BaseModel):
+    """Arguments of a batch operation; unknown keys are rejected."""
+    model_config = ConfigDict(extra="forbid")
+
+    # New duration for reset
+    duration_seconds: Optional[int] = Field(default=None, ge=1, le=3600)
+    # Seconds elapsed for tick; checked per command so one bad tick fails alone
+    delta_seconds: Optional[int] = None
+
+
+class TimerCommand(BaseModel):
+    """Single operation in a batch request."""
+    id: UUID
+    op: TimerCommandOp
+    args: TimerCommandArgs = Field(default_factory=TimerCommandArgs)
+
+
+class TimerCommandResult(BaseModel):
+    """Outcome of a single batch operation, in request order."""
+    id: str
+    op: TimerCommandOp
+    ok: bool
+    timer: Optional[TimerResponse] = None
+    error: Optional[str] = None
+
+
+class TimelinePoint(BaseModel):
+    """Lowest remaining time and highest urgency within one interval of a timeline."""
+    offset_seconds: int
+    remaining_seconds: int
+    urgency_level: UrgencyLevel
+    status: TimerStatus
+
+
+class TimerTimeline(BaseModel):
+    """Urgency over a timer's history at a fixed resolution."""
+    timer_id: str
+    started_at: Optional[datetime] = None
+    ended_at: Optional[datetime] = None
+    resolution_seconds: int
+    # False while a countdown is still running
+    final: bool
+    points: list[TimelinePoint]
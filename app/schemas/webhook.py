@@ -0,0 +1,34 @@
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class WebhookEvent(str, Enum):
+    """Transitions a webhook can subscribe to."""
+    # Urgency reached alarm, which the current thresholds only do at expiry
+    alarm = "alarm"
+    expired = "expired"
+    started = "started"
+    paused = "paused"
+    reset = "reset"
+
+
+class WebhookCreate(BaseModel):
+    """Subscribe an endpoint to a timer's transitions."""
+    url: str = Field(pattern=r"^https?://", max_length=2048)
+    events: list[WebhookEvent] = Field(
+        default=[WebhookEvent.alarm, WebhookEvent.expired], min_length=1
+    )
+    secret: Optional[str] = Field(default=None, min_length=8, max_length=255)
+
+
+class WebhookSubscriptionResponse(BaseModel):
+    """A webhook subscription; the secret is never returned."""
+    id: str
+    timer_id: str
+    url: str
+    events: list[WebhookEvent]
+    signed: bool
+    created_at: datetime
@@ -0,0 +1,150 @@
+import base64
+import hashlib
+import hmac
+import json
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional
+
+from app.config import get_settings
+
+
+# Owner key of timers created without authentication.
+NO_OWNER = bytes(16)
+
+JWT_HEADER = {"alg": "HS256", "typ": "JWT"}
+
+
+def owner_key(owner_id: Optional[str]) -> bytes:
+    """Fixed-size digest of an owner id, as held by the timer cache."""
+    if owner_id is None:
+        return NO_OWNER
+    return hashlib.blake2b(owner_id.encode(), digest_size=16).digest()
+
+
+class Principal(NamedTuple):
+    """Authenticated caller of the timer API."""
+    subject: str
+    owner_key: bytes
+    # Epoch seconds from the ``exp`` claim
+    expires_at: float
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(segment: str) -> bytes:
+    return base64.urlsafe_b64decode(segment + "=" * (-len(segment) % 4))
+
+
+def issue_token(
+    subject: str, secret: str, ttl_seconds: float = 3600, now: Optional[float] = None
+) -> str:
+    """Sign an HS256 token for ``subject``."""
+    claims = {"sub": subject, "exp": int((now if now is not None else time.time()) + ttl_seconds)}
+    return sign_claims(claims, secret)
+
+
+def sign_claims(claims: dict, secret: str) -> str:
+    """Sign arbitrary claims as an HS256 token."""
+    signing_input = ".".join(
+        _b64encode(json.dumps(part, separators=(",", ":")).encode()) for part in (JWT_HEADER, claims)
+    )
+    signature = hmac.new(secret.encode(), signing_input.encode(), hashlib.sha256).digest()
+    return f"{signing_input}.{_b64encode(signature)}"
+
+
+def verify_token(token: str, secret: str, now: float) -> Principal:
+    """Check an HS256 token's signature and time claims.
+
+    Raises ValueError describing why the token was rejected.
+    """
+    try:
+        header_segment, claims_segment, signature_segment = token.split(".")
+        header = json.loads(_b64decode(header_segment))
+        claims = json.loads(_b64decode(claims_segment))
+        signature = _b64decode(signature_segment)
+    except (ValueError, TypeError):
+        raise ValueError("Malformed token")
+    if not isinstance(header, dict) or header.get("alg") != "HS256":
+        raise ValueError("Unsupported token algorithm")
+
+    expected = hmac.new(
+        secret.encode(), f"{header_segment}.{claims_segment}".encode(), hashlib.sha256
+    ).digest()
+    if not hmac.compare_digest(signature, expected):
+        raise ValueError("Invalid token signature")
+
+    if not isinstance(claims, dict) or not isinstance(claims.get("sub"), str):
+        raise ValueError("Token has no subject")
+    # Cached principals live until ``exp``, so a token without one is refused.
+    expires_at = claims.get("exp")
+    if not _is_timestamp(expires_at):
+        raise ValueError("Token has no valid expiry")
+    if now >= expires_at:
+        raise ValueError("Token expired")
+    not_before = claims.get("nbf")
+    if not_before is not None and not _is_timestamp(not_before):
+        raise ValueError("Token has an invalid not-before time")
+    if not_before is not None and now < not_before:
+        raise ValueError("Token not yet valid")
+    return Principal(claims["sub"], owner_key(claims["sub"]), expires_at)
+
+
+def _is_timestamp(value: object) -> bool:
+    """Whether a time claim is a JSON number, as opposed to a string, bool or null."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class Authenticator:
+    """Bearer token verification behind an LRU cache of verified tokens.
+
+    Clients poll about once a second with the same token, so after the
+    first request a lookup costs one short hash and a dict probe instead of
+    an HMAC and two JSON decodes. Entries are keyed by a digest of the
+    token, never outlive the token's ``exp``, and the least recently used
+    entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, secret: str, max_entries: int = 10000, time_source: Callable[[], float] = time.time):
+        """Initialize with the signing secret and cache capacity."""
+        self.secret = secret
+        self.max_entries = max_entries
+        self.time_source = time_source
+        self._cache: OrderedDict[bytes, Principal] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def authenticate(self, token: str) -> Principal:
+        """Principal for a bearer token; raises ValueError if it is not valid."""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        now = self.time_source()
+        principal = self._cache.get(key)
+        if principal is not None:
+            if now < principal.expires_at:
+                self._cache.move_to_end(key)
+                return principal
+            del self._cache[key]
+
+        principal = verify_token(token, self.secret, now)
+        self._cache[key] = principal
+        if len(self._cache) > self.max_entries:
+            self._evict(now)
+        return principal
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries from the least recently used end, then trim to capacity."""
+        while self._cache:
+            oldest = next(iter(self._cache.values()))
+            if now < oldest.expires_at:
+                break
+            self._cache.popitem(last=False)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+
+settings = get_settings()
+
+authenticator = Authenticator(settings.jwt_secret, settings.auth_token_cache_size)
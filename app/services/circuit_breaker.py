@@ -0,0 +1,79 @@
+from typing import Optional
+
+from app.services.clock import Clock, system_clock
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency until it has had time to recover.
+
+    Closed: calls go through and consecutive failures are counted. After
+    ``failure_threshold`` of them the breaker opens and ``allow`` refuses
+    instantly, so callers skip the dependency instead of waiting on its
+    timeouts. Once ``reset_timeout_seconds`` have passed it is half-open and
+    lets one trial call through; success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 5.0,
+        clock: Clock = system_clock,
+    ):
+        """Start closed."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+
+    @property
+    def closed(self) -> bool:
+        """Whether calls currently go through without restriction."""
+        return self.state == self.CLOSED
+
+    def allow(self) -> bool:
+        """Whether a call may be attempted now.
+
+        When half-open only one trial is admitted at a time; a trial that
+        never reports back is replaced after another reset timeout.
+        """
+        if self.state == self.CLOSED:
+            return True
+        now = self.clock.monotonic()
+        if self.state == self.OPEN:
+            if now - self._opened_at < self.reset_timeout_seconds:
+                return False
+            self.state = self.HALF_OPEN
+        elif (
+            self._trial_started_at is not None
+            and now - self._trial_started_at < self.reset_timeout_seconds
+        ):
+            return False
+        self._trial_started_at = now
+        return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a call succeeded."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_started_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker past the threshold."""
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self._opened_at = self.clock.monotonic()
+            self._trial_started_at = None
+
+    def retry_after_seconds(self) -> float:
+        """Time until the next trial call is admitted."""
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self.reset_timeout_seconds - (self.clock.monotonic() - self._opened_at))
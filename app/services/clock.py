@@ -0,0 +1,63 @@
+import time
+from datetime import datetime, timedelta
+
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_epoch_ms(value: datetime) -> int:
+    """Naive UTC datetime as integer epoch milliseconds."""
+    return (value - EPOCH) // timedelta(milliseconds=1)
+
+
+class Clock:
+    """Time source for timer logic.
+
+    ``now`` is naive UTC wall-clock time for persisted timestamps.
+    ``monotonic`` never jumps with NTP adjustments and is used for sleeping
+    until deadlines.
+    """
+
+    def now(self) -> datetime:
+        """Current wall-clock time (naive UTC)."""
+        return datetime.utcnow()
+
+    def monotonic(self) -> float:
+        """Current monotonic time in seconds."""
+        return time.monotonic()
+
+    def epoch_ms(self) -> float:
+        """Current wall-clock time as fractional epoch milliseconds."""
+        return time.time_ns() / 1_000_000
+
+    def monotonic_deadline(self, deadline: datetime) -> float:
+        """Translate a wall-clock deadline onto the monotonic timeline."""
+        return self.monotonic() + (deadline - self.now()).total_seconds()
+
+
+class ManualClock(Clock):
+    """Clock that only moves when told to, for tests and simulations."""
+
+    def __init__(self, start: datetime):
+        """Initialize clock at a fixed wall-clock time."""
+        self._start = start
+        self._elapsed = 0.0
+
+    def now(self) -> datetime:
+        """Start time plus the time advanced so far."""
+        return self._start + timedelta(seconds=self._elapsed)
+
+    def monotonic(self) -> float:
+        """Seconds advanced since the clock was created."""
+        return self._elapsed
+
+    def epoch_ms(self) -> float:
+        """Current manual time as fractional epoch milliseconds."""
+        return (self.now() - EPOCH).total_seconds() * 1000
+
+    def advance(self, seconds: float) -> None:
+        """Move time forward."""
+        self._elapsed += seconds
+
+
+system_clock = Clock()
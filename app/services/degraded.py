@@ -0,0 +1,203 @@
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from typing import Any, Callable, NamedTuple, Optional
+
+import sqlalchemy as sa
+
+from app.config import get_settings
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.clock import Clock, system_clock
+from app.services.metrics import Counter, Gauge
+
+
+logger = logging.getLogger(__name__)
+
+# Errors meaning the database could not be reached, as opposed to a bad
+# statement or a rejected transition. Drivers surface failed connects as
+# bare OSError (DNS failures as socket.gaierror), not only ConnectionError.
+DATABASE_ERRORS = (
+    sa.exc.OperationalError,
+    sa.exc.InterfaceError,
+    sa.exc.TimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+degraded_responses = Counter(
+    "degraded_responses_total",
+    "Requests answered without the database, by how.",
+    ("mode",),
+)
+journal_depth = Gauge(
+    "command_journal_depth",
+    "Commands waiting to be replayed once the database is back.",
+)
+breaker_open = Gauge(
+    "db_circuit_open",
+    "1 while the database circuit breaker refuses calls.",
+)
+
+
+class DatabaseUnavailable(Exception):
+    """The database breaker is open or the call failed to reach the database."""
+
+
+class JournalFull(Exception):
+    """The command journal has no room for another command."""
+
+
+class KnownState(NamedTuple):
+    """A response body as last served from the database."""
+    state: dict
+    recorded_at: float
+
+
+class LastKnownStates:
+    """Most recent read results per owner and kind, for serving during outages.
+
+    Timer state only changes through commands, so the last state read from
+    the database stays what clients should see until the next command.
+    Bounded by owner; the least recently refreshed owners are dropped first.
+    """
+
+    def __init__(self, max_entries: int = 10000, clock: Clock = system_clock):
+        """Initialize an empty store."""
+        self.max_entries = max_entries
+        self.clock = clock
+        self._owners: OrderedDict[Optional[str], dict[str, KnownState]] = OrderedDict()
+
+    def remember(self, kind: str, owner_id: Optional[str], state: dict) -> None:
+        """Record a state just served from the database."""
+        self._owner_states(owner_id)[kind] = KnownState(state, self.clock.monotonic())
+
+    def replace(self, kind: str, owner_id: Optional[str], state: dict) -> None:
+        """Record a state returned by a command, dropping the owner's other kinds.
+
+        The other kinds were read before the command changed the timer.
+        """
+        states = self._owner_states(owner_id)
+        states.clear()
+        states[kind] = KnownState(state, self.clock.monotonic())
+
+    def get(self, kind: str, owner_id: Optional[str]) -> Optional[KnownState]:
+        """Last known state, if one was served since the owner's last command."""
+        return self._owners.get(owner_id, {}).get(kind)
+
+    def age_seconds(self, known: KnownState) -> float:
+        """How long ago a known state was read from the database."""
+        return self.clock.monotonic() - known.recorded_at
+
+    def _owner_states(self, owner_id: Optional[str]) -> dict[str, KnownState]:
+        """The owner's states, marked most recently used."""
+        states = self._owners.get(owner_id)
+        if states is None:
+            states = self._owners[owner_id] = {}
+            if len(self._owners) > self.max_entries:
+                self._owners.popitem(last=False)
+        else:
+            self._owners.move_to_end(owner_id)
+        return states
+
+
+class JournaledCommand(NamedTuple):
+    """A command accepted while the database was unavailable."""
+    owner_id: Optional[str]
+    description: str
+    call: Callable[[Any], Any]
+
+
+CommandRunner = Callable[[JournaledCommand], Any]
+
+
+class CommandJournal:
+    """Bounded in-order queue of commands replayed once the database recovers.
+
+    The journal lives in this worker's memory: commands still queued when
+    the process stops are lost, which is why it is bounded and commands are
+    answered with 202 rather than a new timer state.
+    """
+
+    def __init__(self, breaker: CircuitBreaker, max_entries: int, interval_seconds: float):
+        """Initialize an empty journal replayed through ``breaker``."""
+        self.breaker = breaker
+        self.max_entries = max_entries
+        self.interval_seconds = interval_seconds
+        self._entries: deque[JournaledCommand] = deque()
+        self._task: Optional[asyncio.Task] = None
+        self._replaying = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def append(self, command: JournaledCommand) -> int:
+        """Queue a command and return its position, or raise JournalFull."""
+        if len(self._entries) >= self.max_entries:
+            raise JournalFull(f"Command journal holds {self.max_entries} commands")
+        self._entries.append(command)
+        return len(self._entries)
+
+    async def replay(self, run: Callable[[JournaledCommand], Any]) -> int:
+        """Apply queued commands in order until the journal is empty or the database fails.
+
+        Commands rejected by the timer state machine are dropped, as they
+        would have been answered with 400 had the database been up.
+        Returns the number of commands applied.
+        """
+        applied = 0
+        async with self._replaying:
+            while self._entries and self.breaker.allow():
+                command = self._entries[0]
+                try:
+                    await run(command)
+                except DATABASE_ERRORS:
+                    self.breaker.record_failure()
+                    break
+                except ValueError as e:
+                    logger.warning("Dropping journaled %s: %s", command.description, e)
+                except Exception:
+                    logger.exception("Dropping journaled %s", command.description)
+                else:
+                    applied += 1
+                self.breaker.record_success()
+                self._entries.popleft()
+        if applied:
+            logger.info("Replayed %d journaled commands", applied)
+        return applied
+
+    async def start(self, run: CommandRunner) -> None:
+        """Replay in the background whenever commands are queued."""
+        self._task = asyncio.create_task(self._run(run))
+
+    async def stop(self) -> None:
+        """Stop replaying; queued commands stay in memory."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._entries:
+            logger.warning("Stopping with %d journaled commands not replayed", len(self._entries))
+
+    async def _run(self, run: CommandRunner) -> None:
+        """Try a replay on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            if self._entries:
+                try:
+                    await self.replay(run)
+                except Exception:
+                    logger.exception("Journal replay failed")
+
+
+settings = get_settings()
+
+db_breaker = CircuitBreaker(settings.db_circuit_failure_threshold, settings.db_circuit_reset_seconds)
+last_known_states = LastKnownStates()
+command_journal = CommandJournal(
+    db_breaker, settings.command_journal_size, settings.db_circuit_reset_seconds
+)
+journal_depth.callback = lambda: {(): len(command_journal)}
+breaker_open.callback = lambda: {(): int(db_breaker.state == CircuitBreaker.OPEN)}
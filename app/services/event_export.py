@@ -0,0 +1,288 @@
+"""Export timer events to Parquet files partitioned by day and timer.
+
+Streams ``timer_event`` rows recorded since the last export through a
+server-side cursor and appends them, one record batch at a time, to
+``day=YYYY-MM-DD/timer_id=<uuid>/part-<run>.parquet`` under the output
+directory. The high-water mark on ``recorded_at`` is kept next to the
+files, so each run only reads new rows and can point at a replica.
+Program phase events are stamped with the phase boundary, which can lie
+before the moment they commit, so each run re-reads a grace window behind
+the mark and skips the event ids it already exported there:
+
+    python -m app.services.event_export --output var/export \\
+        --database-url postgresql://reader@replica/timer
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+from app.models.timer import TimerEvent
+from app.services.clock import Clock, system_clock
+from app.services.offload import sync_database_url
+
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = "_export_state.json"
+
+# timer_id and the day are encoded in the partition path.
+SCHEMA = pa.schema(
+    [
+        ("id", pa.string()),
+        ("event_type", pa.string()),
+        ("urgency_level", pa.int32()),
+        ("recorded_at", pa.timestamp("us")),
+        ("remaining_seconds", pa.int32()),
+        ("duration_seconds", pa.int32()),
+        ("sequence", pa.int32()),
+    ]
+)
+
+COLUMNS = (
+    TimerEvent.id,
+    TimerEvent.timer_id,
+    TimerEvent.event_type,
+    TimerEvent.urgency_level,
+    TimerEvent.recorded_at,
+    TimerEvent.remaining_seconds,
+    TimerEvent.duration_seconds,
+    TimerEvent.sequence,
+)
+
+
+@dataclass
+class ExportReport:
+    """Outcome of one export run."""
+    rows: int
+    files: int
+    since: Optional[datetime]
+    until: datetime
+
+
+def read_state(output_dir: str) -> tuple[Optional[datetime], dict[str, datetime]]:
+    """High-water mark and the ids exported within the grace window behind it."""
+    try:
+        with open(os.path.join(output_dir, STATE_FILE)) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None, {}
+    recent = {
+        event_id: datetime.fromisoformat(recorded_at)
+        for event_id, recorded_at in state.get("recent", {}).items()
+    }
+    return datetime.fromisoformat(state["high_water"]), recent
+
+
+def read_high_water(output_dir: str) -> Optional[datetime]:
+    """``recorded_at`` up to which events were exported, or None before the first run."""
+    return read_state(output_dir)[0]
+
+
+def write_state(output_dir: str, high_water: datetime, recent: dict[str, datetime]) -> None:
+    """Record the high-water mark and recently exported ids atomically."""
+    path = os.path.join(output_dir, STATE_FILE)
+    state = {
+        "high_water": high_water.isoformat(),
+        "recent": {event_id: recorded_at.isoformat() for event_id, recorded_at in recent.items()},
+    }
+    with open(path + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(path + ".tmp", path)
+
+
+def hidden(path: str) -> str:
+    """Name a file is written under until its run completes."""
+    directory, name = os.path.split(path)
+    return os.path.join(directory, "." + name)
+
+
+class PartitionWriters:
+    """Open Parquet writers per (day, timer) partition, bounded in number.
+
+    Each record batch is appended to its partitions as row groups. Files
+    are written under a hidden name, which dataset readers skip, and only
+    renamed into place by ``commit``, so readers never see a partial run.
+    When more than ``max_open`` partitions are open the least recently
+    written is closed; later rows for it start another part file.
+    """
+
+    def __init__(self, output_dir: str, run_id: str, max_open: int):
+        """Initialize with no open files."""
+        self.output_dir = output_dir
+        self.run_id = run_id
+        self.max_open = max_open
+        self.files = 0
+        self._open: OrderedDict[tuple[str, str], tuple[pq.ParquetWriter, str]] = OrderedDict()
+        self._written: list[str] = []
+
+    def write(self, day: str, timer_id: str, columns: dict) -> None:
+        """Append rows to a partition."""
+        key = (day, timer_id)
+        if key in self._open:
+            self._open.move_to_end(key)
+            writer, _ = self._open[key]
+        else:
+            directory = os.path.join(self.output_dir, f"day={day}", f"timer_id={timer_id}")
+            os.makedirs(directory, exist_ok=True)
+            self.files += 1
+            path = os.path.join(directory, f"part-{self.run_id}-{self.files}.parquet")
+            writer = pq.ParquetWriter(hidden(path), SCHEMA)
+            self._open[key] = (writer, path)
+            if len(self._open) > self.max_open:
+                self._close(*self._open.popitem(last=False))
+        writer.write_table(pa.Table.from_pydict(columns, schema=SCHEMA))
+
+    def close_days_before(self, day: str) -> None:
+        """Close partitions of earlier days, which rows in time order will not revisit."""
+        for key in [key for key in self._open if key[0] < day]:
+            self._close(key, self._open.pop(key))
+
+    def commit(self) -> None:
+        """Close every file and move the run's files into place."""
+        for key in list(self._open):
+            self._close(key, self._open.pop(key))
+        for path in self._written:
+            os.replace(hidden(path), path)
+
+    def abort(self) -> None:
+        """Close and delete the run's files."""
+        for key in list(self._open):
+            self._close(key, self._open.pop(key))
+        for path in self._written:
+            os.remove(hidden(path))
+
+    def _close(self, key: tuple[str, str], entry: tuple[pq.ParquetWriter, str]) -> None:
+        writer, path = entry
+        writer.close()
+        self._written.append(path)
+
+
+def group_rows(rows: Iterable) -> dict[tuple[str, str], dict]:
+    """Split a batch of event rows into column dicts per (day, timer) partition."""
+    partitions: dict[tuple[str, str], dict] = {}
+    for row in rows:
+        key = (row.recorded_at.date().isoformat(), str(row.timer_id))
+        columns = partitions.get(key)
+        if columns is None:
+            columns = partitions[key] = {field: [] for field in SCHEMA.names}
+        columns["id"].append(str(row.id))
+        columns["event_type"].append(row.event_type)
+        columns["urgency_level"].append(row.urgency_level)
+        columns["recorded_at"].append(row.recorded_at)
+        columns["remaining_seconds"].append(row.remaining_seconds)
+        columns["duration_seconds"].append(row.duration_seconds)
+        columns["sequence"].append(row.sequence)
+    return partitions
+
+
+def export_events(
+    engine: Engine,
+    output_dir: str,
+    batch_size: int = 10000,
+    settle_seconds: float = 60.0,
+    max_open_files: int = 256,
+    clock: Clock = system_clock,
+    grace_seconds: float = 900.0,
+) -> ExportReport:
+    """Export events recorded after the high-water mark.
+
+    Rows newer than ``settle_seconds`` are left for the next run, so a
+    transaction that commits shortly after its events were stamped is
+    never skipped. Events that commit later still, stamped up to
+    ``grace_seconds`` behind the mark, are picked up by re-reading that
+    window and skipping ids already exported. Memory is bounded by one
+    batch of rows, the open writers and the ids within the window; the
+    high-water mark only advances once every file is in place.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    since, recent = read_state(output_dir)
+    until = clock.now() - timedelta(seconds=settle_seconds)
+    grace = timedelta(seconds=grace_seconds)
+    query = select(*COLUMNS).where(TimerEvent.recorded_at <= until)
+    if since is not None:
+        query = query.where(TimerEvent.recorded_at > since - grace)
+    query = query.order_by(TimerEvent.recorded_at, TimerEvent.id)
+
+    writers = PartitionWriters(output_dir, until.strftime("%Y%m%dT%H%M%S"), max_open_files)
+    rows = 0
+    exported: dict[str, datetime] = {}
+    try:
+        with engine.connect() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=batch_size).execute(query)
+            for batch in result.partitions():
+                batch = [row for row in batch if str(row.id) not in recent]
+                if not batch:
+                    continue
+                partitions = group_rows(batch)
+                writers.close_days_before(min(day for day, _ in partitions))
+                for (day, timer_id), columns in partitions.items():
+                    writers.write(day, timer_id, columns)
+                rows += len(batch)
+                exported.update(
+                    (str(row.id), row.recorded_at) for row in batch if row.recorded_at > until - grace
+                )
+    except BaseException:
+        writers.abort()
+        raise
+    writers.commit()
+    recent.update(exported)
+    write_state(
+        output_dir,
+        until,
+        {event_id: recorded_at for event_id, recorded_at in recent.items() if recorded_at > until - grace},
+    )
+    logger.info("Exported %d events to %d files up to %s", rows, writers.files, until)
+    return ExportReport(rows, writers.files, since, until)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default=settings.export_dir, help="export directory")
+    parser.add_argument(
+        "--database-url", default=settings.database_url, help="read from here, e.g. a replica"
+    )
+    parser.add_argument("--batch-size", type=int, default=settings.export_batch_size)
+    parser.add_argument(
+        "--settle-seconds",
+        type=float,
+        default=settings.export_settle_seconds,
+        help="leave events this recent for the next run",
+    )
+    parser.add_argument(
+        "--grace-seconds",
+        type=float,
+        default=settings.export_grace_seconds,
+        help="re-read events stamped this far behind the last run",
+    )
+    args = parser.parse_args(argv)
+
+    engine = create_engine(sync_database_url(args.database_url))
+    try:
+        report = export_events(
+            engine, args.output, args.batch_size, args.settle_seconds, grace_seconds=args.grace_seconds
+        )
+    finally:
+        engine.dispose()
+    print(
+        f"exported {report.rows} events in {report.files} files "
+        f"({report.since or 'start'} .. {report.until})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import hashlib
+import math
+from typing import NamedTuple, Optional
+
+from app.config import get_settings
+from app.schemas.timer import UrgencyLevel
+
+
+FACIAL_EXPRESSIONS = {
+    UrgencyLevel.calm: "calm",
+    UrgencyLevel.elevated: "slightly_concerned",
+    UrgencyLevel.anxious: "anxious",
+    UrgencyLevel.alarm: "alarm",
+}
+
+# Eyes and mouth per expression, drawn on a 100x100 face.
+FEATURES = {
+    "calm": (
+        '<circle cx="35" cy="40" r="6"/><circle cx="65" cy="40" r="6"/>'
+        '<path d="M30 62 Q50 78 70 62" fill="none" stroke-width="5" stroke-linecap="round"/>'
+    ),
+    "slightly_concerned": (
+        '<circle cx="35" cy="40" r="6"/><circle cx="65" cy="40" r="6"/>'
+        '<path d="M32 68 L68 68" fill="none" stroke-width="5" stroke-linecap="round"/>'
+    ),
+    "anxious": (
+        '<path d="M26 28 L42 32 M74 28 L58 32" fill="none" stroke-width="4" stroke-linecap="round"/>'
+        '<circle cx="35" cy="42" r="5"/><circle cx="65" cy="42" r="5"/>'
+        '<path d="M30 70 Q40 62 50 70 Q60 78 70 70" fill="none" stroke-width="5" stroke-linecap="round"/>'
+    ),
+    "alarm": (
+        '<path d="M24 24 L42 30 M76 24 L58 30" fill="none" stroke-width="4" stroke-linecap="round"/>'
+        '<circle cx="35" cy="42" r="9" fill="#FFFFFF" stroke-width="3"/><circle cx="35" cy="42" r="4"/>'
+        '<circle cx="65" cy="42" r="9" fill="#FFFFFF" stroke-width="3"/><circle cx="65" cy="42" r="4"/>'
+        '<ellipse cx="50" cy="72" rx="9" ry="11"/>'
+    ),
+}
+
+
+def intensity_to_colour(intensity: float) -> str:
+    """Green through yellow to red, as ``intensityToColour`` in the web client."""
+    clamped = max(0.0, min(1.0, intensity))
+    if clamped <= 0.5:
+        r, g = math.floor(255 * clamped / 0.5 + 0.5), 255
+    else:
+        r, g = 255, math.floor(255 * (1 - (clamped - 0.5) / 0.5) + 0.5)
+    return f"#{r:02X}{g:02X}00"
+
+
+def render_face(level: UrgencyLevel, intensity: float) -> str:
+    """SVG of the face for an urgency level tinted by colour intensity."""
+    return (
+        '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100" width="100" height="100">'
+        f'<circle cx="50" cy="50" r="46" fill="{intensity_to_colour(intensity)}" '
+        'stroke="#222222" stroke-width="4"/>'
+        f'<g fill="#222222" stroke="#222222">{FEATURES[FACIAL_EXPRESSIONS[level]]}</g>'
+        "</svg>"
+    )
+
+
+class FaceVariant(NamedTuple):
+    """A pre-rendered face and its content hash."""
+    digest: str
+    svg: bytes
+
+
+class FaceCatalog:
+    """Every face variant, rendered once and addressed by content hash.
+
+    Intensity is quantized to ``steps`` equal buckets, so the catalog
+    holds ``4 * (steps + 1)`` SVGs. A variant's URL changes only when its
+    content does, which lets clients cache each one forever.
+    """
+
+    def __init__(self, steps: int, url_prefix: str = "/api/face"):
+        """Render all variants."""
+        self.steps = steps
+        self.url_prefix = url_prefix
+        self._by_state: dict[tuple[int, int], FaceVariant] = {}
+        self._by_digest: dict[str, FaceVariant] = {}
+        for level in FACIAL_EXPRESSIONS:
+            for bucket in range(steps + 1):
+                svg = render_face(level, bucket / steps).encode()
+                variant = FaceVariant(hashlib.blake2b(svg, digest_size=12).hexdigest(), svg)
+                self._by_state[(int(level), bucket)] = variant
+                self._by_digest[variant.digest] = variant
+
+    def __len__(self) -> int:
+        return len(self._by_digest)
+
+    def quantize(self, intensity: float) -> int:
+        """Bucket of a colour intensity."""
+        return round(max(0.0, min(1.0, intensity)) * self.steps)
+
+    def variant(self, level: UrgencyLevel, intensity: float) -> FaceVariant:
+        """Variant for an urgency level and colour intensity."""
+        return self._by_state[(int(level), self.quantize(intensity))]
+
+    def url_for(self, level: UrgencyLevel, intensity: float) -> str:
+        """Immutable URL of the face for an urgency level and colour intensity."""
+        return f"{self.url_prefix}/{self.variant(level, intensity).digest}.svg"
+
+    def get(self, digest: str) -> Optional[FaceVariant]:
+        """Variant by content hash."""
+        return self._by_digest.get(digest)
+
+
+settings = get_settings()
+
+face_catalog = FaceCatalog(settings.face_intensity_steps)
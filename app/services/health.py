@@ -0,0 +1,142 @@
+import asyncio
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import get_settings
+from app.database import async_engine
+from app.services.clock import Clock, system_clock
+from app.services.program_engine import ProgramEngine, program_engine
+from app.services.timer_cache import TimerCache, timer_cache
+
+
+logger = logging.getLogger(__name__)
+
+# Scheduler deadlines this far overdue mean the dispatch loop is stuck.
+MAX_SCHEDULER_LAG_SECONDS = 5.0
+
+
+class HealthMonitor:
+    """Readiness of this worker, with the database probed in the background.
+
+    ``SELECT 1`` runs once per interval regardless of how often readiness
+    is asked for, so probe traffic never turns into database load. A failing
+    database is reported but only gates readiness with ``database_required``:
+    while the breaker serves stale reads and journals commands, pulling
+    every worker out of rotation would turn a degraded service into an
+    outage.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        cache: TimerCache,
+        programs: ProgramEngine,
+        interval_seconds: float,
+        pool_limit: int,
+        clock: Clock = system_clock,
+        database_required: bool = False,
+    ):
+        """Initialize monitor with the components it watches."""
+        self.engine = engine
+        self.cache = cache
+        self.programs = programs
+        self.interval_seconds = interval_seconds
+        self.pool_limit = pool_limit
+        self.clock = clock
+        self.database_required = database_required
+        self.last_ok_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def probe(self) -> None:
+        """Run ``SELECT 1`` and remember the outcome."""
+        try:
+            async with self.engine.connect() as conn:
+                await asyncio.wait_for(conn.execute(text("SELECT 1")), self.interval_seconds)
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Database probe failed: %s", self.last_error)
+        else:
+            self.last_ok_at = self.clock.monotonic()
+            self.last_error = None
+
+    def check_database(self) -> tuple[bool, str]:
+        """Whether the last background probe succeeded recently."""
+        if self.last_ok_at is None:
+            return False, self.last_error or "not probed yet"
+        age = self.clock.monotonic() - self.last_ok_at
+        if age > 3 * self.interval_seconds:
+            return False, self.last_error or f"last successful probe {age:.1f}s ago"
+        return True, f"last successful probe {age:.1f}s ago"
+
+    def check_pool(self) -> tuple[bool, str]:
+        """Whether a connection can be checked out without waiting."""
+        checked_out = self.engine.pool.checkedout()
+        return checked_out < self.pool_limit, f"{checked_out}/{self.pool_limit} connections in use"
+
+    def check_timer_cache(self) -> tuple[bool, str]:
+        """Whether the cache refresh task runs and keeps up with events."""
+        if not self.cache.alive:
+            return False, "refresh task not running"
+        lag = self.cache.lag_seconds()
+        if lag is None:
+            return False, "not loaded"
+        ok = lag <= 3 * self.cache.interval_seconds
+        return ok, f"{lag:.1f}s behind"
+
+    def check_scheduler(self) -> tuple[bool, str]:
+        """Whether the program scheduler runs and dispatches on time."""
+        scheduler = self.programs.scheduler
+        if not scheduler.alive:
+            return False, "dispatch task not running"
+        lag = scheduler.lag_seconds()
+        return lag <= MAX_SCHEDULER_LAG_SECONDS, f"{len(scheduler)} pending, {lag:.1f}s overdue"
+
+    def readiness(self) -> dict[str, tuple[bool, str]]:
+        """Run every check against cached state."""
+        return {
+            "database": self.check_database(),
+            "pool": self.check_pool(),
+            "timer_cache": self.check_timer_cache(),
+            "scheduler": self.check_scheduler(),
+        }
+
+    def required(self, check: str) -> bool:
+        """Whether a failing ``check`` makes this worker not ready."""
+        return check != "database" or self.database_required
+
+    async def start(self) -> None:
+        """Probe once and keep probing in the background."""
+        await self.probe()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop background probing."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Probe on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.probe()
+
+
+settings = get_settings()
+
+health_monitor = HealthMonitor(
+    async_engine,
+    timer_cache,
+    program_engine,
+    settings.health_check_interval_seconds,
+    settings.db_pool_size + settings.db_max_overflow,
+    database_required=settings.health_require_database,
+)
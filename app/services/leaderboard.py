@@ -0,0 +1,320 @@
+import asyncio
+import logging
+import math
+import random
+import threading
+from datetime import datetime
+from typing import Any, Hashable, Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.timer import Timer, TimerEvent
+from app.services.clock import Clock, system_clock
+
+
+logger = logging.getLogger(__name__)
+
+BOARDS = ("resets", "consistency")
+
+
+class SkipList:
+    """Sorted set of unique keys with O(log n) insert and remove.
+
+    Iteration walks the bottom level in order, so the first k keys cost O(k).
+    """
+
+    MAX_LEVEL = 24
+    BRANCHING = 0.25
+
+    class _Node:
+        __slots__ = ("key", "next")
+
+        def __init__(self, key: Any, level: int):
+            self.key = key
+            self.next: list[Optional["SkipList._Node"]] = [None] * level
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        """Initialize an empty list."""
+        self.rng = rng or random.Random()
+        self._head = self._Node(None, self.MAX_LEVEL)
+        self._level = 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Any]:
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    def _predecessors(self, key: Any) -> list["SkipList._Node"]:
+        """Last node before ``key`` on every level."""
+        update = [self._head] * self.MAX_LEVEL
+        node = self._head
+        for level in range(self._level - 1, -1, -1):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            update[level] = node
+        return update
+
+    def insert(self, key: Any) -> None:
+        """Add a key that is not already present."""
+        update = self._predecessors(key)
+        level = 1
+        while level < self.MAX_LEVEL and self.rng.random() < self.BRANCHING:
+            level += 1
+        self._level = max(self._level, level)
+        node = self._Node(key, level)
+        for i in range(level):
+            node.next[i] = update[i].next[i]
+            update[i].next[i] = node
+        self._size += 1
+
+    def remove(self, key: Any) -> bool:
+        """Remove a key, returning whether it was present."""
+        update = self._predecessors(key)
+        node = update[0].next[0]
+        if node is None or node.key != key:
+            return False
+        for i in range(len(node.next)):
+            update[i].next[i] = node.next[i]
+        while self._level > 1 and self._head.next[self._level - 1] is None:
+            self._level -= 1
+        self._size -= 1
+        return True
+
+
+class Ranking:
+    """Members ordered by sort key, best first, updatable in O(log n)."""
+
+    def __init__(self):
+        """Initialize an empty ranking."""
+        self._keys: dict[Hashable, tuple] = {}
+        self._sorted = SkipList()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, member: Hashable, sort_key: Any) -> None:
+        """Place ``member`` at ``sort_key``; smaller keys rank higher."""
+        key = (sort_key, member)
+        old = self._keys.get(member)
+        if old == key:
+            return
+        if old is not None:
+            self._sorted.remove(old)
+        self._sorted.insert(key)
+        self._keys[member] = key
+
+    def top(self, k: int) -> list[Hashable]:
+        """Best ``k`` members in order."""
+        members = []
+        for _, member in self._sorted:
+            if len(members) == k:
+                break
+            members.append(member)
+        return members
+
+
+class TimerStats:
+    """Reset count and running reset-interval statistics of one timer."""
+
+    __slots__ = ("name", "owner_id", "resets", "last_reset_at", "intervals", "mean", "m2")
+
+    def __init__(self, name: Optional[str], owner_id: Optional[str] = None):
+        """Initialize with no resets seen."""
+        self.name = name
+        self.owner_id = owner_id
+        self.resets = 0
+        self.last_reset_at: Optional[datetime] = None
+        self.intervals = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add_reset(self, at: datetime) -> None:
+        """Fold in a reset, updating interval mean and variance (Welford)."""
+        if self.last_reset_at is not None and at > self.last_reset_at:
+            interval = (at - self.last_reset_at).total_seconds()
+            self.intervals += 1
+            delta = interval - self.mean
+            self.mean += delta / self.intervals
+            self.m2 += delta * (interval - self.mean)
+        self.last_reset_at = at
+
+    def variation(self) -> float:
+        """Coefficient of variation of reset intervals; lower is steadier."""
+        if not self.intervals or self.mean <= 0:
+            return math.inf
+        return math.sqrt(self.m2 / self.intervals) / self.mean
+
+
+class Leaderboards:
+    """Live top-N boards of timers by reset count and by reset cadence.
+
+    ``resets`` ranks by ``Timer.reset_count``; ``consistency`` ranks by how
+    little the time between resets varies, once a timer has at least
+    ``min_intervals`` intervals. Resets applied by this worker update the
+    boards as they happen; a periodic pass rebuilds both from reset events
+    in the database to pick up other workers' resets and drop archived
+    timers. Resets recorded while that pass scans are replayed onto its
+    result before the swap, so none are lost to it. Each owner also has
+    boards of their own timers, so scoped reads stay O(k); the unscoped
+    boards rank every timer. Safe to update from repository pool threads.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        interval_seconds: float,
+        min_intervals: int = 3,
+        clock: Clock = system_clock,
+    ):
+        """Initialize empty boards."""
+        self.session_factory = session_factory
+        self.interval_seconds = interval_seconds
+        self.min_intervals = min_intervals
+        self.clock = clock
+        self.reconciled_at: Optional[datetime] = None
+        self._stats: dict[UUID, TimerStats] = {}
+        # Boards per owner; None holds the boards of all timers
+        self._boards: dict[Optional[str], dict[str, Ranking]] = {}
+        # Resets recorded since the running reconciliation began, if one is running
+        self._pending: Optional[list[tuple[UUID, Optional[str], Optional[str], int, datetime]]] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record_reset(self, timer: Timer, at: datetime) -> None:
+        """Account for a reset just committed for ``timer``."""
+        with self._lock:
+            stats = self._stats.get(timer.id)
+            if stats is None:
+                stats = self._stats[timer.id] = TimerStats(timer.name, timer.owner_id)
+            stats.resets = timer.reset_count or stats.resets + 1
+            stats.add_reset(at)
+            self._rank(self._boards, timer.id, stats)
+            if self._pending is not None:
+                self._pending.append((timer.id, timer.name, timer.owner_id, timer.reset_count, at))
+
+    def _rank(
+        self, boards: dict[Optional[str], dict[str, Ranking]], timer_id: UUID, stats: TimerStats
+    ) -> None:
+        for owner_id in {None, stats.owner_id}:
+            owner_boards = boards.get(owner_id)
+            if owner_boards is None:
+                owner_boards = boards[owner_id] = {board: Ranking() for board in BOARDS}
+            owner_boards["resets"].update(str(timer_id), -stats.resets)
+            if stats.intervals >= self.min_intervals:
+                owner_boards["consistency"].update(str(timer_id), stats.variation())
+
+    def top(self, board: str, limit: int, owner_id: Optional[str] = None) -> list[dict]:
+        """Best ``limit`` timers on a board, as response entries.
+
+        With an ``owner_id`` only that owner's timers are ranked.
+        """
+        if board not in BOARDS:
+            raise ValueError(f"Unknown leaderboard: {board}")
+        with self._lock:
+            owner_boards = self._boards.get(owner_id)
+            if owner_boards is None:
+                return []
+            entries = []
+            for rank, member in enumerate(owner_boards[board].top(limit), start=1):
+                stats = self._stats[UUID(member)]
+                entries.append(
+                    {
+                        "rank": rank,
+                        "timer_id": member,
+                        "name": stats.name,
+                        "resets": stats.resets,
+                        "mean_interval_seconds": stats.mean if stats.intervals else None,
+                        "variation": stats.variation() if stats.intervals else None,
+                    }
+                )
+            return entries
+
+    def _reconcile(self, db: Session) -> None:
+        """Rebuild stats and boards from reset events, streamed in timer order."""
+        with self._lock:
+            self._pending = []
+        try:
+            self._rebuild(db)
+        finally:
+            with self._lock:
+                self._pending = None
+        self.reconciled_at = self.clock.now()
+
+    def _rebuild(self, db: Session) -> None:
+        rows = db.execute(
+            select(TimerEvent.timer_id, TimerEvent.recorded_at, Timer.name, Timer.owner_id)
+            .join(Timer, Timer.id == TimerEvent.timer_id)
+            .where(TimerEvent.event_type == "reset")
+            .order_by(TimerEvent.timer_id, TimerEvent.recorded_at)
+            .execution_options(yield_per=5000)
+        )
+        stats: dict[UUID, TimerStats] = {}
+        for timer_id, recorded_at, name, owner_id in rows:
+            timer_stats = stats.get(timer_id)
+            if timer_stats is None:
+                timer_stats = stats[timer_id] = TimerStats(name, owner_id)
+            timer_stats.resets += 1
+            timer_stats.add_reset(recorded_at)
+        boards: dict[Optional[str], dict[str, Ranking]] = {}
+        for timer_id, timer_stats in stats.items():
+            self._rank(boards, timer_id, timer_stats)
+        with self._lock:
+            # Resets the scan already saw are no later than its last one.
+            for timer_id, name, owner_id, reset_count, at in self._pending:
+                timer_stats = stats.get(timer_id)
+                if timer_stats is None:
+                    timer_stats = stats[timer_id] = TimerStats(name, owner_id)
+                if timer_stats.last_reset_at is not None and at <= timer_stats.last_reset_at:
+                    continue
+                timer_stats.resets = reset_count or timer_stats.resets + 1
+                timer_stats.add_reset(at)
+                self._rank(boards, timer_id, timer_stats)
+            self._stats, self._boards = stats, boards
+
+    async def reconcile(self) -> None:
+        """Bring the boards in line with the database."""
+        async with self.session_factory() as session:
+            await session.run_sync(self._reconcile)
+
+    async def start(self) -> None:
+        """Build the boards and start periodic reconciliation."""
+        await self.reconcile()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop reconciling."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Reconcile on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.reconcile()
+            except Exception:
+                logger.exception("Leaderboard reconciliation failed")
+
+
+settings = get_settings()
+
+leaderboards = Leaderboards(
+    async_session_factory,
+    settings.leaderboard_reconcile_seconds,
+    settings.leaderboard_min_intervals,
+)
@@ -0,0 +1,275 @@
+"""Low-overhead counters and histograms rendered in Prometheus text format.
+
+Each metric keeps one shard of values per thread, created on first use and
+merged only when ``/metrics`` is scraped, so observations never take a lock.
+Values are per worker process; run one scrape target per worker.
+"""
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import event
+
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+Labels = tuple[str, ...]
+
+
+class Metric:
+    """Base for metrics with thread-local shards of labelled values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Labels = ()):
+        """Create a metric and register it for scraping."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._local = threading.local()
+        self._shards: list[dict] = []
+        REGISTRY.append(self)
+
+    def _shard(self) -> dict:
+        """Values owned by the calling thread."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            # list.append is atomic, so registering a shard needs no lock.
+            self._shards.append(values)
+            return values
+
+    def _format_labels(self, labels: Labels, extra: str = "") -> str:
+        pairs = [f'{name}="{value}"' for name, value in zip(self.labelnames, labels)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def samples(self) -> Iterable[str]:
+        """Exposition lines for the current values."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Exposition block with HELP and TYPE headers."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        """Add ``amount`` to the labelled count."""
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> dict[Labels, float]:
+        """Merged count per label set."""
+        merged: dict[Labels, float] = {}
+        for shard in list(self._shards):
+            for labels, value in dict(shard).items():
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self.values().items()):
+            yield f"{self.name}{self._format_labels(labels)} {value}"
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ):
+        """Create a histogram with upper bounds ``buckets``."""
+        super().__init__(name, documentation, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation."""
+        shard = self._shard()
+        row = shard.get(labels)
+        if row is None:
+            # One slot per bucket, one for +Inf, then the running sum.
+            row = shard[labels] = [0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def values(self) -> dict[Labels, list[float]]:
+        """Merged per-bucket counts and sum per label set."""
+        merged: dict[Labels, list[float]] = {}
+        for shard in list(self._shards):
+            for labels, row in dict(shard).items():
+                total = merged.setdefault(labels, [0] * len(row))
+                for i, value in enumerate(list(row)):
+                    total[i] += value
+        return merged
+
+    def samples(self) -> Iterable[str]:
+        for labels, row in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), row):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                bucket_labels = self._format_labels(labels, f'le="{le}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            yield f"{self.name}_sum{self._format_labels(labels)} {row[-1]}"
+            yield f"{self.name}_count{self._format_labels(labels)} {cumulative}"
+
+
+class Gauge(Metric):
+    """Point-in-time values computed by a callback when scraped."""
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Labels = (),
+        callback: Optional[Callable[[], dict[Labels, float]]] = None,
+    ):
+        """Create a gauge reading its values from ``callback``."""
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterable[str]:
+        if self.callback is None:
+            return
+        for labels, value in sorted(self.callback().items()):
+            yield f"{self.name}{self._format_labels(labels)} {value}"
+
+
+REGISTRY: list[Metric] = []
+
+
+def render_metrics() -> str:
+    """All registered metrics in Prometheus text exposition format."""
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+http_request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    ("method", "route", "status"),
+)
+db_repo_call_seconds = Histogram(
+    "db_repo_call_duration_seconds",
+    "Latency of repository method calls, including their queries.",
+    ("repo", "method"),
+)
+db_statements = Counter(
+    "db_statements_total",
+    "SQL statements executed, by the repository method that issued them.",
+    ("repo", "method"),
+)
+db_statement_seconds = Histogram(
+    "db_statement_duration_seconds",
+    "Time spent executing individual SQL statements.",
+)
+db_checkout_seconds = Histogram(
+    "db_session_checkout_duration_seconds",
+    "Wait for a pooled connection when a request session starts.",
+)
+cache_lookups = Counter(
+    "timer_cache_lookups_total",
+    "Timer cache lookups by result.",
+    ("result",),
+)
+active_timers = Gauge(
+    "timer_cache_timers",
+    "Cached non-expired timers by status.",
+    ("status",),
+)
+scheduler_pending = Gauge(
+    "program_deadlines_pending",
+    "Interval program phase deadlines waiting in the scheduler.",
+)
+
+
+current_repo_call: ContextVar[Labels] = ContextVar("current_repo_call", default=("none", "none"))
+
+
+@dataclass
+class QueryStats:
+    """SQL statements executed on behalf of one request."""
+    statements: int = 0
+    seconds: float = 0.0
+    by_statement: dict[str, int] = field(default_factory=dict)
+
+    def most_repeated(self) -> tuple[str, int]:
+        """The statement text executed most often, with its count."""
+        return max(self.by_statement.items(), key=lambda item: item[1], default=("", 0))
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def instrument_repo(cls):
+    """Class decorator timing each public repository method.
+
+    Statements executed during a call are attributed to the innermost
+    instrumented method through ``current_repo_call``.
+    """
+    for name, method in list(vars(cls).items()):
+        if name.startswith("_") or not callable(method):
+            continue
+        setattr(cls, name, _timed_method(cls.__name__, name, method))
+    return cls
+
+
+def _timed_method(repo: str, name: str, method: Callable) -> Callable:
+    labels = (repo, name)
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        token = current_repo_call.set(labels)
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            db_repo_call_seconds.observe(time.perf_counter() - started, labels)
+            current_repo_call.reset(token)
+
+    return wrapper
+
+
+def instrument_engine(engine) -> None:
+    """Count and time every statement executed through ``engine``.
+
+    Statements also accumulate into the request's ``current_query_stats``
+    when one is being tracked.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.metrics_started = time.perf_counter()
+        db_statements.inc(current_repo_call.get())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context.metrics_started
+        db_statement_seconds.observe(elapsed)
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+            stats.by_statement[statement] = stats.by_statement.get(statement, 0) + 1
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, scoped_session, sessionmaker
+
+from app.services.metrics import Gauge, Histogram, db_checkout_seconds, instrument_engine
+
+
+T = TypeVar("T")
+
+queue_wait_seconds = Histogram(
+    "repo_offload_queue_wait_seconds",
+    "Time offloaded repository calls wait for a pool thread.",
+)
+queue_depth = Gauge(
+    "repo_offload_queue_depth",
+    "Offloaded repository calls by state.",
+    ("state",),
+)
+
+
+def sync_database_url(url: str) -> str:
+    """Map an async driver URL onto its blocking counterpart."""
+    return (
+        url.replace("postgresql+asyncpg://", "postgresql+psycopg2://")
+        .replace("sqlite+aiosqlite://", "sqlite://")
+    )
+
+
+def sync_engine_options(url: str, max_workers: int, connect_timeout_seconds: Optional[float]) -> dict:
+    """Engine options for ``url``, capping connects and pool waits like the async engine.
+
+    psycopg2 hands ``connect_timeout`` to libpq, which only takes whole seconds.
+    """
+    options = {"pool_size": max_workers, "max_overflow": 0}
+    if url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    elif connect_timeout_seconds is not None:
+        options["pool_timeout"] = connect_timeout_seconds
+        options["connect_args"] = {"connect_timeout": max(1, math.ceil(connect_timeout_seconds))}
+    return options
+
+
+class RepoExecutor:
+    """Runs blocking repository work on a bounded thread pool.
+
+    A transitional mode until the repositories are async: each pool thread
+    keeps its own sync session on a shared engine sized to the pool, so a
+    slow round trip blocks one thread instead of the event loop.
+    """
+
+    def __init__(
+        self, database_url: str, max_workers: int, connect_timeout_seconds: Optional[float] = None
+    ):
+        """Create the pool, its engine and per-thread sessions."""
+        url = sync_database_url(database_url)
+        self.engine = create_engine(
+            url,
+            pool_pre_ping=True,
+            **sync_engine_options(url, max_workers, connect_timeout_seconds),
+        )
+        instrument_engine(self.engine)
+        self.sessions = scoped_session(sessionmaker(bind=self.engine, expire_on_commit=False))
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="repo")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+
+    def _work(self, call: Callable[[Session], T], submitted: float) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+        queue_wait_seconds.observe(time.perf_counter() - submitted)
+        session = self.sessions()
+        try:
+            started = time.perf_counter()
+            session.connection()
+            db_checkout_seconds.observe(time.perf_counter() - started)
+            return call(session)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+            with self._lock:
+                self.running -= 1
+
+    async def run(self, call: Callable[[Session], T]) -> T:
+        """Run ``call(session)`` on a pool thread and await its result.
+
+        The caller's context is copied so request-scoped metrics still see
+        the statements the call executes.
+        """
+        with self._lock:
+            self.queued += 1
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, context.run, self._work, call, time.perf_counter()
+        )
+
+    def depth(self) -> dict[tuple[str], int]:
+        """Calls waiting for a thread and calls in progress."""
+        return {("queued",): self.queued, ("running",): self.running}
+
+    def shutdown(self) -> None:
+        """Wait for in-flight calls, then close sessions and connections."""
+        self._executor.shutdown(wait=True)
+        self.engine.dispose()
+
+
+_repo_executor: Optional[RepoExecutor] = None
+
+
+def get_repo_executor() -> Optional[RepoExecutor]:
+    """The active executor, or None when repository calls run on the loop."""
+    return _repo_executor
+
+
+def configure_repo_executor(
+    database_url: str, max_workers: int, connect_timeout_seconds: Optional[float] = None
+) -> Optional[RepoExecutor]:
+    """Replace the active executor; ``max_workers`` of 0 disables offloading."""
+    global _repo_executor
+    if _repo_executor is not None:
+        _repo_executor.shutdown()
+    _repo_executor = (
+        RepoExecutor(database_url, max_workers, connect_timeout_seconds) if max_workers > 0 else None
+    )
+    queue_depth.callback = _repo_executor.depth if _repo_executor else None
+    return _repo_executor
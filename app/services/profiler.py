@@ -0,0 +1,120 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+from app.services.metrics import Histogram
+
+
+loop_lag_seconds = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled wake-up and the loop running it, while profiling.",
+)
+
+
+def frame_label(code) -> str:
+    """Flamegraph frame name: function plus its short file location."""
+    path = "/".join(code.co_filename.split(os.sep)[-2:])
+    return f"{code.co_name} ({path}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Statistical profiler sampling one thread's stack from a helper thread.
+
+    The profiled thread does no extra work per call; the cost is one stack
+    walk per sample on the helper thread, and the GIL hand-off it takes.
+    """
+
+    def __init__(self, thread_id: int, interval_seconds: float = 0.005):
+        """Prepare to sample ``thread_id`` every ``interval_seconds``."""
+        self.thread_id = thread_id
+        self.interval_seconds = interval_seconds
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sample(self) -> None:
+        """Record the target thread's current stack."""
+        frame = sys._current_frames().get(self.thread_id)
+        labels = []
+        while frame is not None:
+            labels.append(frame_label(frame.f_code))
+            frame = frame.f_back
+        if labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            self.sample()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling and wait for the helper thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed format, one ``frame;frame;frame count`` per line."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+async def measure_loop_lag(duration_seconds: float, interval_seconds: float = 0.01) -> list[float]:
+    """Sample how late the loop runs wake-ups scheduled ``interval_seconds`` ahead."""
+    lags = []
+    deadline = time.monotonic() + duration_seconds
+    while time.monotonic() < deadline:
+        expected = time.monotonic() + interval_seconds
+        await asyncio.sleep(interval_seconds)
+        lag = max(0.0, time.monotonic() - expected)
+        loop_lag_seconds.observe(lag)
+        lags.append(lag)
+    return lags
+
+
+@dataclass
+class ProfileResult:
+    """Collapsed stacks and loop lag from one profiling window."""
+    collapsed: str
+    samples: int
+    lag_p50_ms: float
+    lag_p99_ms: float
+    lag_max_ms: float
+
+
+_profile_lock = asyncio.Lock()
+
+
+def profile_running() -> bool:
+    """Whether a profiling window is in progress."""
+    return _profile_lock.locked()
+
+
+async def profile_event_loop(
+    duration_seconds: float, interval_seconds: float = 0.005
+) -> ProfileResult:
+    """Profile the calling event loop's thread for ``duration_seconds``."""
+    async with _profile_lock:
+        profiler = SamplingProfiler(threading.get_ident(), interval_seconds)
+        profiler.start()
+        try:
+            lags = await measure_loop_lag(duration_seconds)
+        finally:
+            profiler.stop()
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return ProfileResult(
+        collapsed=profiler.collapsed(),
+        samples=sum(profiler.stacks.values()),
+        lag_p50_ms=round(lags_ms[len(lags_ms) // 2], 3),
+        lag_p99_ms=round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 3),
+        lag_max_ms=round(lags_ms[-1], 3),
+    )
@@ -0,0 +1,104 @@
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database import async_session_factory
+from app.models.program import IntervalProgram
+from app.repos.event_store_repo import retry_on_conflict
+from app.repos.program_repo import ProgramRepo
+from app.schemas.program import ProgramStatus
+from app.services.clock import Clock, system_clock
+from app.services.metrics import scheduler_pending
+from app.services.program_service import ProgramService
+from app.services.scheduler import DeadlineScheduler
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProgramEngine:
+    """Advances running interval programs at their phase deadlines.
+
+    A program holds one scheduler entry regardless of how many station
+    timers it drives; each boundary updates the whole group at once. A
+    boundary that fails to apply is retried with exponential backoff, up
+    to ``max_retry_seconds`` apart, until it succeeds.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        scheduler: Optional[DeadlineScheduler] = None,
+        clock: Clock = system_clock,
+        retry_seconds: float = 1.0,
+        max_retry_seconds: float = 30.0,
+    ):
+        """Initialize engine with a session factory."""
+        self.session_factory = session_factory
+        self.clock = clock
+        self.scheduler = scheduler or DeadlineScheduler(clock)
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self._failures: dict[UUID, int] = {}
+
+    async def start(self) -> None:
+        """Re-arm deadlines of programs that were running and start dispatching."""
+        async with self.session_factory() as session:
+            deadlines = await session.run_sync(
+                lambda db: [
+                    (program.id, program.phase_deadline)
+                    for program in ProgramRepo(db).list_running_programs()
+                    if program.phase_deadline
+                ]
+            )
+        for program_id, deadline in deadlines:
+            self.scheduler.schedule(program_id, deadline, self._on_deadline)
+        await self.scheduler.start()
+
+    async def stop(self) -> None:
+        """Stop dispatching deadlines."""
+        await self.scheduler.stop()
+
+    def track(self, program: IntervalProgram) -> None:
+        """Schedule the next boundary of a program, or forget a stopped one."""
+        if program.status == ProgramStatus.running and program.phase_deadline:
+            self.scheduler.schedule(program.id, program.phase_deadline, self._on_deadline)
+        else:
+            self.scheduler.cancel(program.id)
+            self._failures.pop(program.id, None)
+
+    async def _on_deadline(self, program_id: UUID, deadline: datetime) -> None:
+        """Advance a program whose phase deadline has passed."""
+        # The deadline is due on the monotonic clock; never let a lagging
+        # wall clock leave it unprocessed.
+        now = max(self.clock.now(), deadline)
+        try:
+            async with self.session_factory() as session:
+                program = await session.run_sync(
+                    lambda db: retry_on_conflict(
+                        db, lambda: ProgramService(ProgramRepo(db)).advance_program(program_id, now)
+                    )
+                )
+        except Exception:
+            self._retry(program_id)
+            return
+        self._failures.pop(program_id, None)
+        if program:
+            self.track(program)
+
+    def _retry(self, program_id: UUID) -> None:
+        """Re-arm a program whose boundary failed to apply, backing off per failure."""
+        failures = self._failures.get(program_id, 0) + 1
+        self._failures[program_id] = failures
+        delay = min(self.max_retry_seconds, self.retry_seconds * 2 ** (failures - 1))
+        logger.exception("Advancing program %s failed; retrying in %.0fs", program_id, delay)
+        self.scheduler.schedule(
+            program_id, self.clock.now() + timedelta(seconds=delay), self._on_deadline
+        )
+
+
+program_engine = ProgramEngine(async_session_factory)
+scheduler_pending.callback = lambda: {(): len(program_engine.scheduler)}
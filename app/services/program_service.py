@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from uuid import UUID
+
+from app.models.program import IntervalProgram
+from app.repos.program_repo import ProgramRepo
+from app.schemas.program import ProgramStatus
+from app.schemas.timer import UrgencyLevel, TimerStatus
+
+
+def next_position(
+    phase_index: int, current_round: int, phase_count: int, repeat_count: int
+) -> Optional[tuple[int, int]]:
+    """Return the (phase index, round) after the current one, or None when finished."""
+    if phase_index + 1 < phase_count:
+        return phase_index + 1, current_round
+    if current_round < repeat_count:
+        return 0, current_round + 1
+    return None
+
+
+class TimersNotFound(LookupError):
+    """A program names timers that do not exist or belong to someone else."""
+
+
+class ProgramService:
+    """Interval program state machine driven by absolute phase deadlines."""
+
+    def __init__(self, repo: ProgramRepo):
+        """Initialize service with repository."""
+        self.repo = repo
+
+    def create_program(
+        self,
+        name: str,
+        phases: list[dict],
+        repeat_count: int = 1,
+        timer_ids: Optional[list[UUID]] = None,
+    ) -> IntervalProgram:
+        """Create a new program for a group of timers.
+
+        Raises TimersNotFound unless the repository can see every timer.
+        """
+        timer_ids = list(dict.fromkeys(timer_ids or []))
+        found = {timer.id for timer in self.repo.get_timers(timer_ids)}
+        missing = [timer_id for timer_id in timer_ids if timer_id not in found]
+        if missing:
+            raise TimersNotFound(f"Timer not found: {', '.join(str(i) for i in missing)}")
+        return self.repo.create_program(name, repeat_count, phases, timer_ids)
+
+    def get_program(self, program_id: UUID) -> Optional[IntervalProgram]:
+        """Fetch program by ID."""
+        return self.repo.get_program(program_id)
+
+    def start_program(self, program_id: UUID, now: datetime) -> Optional[IntervalProgram]:
+        """Start the first phase of the first round."""
+        program = self.repo.get_program(program_id)
+        if not program:
+            return None
+
+        program.status = ProgramStatus.running
+        self._enter_phase(program, 0, 1, now)
+        return self.repo.save_program(program)
+
+    def stop_program(self, program_id: UUID, now: datetime) -> Optional[IntervalProgram]:
+        """Stop the program and pause its timers where they are."""
+        program = self.repo.get_program(program_id)
+        if not program:
+            return None
+
+        program.status = ProgramStatus.stopped
+        program.phase_deadline = None
+        self.repo.update_group_timers(
+            program.id,
+            "paused",
+            UrgencyLevel.calm,
+            now,
+            status=TimerStatus.paused,
+            paused_at=now,
+        )
+        return self.repo.save_program(program)
+
+    def advance_program(self, program_id: UUID, now: datetime) -> Optional[IntervalProgram]:
+        """Advance past every phase deadline that has elapsed by ``now``.
+
+        Each boundary starts exactly at the previous deadline rather than at
+        ``now``, so a late wake-up never stretches the workout.
+        """
+        program = self.repo.get_program(program_id)
+        if not program or program.status != ProgramStatus.running:
+            return program
+
+        while program.phase_deadline and program.phase_deadline <= now:
+            deadline = program.phase_deadline
+            position = next_position(
+                program.current_phase_index,
+                program.current_round,
+                len(program.phases),
+                program.repeat_count,
+            )
+            if position is None:
+                self._finish(program, deadline)
+                break
+            self._enter_phase(program, position[0], position[1], deadline)
+
+        return self.repo.save_program(program)
+
+    def _enter_phase(
+        self, program: IntervalProgram, phase_index: int, current_round: int, started_at: datetime
+    ) -> None:
+        """Move the program and its timers into a phase."""
+        phase = program.phases[phase_index]
+        program.current_phase_index = phase_index
+        program.current_round = current_round
+        program.phase_started_at = started_at
+        program.phase_deadline = started_at + timedelta(seconds=phase.duration_seconds)
+
+        # A fresh phase restarts urgency from calm against the phase duration.
+        self.repo.update_group_timers(
+            program.id,
+            "phase",
+            UrgencyLevel.calm,
+            started_at,
+            duration_seconds=phase.duration_seconds,
+            remaining_seconds=phase.duration_seconds,
+            status=TimerStatus.running,
+            started_at=started_at,
+            paused_at=None,
+        )
+
+    def _finish(self, program: IntervalProgram, finished_at: datetime) -> None:
+        """Mark the program finished and expire its timers."""
+        program.status = ProgramStatus.finished
+        program.phase_deadline = None
+        self.repo.update_group_timers(
+            program.id,
+            "expired",
+            UrgencyLevel.alarm,
+            finished_at,
+            remaining_seconds=0,
+            status=TimerStatus.expired,
+        )
@@ -0,0 +1,88 @@
+import math
+from collections import OrderedDict
+from typing import Hashable
+
+from app.config import get_settings
+from app.services.clock import Clock, system_clock
+
+
+class TokenBucketLimiter:
+    """Per-key token buckets refilled lazily on access.
+
+    Each active key costs one small list; keys untouched for
+    ``idle_seconds`` are evicted from the front of an LRU ordering as other
+    keys are checked, so memory follows the number of active clients.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        idle_seconds: float = 300.0,
+        clock: Clock = system_clock,
+    ):
+        """Allow ``rate`` requests per second per key with bursts of ``burst``."""
+        self.rate = rate
+        self.burst = burst
+        self.idle_seconds = idle_seconds
+        self.clock = clock
+        self.enabled = True
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def acquire(self, key: Hashable) -> float:
+        """Take a token for ``key``; return 0 when allowed, else seconds until one frees up."""
+        if not self.enabled:
+            return 0.0
+        now = self.clock.monotonic()
+        self._evict_idle(now)
+
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = [float(self.burst), now]
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.rate
+
+    def _evict_idle(self, now: float) -> None:
+        """Drop least recently used keys that have been idle too long."""
+        while self._buckets:
+            key, bucket = next(iter(self._buckets.items()))
+            if now - bucket[1] < self.idle_seconds:
+                return
+            del self._buckets[key]
+
+
+def retry_after_header(wait_seconds: float) -> str:
+    """Whole seconds for a Retry-After header, never zero."""
+    return str(max(1, math.ceil(wait_seconds)))
+
+
+settings = get_settings()
+
+read_limiter = TokenBucketLimiter(
+    settings.rate_limit_read_per_second,
+    settings.rate_limit_read_burst,
+    settings.rate_limit_idle_seconds,
+)
+command_limiter = TokenBucketLimiter(
+    settings.rate_limit_command_per_second,
+    settings.rate_limit_command_burst,
+    settings.rate_limit_idle_seconds,
+)
+
+
+def set_rate_limiting(enabled: bool) -> None:
+    """Switch the application limiters on or off, e.g. for load tests."""
+    read_limiter.enabled = command_limiter.enabled = enabled
+
+
+set_rate_limiting(settings.rate_limit_enabled)
@@ -0,0 +1,154 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Callable, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.repos.archive_repo import ArchiveRepo
+from app.repos.webhook_repo import WebhookRepo
+from app.services.clock import Clock, system_clock
+from app.services.metrics import Counter
+from app.services.timer_cache import timer_cache
+
+
+logger = logging.getLogger(__name__)
+
+archived_rows = Counter(
+    "archived_rows_total",
+    "Rows moved from the hot tables to the archive, by table.",
+    ("table",),
+)
+pruned_deliveries = Counter(
+    "webhook_deliveries_pruned_total",
+    "Retired webhook outbox rows deleted by the reaper.",
+)
+
+
+class TimerReaper:
+    """Moves timers untouched for the retention period into the archive tables.
+
+    Each run archives at most ``max_batches`` batches of ``batch_size``
+    timers, each in its own short transaction with a pause in between, so
+    a large backlog drains over several runs without holding locks or
+    starving request traffic of connections. Hot tables stay the size of
+    the working set. Webhook deliveries that gave up retrying are deleted
+    in the same batches once ``retired_delivery_retention`` has passed,
+    also when ``archive`` is off.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        retention: timedelta,
+        batch_size: int,
+        max_batches: int,
+        pause_seconds: float,
+        interval_seconds: float,
+        on_archived: Optional[Callable[[Iterable[UUID]], None]] = None,
+        clock: Clock = system_clock,
+        retired_delivery_retention: timedelta = timedelta(days=3),
+        archive: bool = True,
+    ):
+        """Initialize an idle reaper."""
+        self.session_factory = session_factory
+        self.retention = retention
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.pause_seconds = pause_seconds
+        self.interval_seconds = interval_seconds
+        self.on_archived = on_archived
+        self.clock = clock
+        self.retired_delivery_retention = retired_delivery_retention
+        self.archive = archive
+        self._task: Optional[asyncio.Task] = None
+
+    def _archive_batch(self, db: Session) -> tuple[list[UUID], int]:
+        """Archive one batch of cold timers."""
+        now = self.clock.now()
+        return ArchiveRepo(db).archive_untouched(now - self.retention, self.batch_size, now)
+
+    def _prune_batch(self, db: Session) -> int:
+        """Delete one batch of retired webhook deliveries."""
+        cutoff = self.clock.now() - self.retired_delivery_retention
+        return WebhookRepo(db).prune_retired(cutoff, self.batch_size)
+
+    async def prune_deliveries(self) -> int:
+        """Delete retired webhook deliveries batch by batch, returning how many went."""
+        pruned = 0
+        for batch in range(self.max_batches):
+            if batch:
+                await asyncio.sleep(self.pause_seconds)
+            async with self.session_factory() as session:
+                deleted = await session.run_sync(self._prune_batch)
+            pruned_deliveries.inc((), deleted)
+            pruned += deleted
+            if deleted < self.batch_size:
+                break
+        return pruned
+
+    async def run_once(self) -> int:
+        """Archive cold timers batch by batch, returning how many were moved."""
+        archived = 0
+        for batch in range(self.max_batches):
+            if batch:
+                await asyncio.sleep(self.pause_seconds)
+            async with self.session_factory() as session:
+                timer_ids, events = await session.run_sync(self._archive_batch)
+            archived_rows.inc(("timer",), len(timer_ids))
+            archived_rows.inc(("timer_event",), events)
+            if self.on_archived is not None and timer_ids:
+                self.on_archived(timer_ids)
+            archived += len(timer_ids)
+            if len(timer_ids) < self.batch_size:
+                break
+        if archived:
+            logger.info("Archived %d timers untouched for %s", archived, self.retention)
+        return archived
+
+    async def start(self) -> None:
+        """Archive on a fixed interval in the background."""
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop archiving; a batch in flight is rolled back."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Archive and prune on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            if self.archive:
+                try:
+                    await self.run_once()
+                except Exception:
+                    logger.exception("Timer archival failed")
+            try:
+                await self.prune_deliveries()
+            except Exception:
+                logger.exception("Webhook outbox pruning failed")
+
+
+settings = get_settings()
+
+timer_reaper = TimerReaper(
+    async_session_factory,
+    timedelta(hours=settings.archive_after_hours),
+    settings.archive_batch_size,
+    settings.archive_max_batches,
+    settings.archive_batch_pause_seconds,
+    settings.archive_interval_seconds,
+    on_archived=timer_cache.discard,
+    retired_delivery_retention=timedelta(hours=settings.webhook_retired_retention_hours),
+    archive=settings.archive_enabled,
+)
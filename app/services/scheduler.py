@@ -0,0 +1,139 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable, Optional
+
+from app.services.clock import Clock, system_clock
+
+logger = logging.getLogger(__name__)
+
+DeadlineCallback = Callable[[Hashable, datetime], Awaitable[None]]
+
+
+class DeadlineScheduler:
+    """Single background task that fires callbacks at absolute deadlines.
+
+    Each key has at most one pending deadline: rescheduling replaces the
+    previous entry, and superseded heap entries are skipped when popped.
+    Entries cancelled or rescheduled by a callback earlier in the same due
+    batch are skipped as well.
+    Deadlines are wall-clock times, but the dispatch loop sleeps on the
+    monotonic clock so wall-clock jumps do not fire entries early or late.
+    """
+
+    def __init__(self, clock: Clock = system_clock):
+        """Initialize an empty scheduler."""
+        self._clock = clock
+        self._heap: list[tuple[float, int, Hashable]] = []
+        self._pending: dict[Hashable, tuple[float, datetime, DeadlineCallback]] = {}
+        # Keys popped by pop_due whose callbacks have not been claimed yet
+        self._popped: set[Hashable] = set()
+        self._counter = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def schedule(self, key: Hashable, deadline: datetime, callback: DeadlineCallback) -> None:
+        """Fire ``callback(key, deadline)`` once ``deadline`` is reached."""
+        due = self._clock.monotonic_deadline(deadline)
+        self._pending[key] = (due, deadline, callback)
+        self._popped.discard(key)
+        heapq.heappush(self._heap, (due, next(self._counter), key))
+        if self._heap[0][2] == key:
+            self._wakeup.set()
+
+    def cancel(self, key: Hashable) -> None:
+        """Drop the pending deadline for ``key``, if any."""
+        self._pending.pop(key, None)
+        self._popped.discard(key)
+
+    def _next_due(self) -> Optional[float]:
+        """Earliest pending monotonic due time, discarding superseded entries."""
+        while self._heap:
+            due, _, key = self._heap[0]
+            pending = self._pending.get(key)
+            if pending and pending[0] == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def next_deadline(self) -> Optional[datetime]:
+        """Earliest pending wall-clock deadline."""
+        if self._next_due() is None:
+            return None
+        return self._pending[self._heap[0][2]][1]
+
+    def lag_seconds(self) -> float:
+        """How far the earliest pending deadline is overdue, or 0."""
+        due = self._next_due()
+        if due is None:
+            return 0.0
+        return max(0.0, self._clock.monotonic() - due)
+
+    @property
+    def alive(self) -> bool:
+        """Whether the dispatch task is running."""
+        return self._task is not None and not self._task.done()
+
+    def pop_due(self) -> list[tuple[Hashable, datetime, DeadlineCallback]]:
+        """Remove and return every entry that is due on the monotonic clock.
+
+        Callers dispatch each entry only if ``claim`` still accepts its key.
+        """
+        now = self._clock.monotonic()
+        due = []
+        while True:
+            next_due = self._next_due()
+            if next_due is None or next_due > now:
+                return due
+            _, _, key = heapq.heappop(self._heap)
+            _, deadline, callback = self._pending.pop(key)
+            self._popped.add(key)
+            due.append((key, deadline, callback))
+
+    def claim(self, key: Hashable) -> bool:
+        """Whether a popped entry should still fire, i.e. was not cancelled or rescheduled since."""
+        if key not in self._popped:
+            return False
+        self._popped.discard(key)
+        return True
+
+    async def start(self) -> None:
+        """Start the background dispatch task."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background dispatch task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        """Sleep until the earliest deadline (or a new earlier one) and dispatch."""
+        while True:
+            self._wakeup.clear()
+            due = self._next_due()
+            timeout = None
+            if due is not None:
+                timeout = max(0.0, due - self._clock.monotonic())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            for key, due_at, callback in self.pop_due():
+                if not self.claim(key):
+                    continue
+                try:
+                    await callback(key, due_at)
+                except Exception:
+                    logger.exception("Deadline callback failed for %s", key)
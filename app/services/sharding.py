@@ -0,0 +1,407 @@
+import asyncio
+import hashlib
+import logging
+import os
+import struct
+from bisect import bisect
+from typing import Awaitable, Callable, Hashable, Iterable, Optional
+from uuid import UUID
+
+import msgpack
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.repos import get_timer_repo
+from app.repos.event_store_repo import retry_on_conflict
+from app.services.degraded import DATABASE_ERRORS, DatabaseUnavailable, db_breaker
+from app.services.leaderboard import leaderboards
+from app.services.metrics import Counter
+from app.services.offload import get_repo_executor
+from app.services.timer_service import TimerService
+
+
+logger = logging.getLogger(__name__)
+
+FRAME = struct.Struct(">I")
+SOCKET_SUFFIX = ".sock"
+
+sharded_commands = Counter(
+    "shard_commands_total",
+    "Batch commands by where they were applied.",
+    ("route",),
+)
+
+BatchHandler = Callable[[list[dict], Optional[str]], Awaitable[list[dict]]]
+
+
+def ring_hash(value: str) -> int:
+    """Stable 64-bit position on the ring, identical in every process."""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding or removing a node only moves the keys on the arcs it gains or
+    loses, about ``1/n`` of them, so a worker joining or leaving does not
+    reshuffle ownership of every timer.
+    """
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = 64):
+        """Build a ring over ``nodes`` with ``replicas`` points per node."""
+        self.replicas = replicas
+        self.nodes: set[str] = set(nodes)
+        self._points: list[int] = []
+        self._owners: list[str] = []
+        self._rebuild()
+
+    def _rebuild(self) -> None:
+        points = sorted(
+            (ring_hash(f"{node}#{replica}"), node)
+            for node in self.nodes
+            for replica in range(self.replicas)
+        )
+        self._points = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def add(self, node: str) -> None:
+        """Add a node to the ring."""
+        if node not in self.nodes:
+            self.nodes.add(node)
+            self._rebuild()
+
+    def remove(self, node: str) -> None:
+        """Remove a node from the ring."""
+        if node in self.nodes:
+            self.nodes.discard(node)
+            self._rebuild()
+
+    def owner(self, key: Hashable) -> Optional[str]:
+        """Node owning ``key``: the first point clockwise from its hash."""
+        if not self._points:
+            return None
+        index = bisect(self._points, ring_hash(str(key))) % len(self._points)
+        return self._owners[index]
+
+
+async def send_frame(writer: asyncio.StreamWriter, message) -> None:
+    """Write one length-prefixed MessagePack frame."""
+    body = msgpack.packb(message)
+    writer.write(FRAME.pack(len(body)) + body)
+    await writer.drain()
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """Read one length-prefixed MessagePack frame."""
+    (size,) = FRAME.unpack(await reader.readexactly(FRAME.size))
+    return msgpack.unpackb(await reader.readexactly(size))
+
+
+def encode_commands(commands: list[dict]) -> list[dict]:
+    """Batch commands with ids as strings for the wire."""
+    return [{**command, "id": str(command["id"])} for command in commands]
+
+
+def decode_commands(commands: list[dict]) -> list[dict]:
+    """Batch commands received over the wire."""
+    return [{**command, "id": UUID(command["id"])} for command in commands]
+
+
+class PeerUnreachable(ConnectionError):
+    """A request could not be sent to a peer, so no part of it was applied there."""
+
+
+class PeerReplyLost(Exception):
+    """A request reached a peer but no reply came back; it may have been applied."""
+
+
+class PeerError(RuntimeError):
+    """A peer received a request and answered with an error."""
+
+
+class PeerConnection:
+    """One connection to a peer worker, used for a request at a time."""
+
+    def __init__(self, path: str):
+        """Prepare a lazy connection to the peer's socket."""
+        self.path = path
+        self._lock = asyncio.Lock()
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, message):
+        """Send a request and wait for its reply.
+
+        Raises PeerUnreachable when connecting or sending fails, and
+        PeerReplyLost when the connection fails once the request is sent.
+        """
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    self._reader, self._writer = await asyncio.open_unix_connection(self.path)
+                await send_frame(self._writer, message)
+            except OSError as e:
+                self.close()
+                raise PeerUnreachable(str(e)) from e
+            try:
+                return await read_frame(self._reader)
+            except Exception as e:
+                self.close()
+                raise PeerReplyLost(f"{type(e).__name__}: {e}") from e
+            except BaseException:
+                self.close()
+                raise
+
+    def close(self) -> None:
+        """Drop the connection; the next request reconnects."""
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class ShardNode:
+    """This worker's place in a ring of workers sharing one socket directory.
+
+    Each worker listens on ``<socket_dir>/<name>.sock``. Membership is the
+    set of sockets in the directory, rescanned every ``refresh_seconds``, so
+    workers join by starting and leave by stopping, or by failing to accept
+    connections. Batch commands are grouped by the owner of their timer id;
+    the local share is applied here and the rest is forwarded to owners, so
+    each timer's rows are written by one process at a time. While ownership
+    moves after a membership change, two workers may briefly both write a
+    timer; the database transaction still keeps that correct.
+    """
+
+    def __init__(
+        self,
+        socket_dir: str,
+        apply_local: BatchHandler,
+        name: Optional[str] = None,
+        refresh_seconds: float = 2.0,
+    ):
+        """Configure the node; nothing listens until ``start``."""
+        self.socket_dir = socket_dir
+        self.apply_local = apply_local
+        self.name = name or f"worker-{os.getpid()}"
+        self.refresh_seconds = refresh_seconds
+        self.ring = HashRing()
+        self._peers: dict[str, PeerConnection] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def path(self) -> str:
+        """Socket this worker listens on."""
+        return os.path.join(self.socket_dir, self.name + SOCKET_SUFFIX)
+
+    @property
+    def running(self) -> bool:
+        """Whether the node accepts and forwards commands."""
+        return self._server is not None
+
+    def refresh(self) -> None:
+        """Rebuild ring membership from the sockets in the directory."""
+        names = {
+            entry[: -len(SOCKET_SUFFIX)]
+            for entry in os.listdir(self.socket_dir)
+            if entry.endswith(SOCKET_SUFFIX)
+        }
+        names.add(self.name)
+        if names == self.ring.nodes:
+            return
+        for name in self.ring.nodes - names:
+            self.forget(name)
+        for name in names - self.ring.nodes:
+            self.ring.add(name)
+        logger.info("Shard ring now has %d workers", len(self.ring.nodes))
+
+    def forget(self, name: str) -> None:
+        """Drop a peer from the ring and close its connection."""
+        self.ring.remove(name)
+        peer = self._peers.pop(name, None)
+        if peer is not None:
+            peer.close()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Apply forwarded batches; the sender already chose this worker as owner."""
+        try:
+            while True:
+                try:
+                    message = await read_frame(reader)
+                except asyncio.IncompleteReadError:
+                    return
+                try:
+                    results = await self.apply_local(
+                        decode_commands(message["commands"]), message.get("owner_id")
+                    )
+                    reply = {"results": results}
+                except Exception as e:
+                    logger.exception("Forwarded batch failed")
+                    reply = {"error": f"{type(e).__name__}: {e}"}
+                await send_frame(writer, reply)
+        finally:
+            writer.close()
+
+    async def _forward(self, owner: str, commands: list[dict], owner_id: Optional[str]) -> list[dict]:
+        """Send commands to their owner and return its results."""
+        peer = self._peers.get(owner)
+        if peer is None:
+            peer = self._peers[owner] = PeerConnection(
+                os.path.join(self.socket_dir, owner + SOCKET_SUFFIX)
+            )
+        reply = await peer.request({"commands": encode_commands(commands), "owner_id": owner_id})
+        if "error" in reply:
+            raise PeerError(reply["error"])
+        return reply["results"]
+
+    async def _apply_group(
+        self, owner: str, commands: list[dict], owner_id: Optional[str]
+    ) -> list[dict]:
+        if owner == self.name:
+            sharded_commands.inc(("local",), len(commands))
+            return await self.apply_local(commands, owner_id)
+        sharded_commands.inc(("forwarded",), len(commands))
+        return await self._forward(owner, commands, owner_id)
+
+    async def apply_batch(self, commands: list[dict], owner_id: Optional[str] = None) -> list[dict]:
+        """Apply commands on their owners, returning results in command order.
+
+        ``owner_id`` scopes the batch to one user's timers on every worker.
+
+        When an owner cannot be reached it is dropped from the ring and its
+        commands are routed once more to their new owners. Commands are
+        never resent once they reached an owner, since resets and ticks are
+        not idempotent: if the owner fails or its reply is lost, their
+        results carry the error instead. Failures applying the local share
+        are raised.
+        """
+        results: list[Optional[dict]] = [None] * len(commands)
+        pending = list(range(len(commands)))
+        for attempt in range(2):
+            groups: dict[str, list[int]] = {}
+            for index in pending:
+                groups.setdefault(self.ring.owner(commands[index]["id"]), []).append(index)
+            owners = list(groups)
+            outcomes = await asyncio.gather(
+                *(
+                    self._apply_group(owner, [commands[i] for i in groups[owner]], owner_id)
+                    for owner in owners
+                ),
+                return_exceptions=True,
+            )
+            pending = []
+            for owner, outcome in zip(owners, outcomes):
+                if isinstance(outcome, PeerUnreachable):
+                    logger.warning("Shard owner %s unavailable: %s", owner, outcome)
+                    if isinstance(outcome.__cause__, ConnectionRefusedError):
+                        # Nothing listens there any more; the worker is gone.
+                        try:
+                            os.unlink(os.path.join(self.socket_dir, owner + SOCKET_SUFFIX))
+                        except FileNotFoundError:
+                            pass
+                    self.forget(owner)
+                    pending.extend(groups[owner])
+                    continue
+                if isinstance(outcome, BaseException):
+                    if owner == self.name:
+                        raise outcome
+                    logger.warning("Shard owner %s failed a forwarded batch: %s", owner, outcome)
+                    if isinstance(outcome, PeerReplyLost):
+                        error = "Timer owner did not reply; the command may have been applied"
+                    else:
+                        error = f"Timer owner failed: {outcome}"
+                    for index in groups[owner]:
+                        results[index] = self._failed(commands[index], error)
+                    continue
+                for index, result in zip(groups[owner], outcome):
+                    results[index] = result
+            if not pending:
+                break
+
+        for index in pending:
+            results[index] = self._failed(commands[index], "Timer owner unavailable")
+        return results
+
+    @staticmethod
+    def _failed(command: dict, error: str) -> dict:
+        """Result of a command that was not applied, or not confirmed."""
+        return {"id": str(command["id"]), "op": command["op"], "ok": False, "error": error}
+
+    async def start(self) -> None:
+        """Listen on this worker's socket and join the ring."""
+        os.makedirs(self.socket_dir, exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Leave the ring and stop listening."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        for name in list(self._peers):
+            self._peers.pop(name).close()
+
+    async def _run(self) -> None:
+        """Rescan membership on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.refresh_seconds)
+            try:
+                self.refresh()
+            except OSError:
+                logger.exception("Shard membership scan failed")
+
+
+async def apply_batch_locally(commands: list[dict], owner_id: Optional[str] = None) -> list[dict]:
+    """Apply a batch on this worker with a session of its own.
+
+    Goes through this worker's database breaker: raises DatabaseUnavailable
+    while it is open and when the database cannot be reached. Sharded
+    batches are not journaled; the journal is per worker and replays
+    outside the ring, so it would give up the single writer per timer
+    that sharding exists for, and its entries would not follow ownership
+    when workers join or leave.
+    """
+    if not db_breaker.allow():
+        raise DatabaseUnavailable("Database circuit is open")
+    executor = get_repo_executor()
+    apply = lambda db: retry_on_conflict(
+        db,
+        lambda: TimerService(get_timer_repo(db, owner_id), boards=leaderboards).apply_batch(
+            commands
+        ),
+    )
+    try:
+        if executor is not None:
+            results = await executor.run(apply)
+        else:
+            async with async_session_factory() as session:
+                results = await session.run_sync(apply)
+    except DATABASE_ERRORS as e:
+        db_breaker.record_failure()
+        raise DatabaseUnavailable(str(e)) from e
+    db_breaker.record_success()
+    return results
+
+
+settings = get_settings()
+
+shard_node: Optional[ShardNode] = (
+    ShardNode(settings.shard_socket_dir, apply_batch_locally, refresh_seconds=settings.shard_refresh_seconds)
+    if settings.shard_socket_dir
+    else None
+)
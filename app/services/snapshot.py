@@ -0,0 +1,122 @@
+import mmap
+import os
+import struct
+import tempfile
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from uuid import UUID
+
+from app.services.auth import NO_OWNER
+
+
+MAGIC = b"TSNP"
+FORMAT_VERSION = 2
+EPOCH = datetime(1970, 1, 1)
+
+# magic, format version, record count, watermark (epoch micros)
+HEADER = struct.Struct("<4sHIq")
+# id, status code, remaining, duration, started_at, deadline, version (epoch micros, -1 = none),
+# owner key
+RECORD = struct.Struct("<16sBiiqqq16s")
+
+STATUS_CODES = {"stopped": 0, "running": 1, "paused": 2, "expired": 3}
+STATUS_NAMES = {code: name for name, code in STATUS_CODES.items()}
+
+
+class CachedTimer(NamedTuple):
+    """Compact timer state held in memory and persisted in snapshots."""
+    id: UUID
+    status: str
+    remaining_seconds: int
+    duration_seconds: int
+    started_at: Optional[datetime]
+    deadline: Optional[datetime]
+    version: datetime
+    owner_key: bytes = NO_OWNER
+
+
+def _to_micros(value: Optional[datetime]) -> int:
+    if value is None:
+        return -1
+    return (value - EPOCH) // timedelta(microseconds=1)
+
+
+def _from_micros(value: int) -> Optional[datetime]:
+    if value < 0:
+        return None
+    return EPOCH + timedelta(microseconds=value)
+
+
+def write_snapshot(path: str, watermark: datetime, timers: list[CachedTimer]) -> None:
+    """Write timers to ``path`` atomically as fixed-size binary records."""
+    buffer = bytearray(HEADER.size + RECORD.size * len(timers))
+    HEADER.pack_into(buffer, 0, MAGIC, FORMAT_VERSION, len(timers), _to_micros(watermark))
+    offset = HEADER.size
+    for timer in timers:
+        RECORD.pack_into(
+            buffer,
+            offset,
+            timer.id.bytes,
+            STATUS_CODES[timer.status],
+            timer.remaining_seconds,
+            timer.duration_seconds,
+            _to_micros(timer.started_at),
+            _to_micros(timer.deadline),
+            _to_micros(timer.version),
+            timer.owner_key,
+        )
+        offset += RECORD.size
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Each writer gets its own temp file, so concurrent workers never
+    # interleave bytes before their replace.
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buffer)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def read_snapshot(path: str) -> Optional[tuple[datetime, list[CachedTimer]]]:
+    """Read a snapshot through a memory map, or None if missing or invalid."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        size = os.fstat(f.fileno()).st_size
+        if size < HEADER.size:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            magic, version, count, watermark = HEADER.unpack_from(view, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            if size != HEADER.size + RECORD.size * count:
+                return None
+
+            with memoryview(view) as buffer, buffer[HEADER.size:] as records:
+                timers = [
+                    CachedTimer(
+                        UUID(bytes=timer_id),
+                        STATUS_NAMES[status],
+                        remaining,
+                        duration,
+                        _from_micros(started_at),
+                        _from_micros(deadline),
+                        _from_micros(updated_at),
+                        owner,
+                    )
+                    for timer_id, status, remaining, duration, started_at, deadline, updated_at, owner
+                    in RECORD.iter_unpack(records)
+                ]
+    return _from_micros(watermark), timers
@@ -0,0 +1,208 @@
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import List, NamedTuple, Optional
+from uuid import UUID
+
+from app.config import get_settings
+from app.models.timer import TimerEvent
+from app.repos.event_store_repo import STATE_FIELDS, fold_events
+from app.repos.timer_repo import TimerRepo
+from app.schemas.timer import TimerStatus, UrgencyLevel
+from app.services.metrics import Counter
+
+
+timeline_lookups = Counter(
+    "timeline_cache_lookups_total",
+    "Urgency timeline cache lookups by result.",
+    ("result",),
+)
+
+
+class Segment(NamedTuple):
+    """Stretch between transitions where remaining time is linear."""
+    start: datetime
+    # None for a countdown still running when the timeline was built
+    end: Optional[datetime]
+    remaining: float
+    running: bool
+    duration: int
+    status: str
+
+    def remaining_at(self, at: datetime) -> float:
+        """Remaining seconds at a time within the segment."""
+        if not self.running:
+            return self.remaining
+        return max(0.0, self.remaining - (at - self.start).total_seconds())
+
+
+def build_segments(events: List[TimerEvent]) -> List[Segment]:
+    """Piecewise-linear remaining time between events in recorded order.
+
+    Each event carries the state it left the timer in, so a running
+    stretch counts down at one second per second from its event until the
+    next one. A countdown that reaches zero before its next event turns
+    into an expired stretch there, and the last event of a timer that is
+    not running closes the timeline with a zero-length segment. Events are
+    put in recorded order first, ties broken by sequence, so segments never
+    run backwards whatever order the caller passed.
+    """
+    events = sorted(events, key=lambda event: (event.recorded_at, event.sequence or 0))
+    state = dict.fromkeys(STATE_FIELDS)
+    state["status"] = TimerStatus.stopped.value
+    segments: List[Segment] = []
+    for event, following in zip(events, events[1:] + [None]):
+        fold_events(state, [event])
+        start = event.recorded_at
+        end = following.recorded_at if following else None
+        remaining = state["remaining_seconds"] or 0
+        duration = state["duration_seconds"] or 0
+        running = state["status"] == TimerStatus.running.value
+        if running:
+            zero = start + timedelta(seconds=remaining)
+            if end is None or zero >= end:
+                segments.append(Segment(start, end, remaining, True, duration, state["status"]))
+                continue
+            segments.append(Segment(start, zero, remaining, True, duration, state["status"]))
+            start, remaining, running = zero, 0, False
+            state["status"] = TimerStatus.expired.value
+        segments.append(Segment(start, end or start, remaining, False, duration, state["status"]))
+    return segments
+
+
+class Timeline:
+    """Urgency over the life of a timer, rebuilt from its events.
+
+    Downsampled series are remembered per resolution once they can no
+    longer change, which is as soon as the last countdown has run out or
+    the timer stopped running.
+    """
+
+    def __init__(self, events: List[TimerEvent], max_points: int = 2000):
+        """Build segments for events in recorded order."""
+        self.segments = build_segments(events)
+        self.max_points = max_points
+        self._series: dict[int, List[dict]] = {}
+
+    def ends_at(self, now: datetime) -> Optional[datetime]:
+        """End of the timeline, following a running countdown up to ``now``."""
+        if not self.segments:
+            return None
+        last = self.segments[-1]
+        if last.end is not None:
+            return last.end
+        return max(last.start, min(now, last.start + timedelta(seconds=last.remaining)))
+
+    def is_final(self, now: datetime) -> bool:
+        """Whether later views see the same timeline without new events."""
+        if not self.segments:
+            return True
+        last = self.segments[-1]
+        return last.end is not None or last.start + timedelta(seconds=last.remaining) <= now
+
+    def default_resolution(self, now: datetime, points: int) -> int:
+        """Whole seconds per point that spread the timeline over about ``points`` points."""
+        if not self.segments:
+            return 1
+        span = (self.ends_at(now) - self.segments[0].start).total_seconds()
+        return max(1, math.ceil(span / points))
+
+    def series(self, resolution: int, now: datetime) -> List[dict]:
+        """One point per ``resolution`` seconds from the first event.
+
+        Each point has the lowest remaining time and the highest urgency
+        reached within its interval, so short alarms survive coarse
+        resolutions, and the status at the end of the interval. Raises
+        ValueError if that needs more than ``max_points`` points.
+        """
+        cached = self._series.get(resolution)
+        if cached is not None:
+            return cached
+        if not self.segments:
+            return []
+
+        origin, end = self.segments[0].start, self.ends_at(now)
+        count = max(1, math.ceil((end - origin).total_seconds() / resolution))
+        if count > self.max_points:
+            raise ValueError(
+                f"Resolution of {resolution}s needs {count} points; the limit is {self.max_points}"
+            )
+
+        points = []
+        first = 0
+        for index in range(count):
+            lo = origin + timedelta(seconds=index * resolution)
+            hi = min(end, lo + timedelta(seconds=resolution))
+            while first < len(self.segments) - 1 and self._end(self.segments[first], end) < lo:
+                first += 1
+            lowest, urgency, status = None, UrgencyLevel.calm, None
+            for segment in self.segments[first:]:
+                if segment.start > hi or (segment.start == hi and hi < end):
+                    break
+                segment_end = self._end(segment, end)
+                if segment_end < lo or (segment_end == lo and segment.start < lo):
+                    continue
+                # Remaining time only falls within a segment.
+                remaining = math.ceil(segment.remaining_at(min(segment_end, hi)))
+                level = UrgencyLevel.from_ratio(remaining, segment.duration)
+                lowest = remaining if lowest is None else min(lowest, remaining)
+                urgency = max(urgency, level)
+                status = segment.status
+            points.append(
+                {
+                    "offset_seconds": index * resolution,
+                    "remaining_seconds": lowest,
+                    "urgency_level": urgency,
+                    "status": status,
+                }
+            )
+
+        if self.is_final(now):
+            self._series[resolution] = points
+        return points
+
+    @staticmethod
+    def _end(segment: Segment, end: datetime) -> datetime:
+        return segment.end if segment.end is not None else end
+
+
+class TimelineCache:
+    """Timelines keyed by timer and the id of its latest event.
+
+    A new event changes the key, so entries never need invalidating; the
+    least recently used timer is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 500, max_points: int = 2000):
+        """Initialize an empty cache."""
+        self.max_entries = max_entries
+        self.max_points = max_points
+        self._entries: OrderedDict[UUID, tuple[Optional[UUID], Timeline]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, repo: TimerRepo, timer_id: UUID) -> Timeline:
+        """Timeline of a timer, reading its events only when it has new ones."""
+        last_event_id = repo.get_last_event_id(timer_id)
+        with self._lock:
+            entry = self._entries.get(timer_id)
+            if entry is not None and entry[0] == last_event_id:
+                self._entries.move_to_end(timer_id)
+                timeline_lookups.inc(("hit",))
+                return entry[1]
+        timeline_lookups.inc(("miss",))
+        timeline = Timeline(repo.get_timer_events(timer_id), self.max_points)
+        with self._lock:
+            self._entries[timer_id] = (last_event_id, timeline)
+            self._entries.move_to_end(timer_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return timeline
+
+
+settings = get_settings()
+
+timeline_cache = TimelineCache(settings.timeline_cache_size, settings.timeline_max_points)
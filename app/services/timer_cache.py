@@ -0,0 +1,199 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.timer import Timer
+from app.repos import get_timer_repo
+from app.schemas.timer import TimerStatus
+from app.services.auth import owner_key
+from app.services.clock import Clock, system_clock
+from app.services.metrics import active_timers, cache_lookups
+from app.services.snapshot import CachedTimer, read_snapshot, write_snapshot
+
+
+logger = logging.getLogger(__name__)
+
+# Events committed slightly out of recorded_at order are still picked up.
+REPLAY_OVERLAP = timedelta(seconds=5)
+
+
+def cache_entry(timer: Timer) -> CachedTimer:
+    """Build the cached form of a timer row."""
+    deadline = None
+    if timer.status == TimerStatus.running and timer.started_at:
+        deadline = timer.started_at + timedelta(seconds=timer.remaining_seconds)
+    return CachedTimer(
+        timer.id,
+        TimerStatus(timer.status).value,
+        timer.remaining_seconds,
+        timer.duration_seconds,
+        timer.started_at,
+        deadline,
+        timer.updated_at,
+        owner_key(timer.owner_id),
+    )
+
+
+class TimerCache:
+    """In-memory index of active timers backed by periodic binary snapshots.
+
+    Startup loads the last snapshot and then refreshes only the timers
+    with events or row updates since its watermark, so warm-up cost
+    follows recent activity rather than the size of the timer table.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        path: str,
+        interval_seconds: float,
+        clock: Clock = system_clock,
+    ):
+        """Initialize an empty cache."""
+        self.session_factory = session_factory
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.clock = clock
+        self.watermark: Optional[datetime] = None
+        self._timers: dict[UUID, CachedTimer] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def get(self, timer_id: UUID) -> Optional[CachedTimer]:
+        """Fetch cached timer state."""
+        timer = self._timers.get(timer_id)
+        cache_lookups.inc(("hit",) if timer else ("miss",))
+        return timer
+
+    def is_foreign(self, timer_id: UUID, owner: bytes) -> bool:
+        """Whether the cache knows ``timer_id`` to belong to another owner.
+
+        Unknown timers are not foreign; owner-scoped repository queries
+        decide for those.
+        """
+        timer = self.get(timer_id)
+        return timer is not None and timer.owner_key != owner
+
+    def running(self) -> list[CachedTimer]:
+        """Cached timers that are counting down."""
+        return [timer for timer in self._timers.values() if timer.status == TimerStatus.running]
+
+    @property
+    def alive(self) -> bool:
+        """Whether the periodic refresh task is running."""
+        return self._task is not None and not self._task.done()
+
+    def lag_seconds(self) -> Optional[float]:
+        """Age of the last refresh, or None before the first one."""
+        if self.watermark is None:
+            return None
+        return (self.clock.now() - self.watermark).total_seconds()
+
+    def count_by_status(self) -> dict[tuple[str], int]:
+        """Number of cached timers per status."""
+        counts: dict[tuple[str], int] = {}
+        for timer in list(self._timers.values()):
+            counts[(timer.status,)] = counts.get((timer.status,), 0) + 1
+        return counts
+
+    def apply(self, timer: Timer) -> None:
+        """Store a timer row unless the cache already holds a newer version."""
+        current = self._timers.get(timer.id)
+        if current and timer.updated_at and current.version > timer.updated_at:
+            return
+        if timer.status == TimerStatus.expired:
+            self._timers.pop(timer.id, None)
+        else:
+            self._timers[timer.id] = cache_entry(timer)
+
+    def discard(self, timer_ids: Iterable[UUID]) -> None:
+        """Drop timers that no longer exist, such as archived ones."""
+        for timer_id in timer_ids:
+            self._timers.pop(timer_id, None)
+
+    def load_snapshot(self) -> bool:
+        """Load the last snapshot from disk, returning whether one was found."""
+        snapshot = read_snapshot(self.path)
+        if snapshot is None:
+            return False
+        self.watermark, timers = snapshot
+        self._timers = {timer.id: timer for timer in timers}
+        return True
+
+    async def save_snapshot(self) -> None:
+        """Write the current cache to disk without blocking the event loop."""
+        if self.watermark is None:
+            return
+        await asyncio.to_thread(
+            write_snapshot, self.path, self.watermark, list(self._timers.values())
+        )
+
+    def _refresh(self, db: Session) -> None:
+        """Replay changes since the watermark, or scan active timers when cold."""
+        repo = get_timer_repo(db)
+        now = self.clock.now()
+        if self.watermark is None:
+            self._timers = {timer.id: cache_entry(timer) for timer in repo.list_active_timers()}
+        else:
+            since = self.watermark - REPLAY_OVERLAP
+            # Events cover transitions; row writes cover new timers and plain ticks.
+            touched = {timer_id for timer_id, _ in repo.get_touched_timer_ids(since)}
+            touched.update(repo.get_updated_timer_ids(since))
+            found = repo.get_timers(touched)
+            for timer in found:
+                self.apply(timer)
+            for timer_id in touched - {timer.id for timer in found}:
+                self._timers.pop(timer_id, None)
+        self.watermark = now
+
+    async def refresh(self) -> None:
+        """Bring the cache up to date with the database."""
+        async with self.session_factory() as session:
+            await session.run_sync(self._refresh)
+
+    async def start(self) -> None:
+        """Warm the cache from the last snapshot and start periodic snapshots."""
+        if not self.load_snapshot():
+            logger.info("No timer snapshot at %s; scanning active timers", self.path)
+        await self.refresh()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop periodic snapshots and write a final one."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.save_snapshot()
+
+    async def _run(self) -> None:
+        """Refresh and snapshot on a fixed interval."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.refresh()
+                await self.save_snapshot()
+            except Exception:
+                logger.exception("Timer snapshot failed")
+
+
+settings = get_settings()
+
+timer_cache = TimerCache(
+    async_session_factory,
+    settings.snapshot_path,
+    settings.snapshot_interval_seconds,
+)
+active_timers.callback = timer_cache.count_by_status
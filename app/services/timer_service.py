@@ -1,18 +1,33 @@
 from datetime import datetime
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from uuid import UUID
 
 from app.models.timer import Timer
 from app.repos.timer_repo import TimerRepo
-from app.schemas.timer import UrgencyLevel, TimerStatus
+from app.services.clock import Clock, system_clock, to_epoch_ms
+from app.services.face import FACIAL_EXPRESSIONS, face_catalog
+from app.schemas.timer import UrgencyLevel, TimerStatus, TimerCommandOp
+
+if TYPE_CHECKING:
+    from app.services.leaderboard import Leaderboards
+
+
+DEFAULT_DURATION_SECONDS = 60
 
 
 class TimerService:
     """Timer state machine and urgency calculation logic."""
 
-    def __init__(self, repo: TimerRepo):
-        """Initialize service with repository."""
+    def __init__(
+        self,
+        repo: TimerRepo,
+        clock: Clock = system_clock,
+        boards: Optional["Leaderboards"] = None,
+    ):
+        """Initialize service with repository, time source and an optional leaderboards feed."""
         self.repo = repo
+        self.clock = clock
+        self.boards = boards
 
     def create_timer(self, duration_seconds: int, name: str = "Workout") -> Timer:
         """Create a new timer."""
@@ -32,11 +47,11 @@ class TimerService:
             timer_id,
             remaining_seconds=timer.remaining_seconds,
             status=TimerStatus.running,
-            started_at=datetime.utcnow(),
+            started_at=self.clock.now(),
             paused_at=None,
         )
         if timer:
-            self.repo.record_event(timer_id, "started", self._calculate_urgency(timer))
+            self._record(timer, "started")
         return timer
 
     def pause_timer(self, timer_id: UUID) -> Optional[Timer]:
@@ -49,10 +64,10 @@ class TimerService:
             timer_id,
             remaining_seconds=timer.remaining_seconds,
             status=TimerStatus.paused,
-            paused_at=datetime.utcnow(),
+            paused_at=self.clock.now(),
         )
         if timer:
-            self.repo.record_event(timer_id, "paused", self._calculate_urgency(timer))
+            self._record(timer, "paused")
         return timer
 
     def reset_timer(
@@ -73,7 +88,9 @@ class TimerService:
             reset_count=timer.reset_count + 1,
         )
         if timer:
-            self.repo.record_event(timer_id, "reset", self._calculate_urgency(timer))
+            self._record(timer, "reset")
+            if self.boards is not None:
+                self.boards.record_reset(timer, self.clock.now())
         return timer
 
     def tick_timer(self, timer_id: UUID, delta_seconds: int = 1) -> Optional[Timer]:
@@ -91,24 +108,22 @@ class TimerService:
             status=new_status,
         )
         if timer and new_status == TimerStatus.expired:
-            self.repo.record_event(timer_id, "expired", self._calculate_urgency(timer))
+            self._record(timer, "expired")
         return timer
 
+    def _record(self, timer: Timer, event_type: str) -> None:
+        """Log a transition with the state it left the timer in."""
+        self.repo.record_event(
+            timer.id,
+            event_type,
+            self._calculate_urgency(timer),
+            remaining_seconds=timer.remaining_seconds,
+            duration_seconds=timer.duration_seconds,
+        )
+
     def _calculate_urgency(self, timer: Timer) -> int:
         """Calculate urgency level based on remaining time ratio."""
-        if timer.duration_seconds == 0:
-            return UrgencyLevel.calm
-
-        ratio = timer.remaining_seconds / timer.duration_seconds
-
-        if ratio > 0.5:
-            return UrgencyLevel.calm
-        elif ratio > 0.25:
-            return UrgencyLevel.elevated
-        elif ratio > 0.0:
-            return UrgencyLevel.anxious
-        else:
-            return UrgencyLevel.alarm
+        return UrgencyLevel.from_ratio(timer.remaining_seconds, timer.duration_seconds)
 
     def calculate_urgency_response(self, timer: Timer) -> dict:
         """Calculate visual urgency state for frontend."""
@@ -116,15 +131,178 @@ class TimerService:
 
         colour_intensity = 1.0 - (timer.remaining_seconds / timer.duration_seconds)
 
-        facial_expressions = {
-            UrgencyLevel.calm: "calm",
-            UrgencyLevel.elevated: "slightly_concerned",
-            UrgencyLevel.anxious: "anxious",
-            UrgencyLevel.alarm: "alarm",
-        }
-
         return {
             "level": urgency_level,
             "colour_intensity": colour_intensity,
-            "facial_expression": facial_expressions[urgency_level],
+            "facial_expression": FACIAL_EXPRESSIONS[urgency_level],
+        }
+
+    def build_state(self, timer: Timer) -> dict:
+        """Build the countdown display state for a timer."""
+        urgency = self.calculate_urgency_response(timer)
+        return {
+            "id": str(timer.id),
+            "countdown": timer.remaining_seconds,
+            "duration": timer.duration_seconds,
+            "is_paused": timer.status in (TimerStatus.stopped, TimerStatus.paused),
+            "is_expired": timer.status == TimerStatus.expired,
+            "urgency_level": UrgencyLevel(urgency["level"]).name,
+            "colour_intensity": urgency["colour_intensity"],
+            "last_reset_at": timer.updated_at if timer.reset_count else timer.created_at,
+        }
+
+    def build_urgency_state(self, timer: Timer) -> dict:
+        """Build the urgency state for a timer."""
+        urgency = self.calculate_urgency_response(timer)
+        return {
+            "urgency_level": UrgencyLevel(urgency["level"]).name,
+            "colour_intensity": urgency["colour_intensity"],
+            "remaining_percent": 100 * timer.remaining_seconds / timer.duration_seconds,
+            "facial_expression": urgency["facial_expression"],
+            "face_url": face_catalog.url_for(urgency["level"], urgency["colour_intensity"]),
+        }
+
+    def build_compact_state(self, timer: Timer) -> dict:
+        """Build the minimal polling state: remaining time, status, urgency, version."""
+        return {
+            "remaining": timer.remaining_seconds,
+            "status": TimerStatus(timer.status).value,
+            "urgency": int(self._calculate_urgency(timer)),
+            "version": to_epoch_ms(timer.updated_at or timer.created_at),
         }
+
+    def _get_or_create_active(self) -> Timer:
+        """Fetch the active timer, creating a default one on first use."""
+        timer = self.repo.get_active_timer()
+        if not timer:
+            timer = self.repo.create_timer(DEFAULT_DURATION_SECONDS)
+        return timer
+
+    def get_state(self) -> dict:
+        """Get active timer state."""
+        return self.build_state(self._get_or_create_active())
+
+    def get_compact_state(self) -> dict:
+        """Get minimal polling state of the active timer."""
+        return self.build_compact_state(self._get_or_create_active())
+
+    def configure(self, duration_seconds: int, name: str = "Workout") -> dict:
+        """Replace the active timer with a new one of the given duration."""
+        return self.build_state(self.create_timer(duration_seconds, name))
+
+    def reset(self) -> dict:
+        """Reset the active timer and restart its countdown."""
+        timer = self._get_or_create_active()
+        if timer.status == TimerStatus.expired:
+            raise ValueError("Timer has expired; configure a new countdown")
+        self.reset_timer(timer.id)
+        return self.build_state(self.start_timer(timer.id))
+
+    def pause(self) -> dict:
+        """Pause the active timer."""
+        timer = self._get_or_create_active()
+        if timer.status != TimerStatus.running:
+            raise ValueError("Timer is not running")
+        return self.build_state(self.pause_timer(timer.id))
+
+    def resume(self) -> dict:
+        """Resume the active timer."""
+        timer = self._get_or_create_active()
+        if timer.status == TimerStatus.expired:
+            raise ValueError("Timer has expired")
+        return self.build_state(self.start_timer(timer.id))
+
+    def get_urgency(self) -> dict:
+        """Get urgency state of the active timer."""
+        return self.build_urgency_state(self._get_or_create_active())
+
+    def apply_batch(self, commands: list[dict]) -> list[dict]:
+        """Apply many commands in one transaction, returning results in order.
+
+        Timers are loaded with one query, transitions are applied in memory,
+        and the resulting updates and events are written in a single commit.
+        Commands for unknown timers or invalid transitions fail individually.
+        """
+        timers = {timer.id: timer for timer in self.repo.get_timers({c["id"] for c in commands})}
+        now = self.clock.now()
+        events = []
+        results = []
+
+        for command in commands:
+            result = {"id": str(command["id"]), "op": command["op"], "ok": False}
+            timer = timers.get(command["id"])
+            if not timer:
+                result["error"] = "Timer not found"
+                results.append(result)
+                continue
+
+            try:
+                event_type = self._apply_command(timer, command["op"], command.get("args") or {}, now)
+            except ValueError as e:
+                result["error"] = str(e)
+                results.append(result)
+                continue
+
+            if event_type:
+                events.append({
+                    "timer_id": timer.id,
+                    "event_type": event_type,
+                    "urgency_level": int(self._calculate_urgency(timer)),
+                    "remaining_seconds": timer.remaining_seconds,
+                    "duration_seconds": timer.duration_seconds,
+                    "recorded_at": now,
+                })
+            result["ok"] = True
+            result["timer"] = timer.to_dict()
+            results.append(result)
+
+        self.repo.save_batch(events)
+        if self.boards is not None:
+            for event in events:
+                if event["event_type"] == "reset":
+                    self.boards.record_reset(timers[event["timer_id"]], now)
+        return results
+
+    def _apply_command(self, timer: Timer, op: str, args: dict, now: datetime) -> Optional[str]:
+        """Apply one transition to a loaded timer and return the event to record."""
+        if op in (TimerCommandOp.start, TimerCommandOp.resume):
+            if timer.status == TimerStatus.expired:
+                raise ValueError("Timer has expired")
+            timer.status = TimerStatus.running
+            timer.started_at = now
+            timer.paused_at = None
+            event_type = "started"
+        elif op == TimerCommandOp.pause:
+            if timer.status != TimerStatus.running:
+                raise ValueError("Timer is not running")
+            timer.status = TimerStatus.paused
+            timer.paused_at = now
+            event_type = "paused"
+        elif op == TimerCommandOp.reset:
+            duration = args.get("duration_seconds") or timer.duration_seconds
+            if not 1 <= duration <= 3600:
+                raise ValueError("duration_seconds must be between 1 and 3600")
+            timer.duration_seconds = duration
+            timer.remaining_seconds = duration
+            timer.status = TimerStatus.stopped
+            timer.started_at = None
+            timer.paused_at = None
+            timer.reset_count = (timer.reset_count or 0) + 1
+            event_type = "reset"
+        elif op == TimerCommandOp.tick:
+            delta = args.get("delta_seconds", 1)
+            if delta < 1:
+                raise ValueError("delta_seconds must be at least 1")
+            if timer.status != TimerStatus.running:
+                return None
+            timer.remaining_seconds = max(0, timer.remaining_seconds - delta)
+            if timer.remaining_seconds > 0:
+                timer.updated_at = now
+                return None
+            timer.status = TimerStatus.expired
+            event_type = "expired"
+        else:
+            raise ValueError(f"Unknown operation: {op}")
+
+        timer.updated_at = now
+        return event_type
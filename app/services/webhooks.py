@@ -0,0 +1,295 @@
+import asyncio
+import hashlib
+import hmac
+import ipaddress
+import json
+import logging
+import random
+import socket
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable, Optional
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import get_settings
+from app.database import async_session_factory
+from app.models.webhook import WebhookDelivery, WebhookSubscription
+from app.repos.webhook_repo import WebhookRepo
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.clock import Clock, system_clock
+from app.services.metrics import Counter, Gauge
+
+
+logger = logging.getLogger(__name__)
+
+webhook_deliveries = Counter(
+    "webhook_deliveries_total",
+    "Webhook notifications by outcome.",
+    ("outcome",),
+)
+webhook_inflight = Gauge(
+    "webhook_requests_in_flight",
+    "Webhook POSTs currently waiting on a receiver.",
+)
+
+SIGNATURE_HEADER = "X-Timer-Signature"
+
+
+def sign(secret: str, body: bytes) -> str:
+    """Signature header value receivers use to authenticate a delivery."""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+class UnsafeDestination(ValueError):
+    """A webhook URL points at an address the server must not call."""
+
+
+async def resolve_host(host: str, port: int) -> list[str]:
+    """Addresses ``host`` resolves to, without blocking the event loop."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+Resolver = Callable[[str, int], Awaitable[list[str]]]
+
+
+async def check_destination(
+    url: str, allowed_hosts: Iterable[str] = (), resolve: Resolver = resolve_host
+) -> None:
+    """Raise UnsafeDestination unless every address of the URL's host is public.
+
+    Loopback, private, link-local (cloud metadata) and other non-global
+    addresses are refused, so a subscriber cannot make the server call
+    into its own network. Hosts in ``allowed_hosts`` skip the check, for
+    receivers deliberately run on the internal network.
+    """
+    parsed = httpx.URL(url)
+    host = parsed.host
+    if not host:
+        raise UnsafeDestination("Webhook URL has no host")
+    if host.lower() in {allowed.lower() for allowed in allowed_hosts}:
+        return
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    try:
+        addresses = await resolve(host, port)
+    except OSError as e:
+        raise UnsafeDestination(f"Cannot resolve {host}: {e}") from e
+    if not addresses:
+        raise UnsafeDestination(f"Cannot resolve {host}")
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if not ip.is_global:
+            raise UnsafeDestination(f"{host} resolves to non-public address {ip}")
+
+
+class WebhookDispatcher:
+    """Delivers outbox rows to webhook endpoints in the background.
+
+    Transitions only write outbox rows in their own transaction; every
+    HTTP request happens here, so a slow receiver never delays a command.
+    Due rows are claimed in batches and grouped per endpoint, so a burst
+    of transitions becomes one POST of a JSON array. Requests share one
+    pooled keep-alive client, at most ``max_concurrency`` at a time.
+    Failures are retried with exponential backoff and jitter until
+    ``max_attempts``. Each endpoint has its own circuit breaker: while it
+    is open, that endpoint's rows are postponed without a request.
+    Destinations are checked again before every request, since DNS may
+    have changed since registration; rows for unsafe ones are retired.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        poll_interval_seconds: float = 0.5,
+        batch_size: int = 200,
+        max_concurrency: int = 10,
+        timeout_seconds: float = 5.0,
+        max_attempts: int = 8,
+        backoff_seconds: float = 1.0,
+        max_backoff_seconds: float = 300.0,
+        failure_threshold: int = 3,
+        reset_timeout_seconds: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        clock: Clock = system_clock,
+        allowed_hosts: Iterable[str] = (),
+        resolve: Resolver = resolve_host,
+    ):
+        """Initialize an idle dispatcher."""
+        self.session_factory = session_factory
+        self.poll_interval_seconds = poll_interval_seconds
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.timeout_seconds = timeout_seconds
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.transport = transport
+        self.clock = clock
+        self.allowed_hosts = list(allowed_hosts)
+        self.resolve = resolve
+        self.rng = random.Random()
+        self.breakers: dict[str, CircuitBreaker] = {}
+        self.client: Optional[httpx.AsyncClient] = None
+        self.in_flight = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._task: Optional[asyncio.Task] = None
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Circuit breaker of an endpoint."""
+        breaker = self.breakers.get(url)
+        if breaker is None:
+            breaker = self.breakers[url] = CircuitBreaker(
+                self.failure_threshold, self.reset_timeout_seconds, self.clock
+            )
+        return breaker
+
+    def backoff(self, attempts: int) -> timedelta:
+        """Delay before retry number ``attempts``, with full jitter."""
+        ceiling = min(self.max_backoff_seconds, self.backoff_seconds * 2 ** (attempts - 1))
+        return timedelta(seconds=self.rng.uniform(ceiling / 2, ceiling))
+
+    @property
+    def lease(self) -> timedelta:
+        """How long claimed rows stay hidden from other workers."""
+        return timedelta(seconds=2 * self.timeout_seconds + self.poll_interval_seconds)
+
+    async def open(self) -> None:
+        """Create the shared HTTP client."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=self.timeout_seconds,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+
+    async def close(self) -> None:
+        """Close the shared HTTP client and its pooled connections."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def dispatch_once(self) -> int:
+        """Deliver one claimed batch of due rows, returning how many were claimed."""
+        await self.open()
+        async with self.session_factory() as session:
+            claimed = await session.run_sync(
+                lambda db: WebhookRepo(db).claim_due(self.clock.now(), self.batch_size, self.lease)
+            )
+        groups: dict[str, list[tuple[WebhookDelivery, WebhookSubscription]]] = defaultdict(list)
+        for delivery, subscription in claimed:
+            groups[subscription.url].append((delivery, subscription))
+        await asyncio.gather(*(self._deliver(url, rows) for url, rows in groups.items()))
+        return len(claimed)
+
+    async def _deliver(self, url: str, rows: list[tuple[WebhookDelivery, WebhookSubscription]]) -> None:
+        """POST a group of deliveries for one endpoint and record the outcome."""
+        breaker = self.breaker(url)
+        deliveries = [delivery for delivery, _ in rows]
+        try:
+            await check_destination(url, self.allowed_hosts, self.resolve)
+        except UnsafeDestination as e:
+            logger.warning("Refusing webhook delivery to %s: %s", url, e)
+            webhook_deliveries.inc(("refused",), len(deliveries))
+            await self._record(
+                lambda repo: repo.mark_failed([delivery.id for delivery in deliveries], None, str(e))
+            )
+            return
+        if not breaker.allow():
+            webhook_deliveries.inc(("short_circuited",), len(deliveries))
+            retry_at = self.clock.now() + timedelta(seconds=breaker.retry_after_seconds())
+            await self._record(
+                lambda repo: repo.mark_failed(
+                    [delivery.id for delivery in deliveries], retry_at, "circuit open", attempted=False
+                )
+            )
+            return
+
+        body = json.dumps({"deliveries": [json.loads(delivery.payload) for delivery in deliveries]})
+        headers = {"Content-Type": "application/json"}
+        # Rows of one endpoint may come from subscriptions with different secrets.
+        secrets = {subscription.secret for _, subscription in rows if subscription.secret}
+        if secrets:
+            headers[SIGNATURE_HEADER] = ",".join(sign(secret, body.encode()) for secret in sorted(secrets))
+
+        error = None
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                response = await self.client.post(url, content=body, headers=headers)
+                if response.status_code >= 300:
+                    error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = f"{type(e).__name__}: {e}"
+            finally:
+                self.in_flight -= 1
+
+        if error is None:
+            breaker.record_success()
+            webhook_deliveries.inc(("delivered",), len(deliveries))
+            await self._record(lambda repo: repo.mark_delivered([delivery.id for delivery in deliveries]))
+            return
+
+        breaker.record_failure()
+        logger.warning("Webhook delivery to %s failed: %s", url, error)
+        retries: dict[Optional[datetime], list] = defaultdict(list)
+        now = self.clock.now()
+        for delivery in deliveries:
+            attempts = delivery.attempts + 1
+            retry_at = None if attempts >= self.max_attempts else now + self.backoff(attempts)
+            retries[retry_at].append(delivery.id)
+        for retry_at, delivery_ids in retries.items():
+            webhook_deliveries.inc(("retried" if retry_at else "abandoned",), len(delivery_ids))
+            await self._record(lambda repo: repo.mark_failed(delivery_ids, retry_at, error))
+
+    async def _record(self, call) -> None:
+        """Write a delivery outcome in a session of its own."""
+        async with self.session_factory() as session:
+            await session.run_sync(lambda db: call(WebhookRepo(db)))
+
+    async def start(self) -> None:
+        """Open the HTTP client and start delivering in the background."""
+        await self.open()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop delivering; claimed rows become due again when their lease ends."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.close()
+
+    async def _run(self) -> None:
+        """Poll the outbox, draining full batches without waiting."""
+        while True:
+            try:
+                claimed = await self.dispatch_once()
+            except Exception:
+                logger.exception("Webhook dispatch failed")
+                claimed = 0
+            if claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+
+settings = get_settings()
+
+webhook_dispatcher = WebhookDispatcher(
+    async_session_factory,
+    poll_interval_seconds=settings.webhook_poll_interval_seconds,
+    batch_size=settings.webhook_batch_size,
+    max_concurrency=settings.webhook_max_concurrency,
+    timeout_seconds=settings.webhook_timeout_seconds,
+    max_attempts=settings.webhook_max_attempts,
+    allowed_hosts=settings.webhook_allowed_hosts,
+)
+webhook_inflight.callback = lambda: {(): webhook_dispatcher.in_flight}
@@ -0,0 +1,158 @@
+"""Shared setup for in-process benchmarks of the timer API."""
+import contextvars
+import json
+import math
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import get_settings
+from app.database import Base, get_session
+from app.main import app
+from app.services.rate_limit import set_rate_limiting
+
+
+current_label: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("bench_label", default=None)
+
+
+class StatementCounter:
+    """Counts SQL statements per label via engine cursor hooks."""
+
+    def __init__(self, engine: AsyncEngine):
+        """Attach to an engine."""
+        self.counts: dict[str, int] = {}
+        self.total = 0
+        self.attach(engine)
+
+    def attach(self, engine) -> None:
+        """Also count statements executed through ``engine``."""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        event.listen(sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.total += 1
+        label = current_label.get()
+        if label is not None:
+            self.counts[label] = self.counts.get(label, 0) + 1
+
+
+def add_statement_latency(engine, seconds: float) -> None:
+    """Emulate a network round trip by blocking before every statement."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(
+        sync_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, parameters, context, executemany: time.sleep(seconds),
+    )
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of ``samples``."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def latency_summary(samples_ms: list[float]) -> dict:
+    """Latency distribution in milliseconds."""
+    return {
+        "count": len(samples_ms),
+        "mean_ms": round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        "p50_ms": round(percentile(samples_ms, 50), 3),
+        "p95_ms": round(percentile(samples_ms, 95), 3),
+        "p99_ms": round(percentile(samples_ms, 99), 3),
+        "max_ms": round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def environment() -> dict:
+    """Describe where the benchmark ran, for comparing results across branches."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+
+def write_results(results: dict, output: Optional[str]) -> None:
+    """Write results as JSON to ``output`` or stdout."""
+    text = json.dumps(results, indent=2, default=str)
+    if output:
+        with open(output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+
+def disposable_database(database_url: str) -> bool:
+    """Whether ``database_url`` is SQLite or a database named ``*_bench``."""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" or (url.database or "").endswith("_bench")
+
+
+@asynccontextmanager
+async def stand_in_engine(
+    database_url: Optional[str] = None, reset_schema: bool = False
+) -> AsyncIterator[AsyncEngine]:
+    """Create a fresh schema on ``database_url`` or a temporary SQLite file.
+
+    Every table is dropped first, so any other database must be opted in
+    with ``reset_schema``; raises ValueError otherwise.
+    """
+    if database_url and not (reset_schema or disposable_database(database_url)):
+        raise ValueError(
+            f"Refusing to drop every table in {make_url(database_url).database!r}; "
+            "use a database named *_bench or pass --reset-schema"
+        )
+    with tempfile.TemporaryDirectory() as tmpdir:
+        url = database_url or f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'bench.db')}"
+        connect_args = {"timeout": 30} if url.startswith("sqlite") else {}
+        engine = create_async_engine(url, connect_args=connect_args)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+        try:
+            yield engine
+        finally:
+            await engine.dispose()
+
+
+@asynccontextmanager
+async def app_client(engine: AsyncEngine) -> AsyncIterator[AsyncClient]:
+    """HTTP client for the app with its sessions bound to ``engine``.
+
+    The app lifespan is not run, so background tasks stay out of the
+    measurements, and rate limiting is off since every simulated client
+    shares one address.
+    """
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    set_rate_limiting(False)
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_session, None)
+        set_rate_limiting(get_settings().rate_limit_enabled)
@@ -0,0 +1,224 @@
+"""Concurrent load test for the timer API.
+
+Drives the app in-process with many pollers reading ``/api/timer`` and
+``/api/urgency`` and a few commanders cycling pause/resume/reset, then
+reports throughput, latency percentiles and database statements per request.
+
+    python -m benchmarks.load_test --pollers 200 --commanders 10 --duration 30 \\
+        --output results.json
+
+By default a temporary SQLite database stands in for Postgres so the suite
+runs anywhere; pass ``--database-url`` to measure against a real server.
+Its tables are dropped and recreated, so the database must be named
+``*_bench`` unless ``--reset-schema`` is given.
+With ``--baseline`` the run fails when any route's p95 regresses by more
+than ``--max-regression``.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Optional
+
+from app.services.offload import configure_repo_executor
+from benchmarks.harness import (
+    StatementCounter,
+    add_statement_latency,
+    app_client,
+    current_label,
+    environment,
+    latency_summary,
+    stand_in_engine,
+    write_results,
+)
+
+
+POLL_ROUTES = ("GET /api/timer", "GET /api/urgency")
+COMMAND_CYCLE = ("/api/timer/resume", "/api/timer/pause", "/api/timer/resume", "/api/timer/reset")
+
+
+class LoadStats:
+    """Latencies and outcomes per route."""
+
+    def __init__(self):
+        """Start with no samples."""
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.client_errors: dict[str, int] = defaultdict(int)
+        self.server_errors: dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, elapsed_ms: float, status_code: int) -> None:
+        """Record one response."""
+        self.latencies[route].append(elapsed_ms)
+        if status_code >= 500:
+            self.server_errors[route] += 1
+        elif status_code >= 400:
+            self.client_errors[route] += 1
+
+
+async def timed_request(client, stats: LoadStats, method: str, path: str) -> None:
+    """Issue one request, attributing its SQL statements to the route."""
+    route = f"{method} {path}"
+    token = current_label.set(route)
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path)
+        status_code = response.status_code
+    except Exception:
+        status_code = 599
+    finally:
+        current_label.reset(token)
+    stats.record(route, (time.perf_counter() - started) * 1000, status_code)
+
+
+async def poller(client, stats: LoadStats, deadline: float, index: int) -> None:
+    """Poll timer and urgency state until the deadline."""
+    path = "/api/timer" if index % 2 == 0 else "/api/urgency"
+    while time.perf_counter() < deadline:
+        await timed_request(client, stats, "GET", path)
+        path = "/api/urgency" if path == "/api/timer" else "/api/timer"
+
+
+async def commander(client, stats: LoadStats, deadline: float, index: int) -> None:
+    """Cycle state transitions until the deadline.
+
+    Commanders race each other, so a pause of an already paused timer is an
+    expected 400 and counted as a client error rather than a failure.
+    """
+    step = index
+    while time.perf_counter() < deadline:
+        await timed_request(client, stats, "POST", COMMAND_CYCLE[step % len(COMMAND_CYCLE)])
+        step += 1
+
+
+async def run_load(
+    pollers: int,
+    commanders: int,
+    duration: float,
+    database_url: Optional[str] = None,
+    offload_threads: int = 0,
+    db_latency_ms: float = 0.0,
+    reset_schema: bool = False,
+) -> dict:
+    """Run the load test and return its results.
+
+    ``offload_threads`` runs timer repository calls on the thread pool, and
+    ``db_latency_ms`` blocks before every statement to emulate a remote
+    database on the local stand-in. ``reset_schema`` allows dropping the
+    tables of a ``database_url`` not named ``*_bench``.
+    """
+    async with stand_in_engine(database_url, reset_schema) as engine:
+        counter = StatementCounter(engine)
+        executor = configure_repo_executor(
+            engine.url.render_as_string(hide_password=False), offload_threads
+        )
+        if executor is not None:
+            # Offloaded statements run on the executor's engine.
+            counter.attach(executor.engine)
+        if db_latency_ms:
+            for target in filter(None, (engine, executor and executor.engine)):
+                add_statement_latency(target, db_latency_ms / 1000)
+        try:
+            async with app_client(engine) as client:
+                # Create the active timer up front so workers do not race to create it.
+                await client.post("/api/timer", json={"duration": 3600, "name": "Load test"})
+                await client.post("/api/timer/resume")
+
+                stats = LoadStats()
+                started = time.perf_counter()
+                deadline = started + duration
+                workers = [poller(client, stats, deadline, i) for i in range(pollers)]
+                workers += [commander(client, stats, deadline, i) for i in range(commanders)]
+                await asyncio.gather(*workers)
+                elapsed = time.perf_counter() - started
+        finally:
+            configure_repo_executor("", 0)
+
+    routes = {}
+    for route, samples in sorted(stats.latencies.items()):
+        routes[route] = {
+            **latency_summary(samples),
+            "client_errors": stats.client_errors[route],
+            "server_errors": stats.server_errors[route],
+            "statements_per_request": round(counter.counts.get(route, 0) / len(samples), 2),
+        }
+    all_samples = [sample for samples in stats.latencies.values() for sample in samples]
+    return {
+        "environment": {
+            **environment(),
+            "database": engine.url.render_as_string(hide_password=True),
+        },
+        "config": {
+            "pollers": pollers,
+            "commanders": commanders,
+            "duration_seconds": duration,
+            "offload_threads": offload_threads,
+            "db_latency_ms": db_latency_ms,
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "requests": len(all_samples),
+        "throughput_rps": round(len(all_samples) / elapsed, 1) if elapsed else 0.0,
+        "latency": latency_summary(all_samples),
+        "server_errors": sum(stats.server_errors.values()),
+        "routes": routes,
+    }
+
+
+def compare_to_baseline(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    """Return a message for each route whose p95 regressed past the threshold."""
+    regressions = []
+    for route, current in results["routes"].items():
+        previous = baseline.get("routes", {}).get(route)
+        if not previous or not previous["p95_ms"]:
+            continue
+        ratio = current["p95_ms"] / previous["p95_ms"] - 1
+        if ratio > max_regression:
+            regressions.append(
+                f"{route}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms (+{ratio:.0%})"
+            )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pollers", type=int, default=200)
+    parser.add_argument("--commanders", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds")
+    parser.add_argument("--database-url", help="async SQLAlchemy URL (default: temporary SQLite)")
+    parser.add_argument(
+        "--reset-schema", action="store_true", help="drop tables even if the database is not *_bench"
+    )
+    parser.add_argument("--offload-threads", type=int, default=0, help="0 runs repo calls on the loop")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="emulated round trip")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="results JSON from a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed p95 growth")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run_load(
+            args.pollers,
+            args.commanders,
+            args.duration,
+            args.database_url,
+            args.offload_threads,
+            args.db_latency_ms,
+            args.reset_schema,
+        )
+    )
+    write_results(results, args.output)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.max_regression)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if results["server_errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
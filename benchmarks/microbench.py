@@ -0,0 +1,235 @@
+"""Microbenchmarks for TimerService hot paths and metrics instrumentation.
+
+Each case is timed per call and, separately, measured under ``tracemalloc``
+for peak bytes allocated per call. Results are compared against stored
+baselines so hot-path regressions show up in review:
+
+    python -m benchmarks.microbench                    # compare to baseline
+    python -m benchmarks.microbench --update-baseline  # record a new baseline
+
+A case regresses when its time or allocations grow past ``--threshold``
+relative to the baseline. Allocation figures are deterministic enough to
+compare across machines. Timings are divided by a calibration loop timed
+in the same run, so a slower or busier host does not read as a
+regression; they are skipped against baselines recorded without one.
+Regressions are reported either way but only fail the run with
+``--fail-on-regression``.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.timer import Timer
+from app.repos.timer_repo import TimerRepo
+from app.schemas.timer import TimerResponse, UrgencyResponse, TimerStatus
+from app.services.auth import Authenticator, issue_token
+from app.services.metrics import Counter, Histogram, REGISTRY
+from app.services.timer_service import TimerService
+from benchmarks.harness import environment
+
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "microbench.json"
+
+
+@dataclass
+class BenchResult:
+    """Per-call cost of one benchmark case."""
+    name: str
+    ns_per_call: float
+    bytes_per_call: int
+
+
+def measure(
+    name: str, fn: Callable[[], object], iterations: int = 2000, rounds: int = 5
+) -> BenchResult:
+    """Time ``fn`` and measure its peak allocations per call.
+
+    Timing takes the best of ``rounds`` loops so scheduler noise does not
+    count against the code. Allocations are measured in a separate pass
+    because tracemalloc itself slows every allocation down.
+    """
+    for _ in range(min(iterations, 100)):
+        fn()
+
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter_ns()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.perf_counter_ns() - started) / iterations)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(min(iterations, 200)):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            fn()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+
+    return BenchResult(name, round(best, 1), int(statistics.median(peaks)))
+
+
+def calibration_loop() -> int:
+    """Fixed interpreter-bound work that scales with host speed like the cases do."""
+    return sum(i * i for i in range(200))
+
+
+def calibrate(iterations: int = 2000) -> float:
+    """Nanoseconds per call of the calibration loop on this host, right now."""
+    return measure("calibration", calibration_loop, iterations).ns_per_call
+
+
+def make_timer(remaining_seconds: int = 20, duration_seconds: int = 60) -> Timer:
+    """Create a detached running timer."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return Timer(
+        id=uuid4(),
+        name="Workout",
+        duration_seconds=duration_seconds,
+        remaining_seconds=remaining_seconds,
+        started_at=now,
+        paused_at=None,
+        reset_count=0,
+        status=TimerStatus.running,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def tick_case() -> Callable[[], object]:
+    """Build a full tick_timer call against an in-memory SQLite repo."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    service = TimerService(TimerRepo(db))
+    # Long enough that the timer never expires while being measured.
+    timer = service.create_timer(10**9)
+    service.start_timer(timer.id)
+    return lambda: service.tick_timer(timer.id)
+
+
+def run_cases(iterations: int = 2000) -> list[BenchResult]:
+    """Run every benchmark case."""
+    service = TimerService(repo=None)
+    timer = make_timer()
+    timer_dict = timer.to_dict()
+    urgency = {
+        "urgency_level": service._calculate_urgency(timer),
+        "remaining_seconds": timer.remaining_seconds,
+        "duration_seconds": timer.duration_seconds,
+        "intensity_percent": 66.7,
+    }
+
+    counter = Counter("bench_total", "Benchmark counter.", ("repo", "method"))
+    histogram = Histogram("bench_seconds", "Benchmark histogram.", ("method", "route", "status"))
+    # Keep the benchmark metrics out of any later scrape in this process.
+    REGISTRY.remove(counter)
+    REGISTRY.remove(histogram)
+
+    authenticator = Authenticator("bench-secret")
+    token = issue_token("bench-user", "bench-secret")
+
+    cases = {
+        "calculate_urgency": lambda: service._calculate_urgency(timer),
+        "calculate_urgency_response": lambda: service.calculate_urgency_response(timer),
+        "timer_to_dict": timer.to_dict,
+        "timer_response_validate": lambda: TimerResponse.model_validate(timer_dict),
+        "urgency_response_validate": lambda: UrgencyResponse.model_validate(urgency),
+        "metrics_counter_inc": lambda: counter.inc(("TimerRepo", "get_timer")),
+        "metrics_histogram_observe": lambda: histogram.observe(0.0042, ("GET", "/api/timer", "200")),
+        "authenticate_cached": lambda: authenticator.authenticate(token),
+    }
+    results = [measure(name, fn, iterations) for name, fn in cases.items()]
+    # Each tick is a round trip through the ORM, so fewer iterations suffice.
+    results.append(measure("tick_timer", tick_case(), max(1, iterations // 10)))
+    return results
+
+
+def compare_to_baseline(
+    results: list[BenchResult],
+    baseline: dict,
+    threshold: float,
+    calibration_ns: Optional[float] = None,
+) -> list[str]:
+    """Return a message for each case whose time or allocations regressed.
+
+    Timings are scaled by the ratio of the baseline's calibration to
+    ``calibration_ns``; without both they are not compared at all.
+    """
+    regressions = []
+    scale = None
+    if calibration_ns and baseline.get("calibration_ns"):
+        scale = baseline["calibration_ns"] / calibration_ns
+    for result in results:
+        previous = baseline.get("cases", {}).get(result.name)
+        if not previous:
+            continue
+        for field, unit in (("ns_per_call", "ns"), ("bytes_per_call", "B")):
+            before, after = previous[field], getattr(result, field)
+            if field == "ns_per_call":
+                if scale is None:
+                    continue
+                after = round(after * scale, 1)
+            if before and after / before - 1 > threshold:
+                regressions.append(
+                    f"{result.name}: {field} {before}{unit} -> {after}{unit} (+{after / before - 1:.0%})"
+                )
+    return regressions
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.5, help="allowed growth")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--fail-on-regression", action="store_true", help="exit non-zero when a case regresses"
+    )
+    args = parser.parse_args(argv)
+
+    calibration_ns = calibrate(args.iterations)
+    results = run_cases(args.iterations)
+    print(f"{'calibration':<28} {calibration_ns:>12.1f} ns/call")
+    for result in results:
+        print(f"{result.name:<28} {result.ns_per_call:>12.1f} ns/call {result.bytes_per_call:>8} B/call")
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "environment": environment(),
+            "calibration_ns": calibration_ns,
+            "cases": {result.name: asdict(result) for result in results},
+        }
+        args.baseline.write_text(json.dumps(payload, indent=2) + "\n")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --update-baseline", file=sys.stderr)
+        return 0
+    regressions = compare_to_baseline(
+        results, json.loads(args.baseline.read_text()), args.threshold, calibration_ns
+    )
+    for message in regressions:
+        print(f"REGRESSION {message}", file=sys.stderr)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
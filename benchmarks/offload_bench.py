@@ -0,0 +1,67 @@
+"""Compare loop-blocking and offloaded repository calls under load.
+
+Runs the load test twice against the same emulated database latency: once
+with repository calls on the event loop and once on the repository thread
+pool, and reports throughput and p95 for both.
+
+    python -m benchmarks.offload_bench --threads 8 --db-latency-ms 2
+"""
+import argparse
+import asyncio
+import sys
+from typing import Optional
+
+from benchmarks.harness import environment, write_results
+from benchmarks.load_test import run_load
+
+
+async def compare_modes(
+    pollers: int, commanders: int, duration: float, threads: int, db_latency_ms: float
+) -> dict:
+    """Run both modes and summarize them side by side."""
+    modes = {}
+    for name, offload_threads in (("loop", 0), ("offload", threads)):
+        results = await run_load(
+            pollers, commanders, duration, offload_threads=offload_threads, db_latency_ms=db_latency_ms
+        )
+        modes[name] = {
+            "throughput_rps": results["throughput_rps"],
+            "p95_ms": results["latency"]["p95_ms"],
+            "p99_ms": results["latency"]["p99_ms"],
+            "server_errors": results["server_errors"],
+        }
+    loop_rps = modes["loop"]["throughput_rps"]
+    return {
+        "environment": environment(),
+        "config": {
+            "pollers": pollers,
+            "commanders": commanders,
+            "duration_seconds": duration,
+            "threads": threads,
+            "db_latency_ms": db_latency_ms,
+        },
+        "modes": modes,
+        "speedup": round(modes["offload"]["throughput_rps"] / loop_rps, 2) if loop_rps else None,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pollers", type=int, default=100)
+    parser.add_argument("--commanders", type=int, default=5)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="emulated round trip")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        compare_modes(args.pollers, args.commanders, args.duration, args.threads, args.db_latency_ms)
+    )
+    write_results(results, args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
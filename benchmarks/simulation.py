@@ -0,0 +1,379 @@
+"""Deterministic virtual-clock simulation of many timers.
+
+Drives ``TimerService`` with a ``ManualClock`` and an in-memory repository.
+Scripted start/pause/reset commands and countdown ticks are queued on a
+``DeadlineScheduler`` and the clock jumps straight to the next deadline, so
+hours of simulated time for thousands of timers run in seconds:
+
+    python -m benchmarks.simulation --timers 10000 --hours 4 --seed 1
+
+Ticks are only scheduled at urgency boundaries and at expiry, which is all
+a client can observe. Every transition is checked against the timer
+invariants; the run fails when any is violated. The report doubles as a
+capacity estimate: events written and the busiest second of deadlines.
+"""
+import argparse
+import itertools
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, Iterator, List, Optional
+from uuid import UUID
+
+from app.models.timer import Timer
+from app.schemas.timer import TimerStatus, UrgencyLevel
+from app.services.clock import ManualClock
+from app.services.scheduler import DeadlineScheduler
+from app.services.timer_service import TimerService
+
+
+SIMULATION_START = datetime(2024, 1, 1)
+DURATIONS = (30, 60, 90, 300, 600, 1200, 1800, 3600)
+# Relative weights of scripted commands.
+OPERATIONS = (("start", 4), ("pause", 3), ("reset", 2))
+
+
+class MemoryTimerRepo:
+    """The parts of ``TimerRepo`` that ``TimerService`` uses, kept in memory.
+
+    Events are not retained; each is handed to ``on_event`` and counted, so
+    long simulations run in memory proportional to the number of timers.
+    """
+
+    def __init__(self, clock: ManualClock, on_event: Optional[Callable[[Timer, str], None]] = None):
+        """Initialize an empty repository on a virtual clock."""
+        self.clock = clock
+        self.on_event = on_event
+        self.timers: dict[UUID, Timer] = {}
+        self.event_counts: Counter[str] = Counter()
+
+    def create_timer(self, duration_seconds: int, name: str = "Workout") -> Timer:
+        """Create a new timer."""
+        now = self.clock.now()
+        timer = Timer(
+            id=UUID(int=len(self.timers) + 1),
+            name=name,
+            duration_seconds=duration_seconds,
+            remaining_seconds=duration_seconds,
+            status=TimerStatus.stopped.value,
+            reset_count=0,
+            created_at=now,
+            updated_at=now,
+        )
+        self.timers[timer.id] = timer
+        return timer
+
+    def get_timer(self, timer_id: UUID) -> Optional[Timer]:
+        """Fetch timer by ID."""
+        return self.timers.get(timer_id)
+
+    def get_timers(self, timer_ids: Iterable[UUID]) -> List[Timer]:
+        """Fetch many timers."""
+        return [self.timers[i] for i in timer_ids if i in self.timers]
+
+    def get_active_timer(self) -> Optional[Timer]:
+        """Fetch the most recently created timer."""
+        return next(reversed(self.timers.values()), None)
+
+    def update_timer(
+        self,
+        timer_id: UUID,
+        remaining_seconds: int,
+        status: str,
+        started_at=None,
+        paused_at=None,
+        reset_count: Optional[int] = None,
+    ) -> Optional[Timer]:
+        """Update timer state."""
+        timer = self.timers.get(timer_id)
+        if not timer:
+            return None
+        timer.remaining_seconds = remaining_seconds
+        timer.status = status
+        if started_at is not None:
+            timer.started_at = started_at
+        if paused_at is not None:
+            timer.paused_at = paused_at
+        if reset_count is not None:
+            timer.reset_count = reset_count
+        timer.updated_at = self.clock.now()
+        return timer
+
+    def record_event(
+        self,
+        timer_id: UUID,
+        event_type: str,
+        urgency_level: int = 0,
+        remaining_seconds: Optional[int] = None,
+        duration_seconds: Optional[int] = None,
+    ) -> None:
+        """Count the event and pass it to ``on_event``."""
+        self.event_counts[event_type] += 1
+        if self.on_event:
+            self.on_event(self.timers[timer_id], event_type)
+
+
+def seconds_to_urgency_change(remaining: int, duration: int) -> int:
+    """Seconds of countdown until the urgency level changes, or until expiry."""
+    level = UrgencyLevel.from_ratio(remaining, duration)
+    # Urgency only rises as remaining falls: find the highest remaining
+    # value with a different level.
+    low, high = 0, remaining
+    if UrgencyLevel.from_ratio(low, duration) == level:
+        return remaining
+    while high - low > 1:
+        middle = (low + high) // 2
+        if UrgencyLevel.from_ratio(middle, duration) == level:
+            high = middle
+        else:
+            low = middle
+    return remaining - low
+
+
+def scripted_commands(rng: random.Random, mean_gap_seconds: float) -> Iterator[tuple[int, str]]:
+    """Endless ``(gap_seconds, op)`` script for one timer, starting with a start."""
+    names = [name for name, _ in OPERATIONS]
+    cum_weights = list(itertools.accumulate(weight for _, weight in OPERATIONS))
+    rate = 1 / mean_gap_seconds
+    yield 1 + int(rng.expovariate(rate)), "start"
+    while True:
+        yield 1 + int(rng.expovariate(rate)), rng.choices(names, cum_weights=cum_weights)[0]
+
+
+@dataclass
+class TimerTrack:
+    """Simulation bookkeeping for one timer."""
+    timer_id: UUID
+    script: Iterator[tuple[int, str]]
+    # Monotonic second the countdown was last applied, while running
+    ticked_at: int = 0
+    # Urgency and expiry since the last reset
+    urgency: int = 0
+    expired_events: int = 0
+    expires_at: Optional[int] = None
+
+
+@dataclass
+class SimulationReport:
+    """Outcome of a simulation run."""
+    timers: int
+    simulated_seconds: int
+    wall_seconds: float
+    speedup: float
+    commands: dict[str, int]
+    rejected_commands: int
+    ticks: int
+    events: dict[str, int]
+    final_status: dict[str, int]
+    peak_running: int
+    busiest_second_deadlines: int
+    violations: list[str] = field(default_factory=list)
+
+
+class Simulation:
+    """Fast-forwards scripted workloads against the real timer state machine."""
+
+    MAX_VIOLATIONS = 100
+
+    def __init__(self, timers: int, seed: int = 0, mean_gap_seconds: float = 300.0):
+        """Create ``timers`` timers with durations and scripts drawn from ``seed``."""
+        self.clock = ManualClock(SIMULATION_START)
+        self.repo = MemoryTimerRepo(self.clock, on_event=self._check_event)
+        self.service = TimerService(self.repo, self.clock)
+        self.scheduler = DeadlineScheduler(self.clock)
+        self.violations: list[str] = []
+        self.commands: Counter[str] = Counter()
+        self.rejected = 0
+        self.ticks = 0
+        self.running = 0
+        self.peak_running = 0
+        self.deadlines_per_second: Counter[int] = Counter()
+
+        rng = random.Random(seed)
+        self.tracks: dict[UUID, TimerTrack] = {}
+        for _ in range(timers):
+            timer = self.repo.create_timer(rng.choice(DURATIONS))
+            script = scripted_commands(random.Random(rng.getrandbits(64)), mean_gap_seconds)
+            track = self.tracks[timer.id] = TimerTrack(timer.id, script)
+            self._schedule_next_command(track)
+
+    def now(self) -> int:
+        """Current simulated second."""
+        return int(self.clock.monotonic())
+
+    def _at(self, seconds: int) -> datetime:
+        return self.clock.now() + timedelta(seconds=seconds)
+
+    def _violation(self, timer: Timer, message: str) -> None:
+        if len(self.violations) < self.MAX_VIOLATIONS:
+            self.violations.append(f"t={self.now()}s timer {timer.id.int}: {message}")
+
+    def _check_state(self, timer: Timer, track: TimerTrack) -> None:
+        """Invariants that hold after every transition and tick."""
+        if not 0 <= timer.remaining_seconds <= timer.duration_seconds:
+            self._violation(timer, f"remaining {timer.remaining_seconds} outside 0..{timer.duration_seconds}")
+        urgency = int(UrgencyLevel.from_ratio(timer.remaining_seconds, timer.duration_seconds))
+        if urgency < track.urgency:
+            self._violation(timer, f"urgency fell from {track.urgency} to {urgency} without a reset")
+        track.urgency = urgency
+        if (timer.status == TimerStatus.expired) != (timer.remaining_seconds == 0):
+            self._violation(timer, f"status {timer.status} with {timer.remaining_seconds}s remaining")
+
+    def _check_event(self, timer: Timer, event_type: str) -> None:
+        """Invariants on the event stream, checked as events are recorded."""
+        track = self.tracks.get(timer.id)
+        if track is None:
+            return
+        if event_type == "reset":
+            track.urgency = 0
+            track.expired_events = 0
+        elif event_type == "expired":
+            track.expired_events += 1
+            if track.expired_events > 1:
+                self._violation(timer, "expired twice in one countdown")
+            if track.expires_at != self.now():
+                self._violation(timer, f"expired at {self.now()}s, due at {track.expires_at}s")
+
+    def _schedule_next_command(self, track: TimerTrack) -> None:
+        gap, op = next(track.script)
+        self.scheduler.schedule(
+            ("command", track.timer_id), self._at(gap), lambda key, _: self._run_command(key[1], op)
+        )
+
+    def _schedule_tick(self, timer: Timer) -> None:
+        gap = seconds_to_urgency_change(timer.remaining_seconds, timer.duration_seconds)
+        self.scheduler.schedule(("tick", timer.id), self._at(gap), lambda key, _: self._tick(key[1]))
+
+    def _apply_countdown(self, timer: Timer, track: TimerTrack) -> Timer:
+        """Tick a running timer by the time since its countdown was last applied."""
+        elapsed = self.now() - track.ticked_at
+        track.ticked_at = self.now()
+        if elapsed <= 0:
+            return timer
+        self.ticks += 1
+        timer = self.service.tick_timer(timer.id, elapsed)
+        self._check_state(timer, track)
+        if timer.status == TimerStatus.expired:
+            self._set_running(-1)
+        return timer
+
+    def _set_running(self, delta: int) -> None:
+        self.running += delta
+        self.peak_running = max(self.peak_running, self.running)
+
+    def _tick(self, timer_id: UUID) -> None:
+        timer = self.repo.get_timer(timer_id)
+        track = self.tracks[timer_id]
+        if timer.status != TimerStatus.running:
+            # A command due in the same second already stopped the countdown.
+            return
+        timer = self._apply_countdown(timer, track)
+        if timer.status != TimerStatus.running:
+            return
+        if self.now() >= track.expires_at:
+            self._violation(timer, f"still running at {self.now()}s, due at {track.expires_at}s")
+            return
+        self._schedule_tick(timer)
+
+    def _run_command(self, timer_id: UUID, op: str) -> None:
+        """Apply one scripted command with the same guards as the API."""
+        timer = self.repo.get_timer(timer_id)
+        track = self.tracks[timer_id]
+        self.commands[op] += 1
+        was_running = timer.status == TimerStatus.running
+
+        if op == "start" and timer.status not in (TimerStatus.expired, TimerStatus.running):
+            timer = self.service.start_timer(timer_id)
+            track.ticked_at = self.now()
+            track.expires_at = self.now() + timer.remaining_seconds
+            self._set_running(1)
+            self._schedule_tick(timer)
+        elif op == "pause" and was_running:
+            timer = self._apply_countdown(timer, track)
+            if timer.status == TimerStatus.running:
+                timer = self.service.pause_timer(timer_id)
+                self._set_running(-1)
+            self.scheduler.cancel(("tick", timer_id))
+        elif op == "reset":
+            if was_running:
+                self._set_running(-1)
+                self.scheduler.cancel(("tick", timer_id))
+            timer = self.service.reset_timer(timer_id)
+            track.expires_at = None
+        else:
+            self.rejected += 1
+
+        self._check_state(timer, track)
+        self._schedule_next_command(track)
+
+    def run(self, seconds: int) -> SimulationReport:
+        """Advance the clock by ``seconds``, dispatching every deadline on the way."""
+        started = time.perf_counter()
+        end = self.clock.now() + timedelta(seconds=seconds)
+        while True:
+            deadline = self.scheduler.next_deadline()
+            if deadline is None or deadline > end:
+                break
+            self.clock.advance((deadline - self.clock.now()).total_seconds())
+            due = self.scheduler.pop_due()
+            self.deadlines_per_second[self.now()] += len(due)
+            for key, deadline, callback in due:
+                if self.scheduler.claim(key):
+                    callback(key, deadline)
+        self.clock.advance((end - self.clock.now()).total_seconds())
+        wall = time.perf_counter() - started
+
+        for timer in self.repo.timers.values():
+            track = self.tracks[timer.id]
+            expected = 1 if timer.status == TimerStatus.expired else 0
+            if track.expired_events != expected:
+                self._violation(timer, f"{track.expired_events} expired events while {timer.status}")
+
+        return SimulationReport(
+            timers=len(self.tracks),
+            simulated_seconds=seconds,
+            wall_seconds=round(wall, 3),
+            speedup=round(seconds / wall) if wall else 0.0,
+            commands=dict(self.commands),
+            rejected_commands=self.rejected,
+            ticks=self.ticks,
+            events=dict(self.repo.event_counts),
+            final_status=dict(Counter(timer.status for timer in self.repo.timers.values())),
+            peak_running=self.peak_running,
+            busiest_second_deadlines=max(self.deadlines_per_second.values(), default=0),
+            violations=list(self.violations),
+        )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=10000)
+    parser.add_argument("--hours", type=float, default=4.0, help="simulated time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mean-gap", type=float, default=300.0, help="seconds between scripted commands")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    from benchmarks.harness import environment, write_results
+
+    simulation = Simulation(args.timers, args.seed, args.mean_gap)
+    report = simulation.run(int(args.hours * 3600))
+    write_results(
+        {
+            "environment": environment(),
+            "config": {"seed": args.seed, "mean_gap_seconds": args.mean_gap},
+            "report": asdict(report),
+        },
+        args.output,
+    )
+    for violation in report.violations:
+        print(f"VIOLATION {violation}", file=sys.stderr)
+    return 1 if report.violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Cold start benchmark: import time and time to first request.
+
+Starts fresh worker processes in each schema mode (``create_all`` and the
+Alembic ``migrations`` check) and reports median import time, lifespan
+startup time and time from process spawn to the first answered request.
+
+    python -m benchmarks.startup_bench --runs 5
+
+By default a temporary SQLite database stands in for Postgres; pass
+``--database-url`` to measure catalog round trips against a real server.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Optional
+
+# Children run this module before timing the app import, so nothing that
+# imports the app (including benchmarks.harness) is imported at module level.
+
+MODES = ("create_all", "migrations")
+
+
+def child() -> None:
+    """Measure one cold start inside a fresh interpreter."""
+    spawned_at = float(os.environ["BENCH_SPAWNED_AT"])
+    started = time.perf_counter()
+    from app.main import app
+    imported = time.perf_counter()
+
+    from httpx import ASGITransport, AsyncClient
+
+    async def first_request() -> dict:
+        async with app.router.lifespan_context(app):
+            ready = time.perf_counter()
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+                response = await client.get("/api/timer")
+                response.raise_for_status()
+            answered = time.perf_counter()
+            first_response_at = time.time()
+        return {
+            "import_ms": (imported - started) * 1000,
+            "startup_ms": (ready - imported) * 1000,
+            "first_request_ms": (answered - ready) * 1000,
+            "spawn_to_first_response_ms": (first_response_at - spawned_at) * 1000,
+        }
+
+    print(json.dumps(asyncio.run(first_request())), flush=True)
+    # Database driver threads can outlive the loop; the measurement is done.
+    os._exit(0)
+
+
+def prepare_schema(env: dict) -> None:
+    """Create the schema and stamp it at the Alembic head."""
+    script = (
+        "import asyncio\n"
+        "from alembic import command\n"
+        "from alembic.config import Config\n"
+        "from app.database import init_db, close_db\n"
+        "async def main():\n"
+        "    await init_db()\n"
+        "    await close_db()\n"
+        "asyncio.run(main())\n"
+        "command.stamp(Config('alembic.ini'), 'head')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], env=env, check=True, capture_output=True)
+
+
+def run_child(env: dict) -> dict:
+    """Spawn one worker and return its measurements."""
+    env = {**env, "BENCH_SPAWNED_AT": repr(time.time())}
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup_bench", "--child"],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def run_startup(runs: int, database_url: Optional[str] = None) -> dict:
+    """Measure cold starts in each schema mode."""
+    from benchmarks.harness import environment
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {
+            **os.environ,
+            "DATABASE_URL": database_url or f"sqlite+aiosqlite:///{os.path.join(tmpdir, 'bench.db')}",
+            "SNAPSHOT_PATH": os.path.join(tmpdir, "snapshot.bin"),
+        }
+        prepare_schema(env)
+
+        modes = {}
+        for mode in MODES:
+            samples = [run_child({**env, "SCHEMA_MODE": mode}) for _ in range(runs)]
+            modes[mode] = {
+                key: round(statistics.median(sample[key] for sample in samples), 1)
+                for key in samples[0]
+            }
+
+    return {
+        "environment": environment(),
+        "config": {"runs": runs, "database": "custom" if database_url else "sqlite"},
+        "modes": modes,
+    }
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--database-url", help="async SQLAlchemy URL (default: temporary SQLite)")
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        child()
+        return 0
+
+    from benchmarks.harness import write_results
+
+    write_results(run_startup(args.runs, args.database_url), args.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
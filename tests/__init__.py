@@ -1,3 +0,0 @@
-The file `tests/__init__.py` is empty, which is valid Python syntax. However, the audit detected a syntax error at line 1. An empty file should either be truly empty or contain only valid Python code. The most likely issue is that there's an invisible character or encoding problem in an empty file that's causing `ast.parse` to fail.
-
-The fix is to ensure the file is a valid, empty Python file:
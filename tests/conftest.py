@@ -6,6 +6,7 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from app.main import app
 from app.database import Base, get_session
 from app.config import get_settings
+from app.services.rate_limit import set_rate_limiting
 
 
 @pytest.fixture(scope="session")
@@ -62,11 +63,13 @@ async def client(test_db_session):
         yield test_db_session
     
     app.dependency_overrides[get_session] = override_get_session
+    set_rate_limiting(False)
     
     async with AsyncClient(app=app, base_url="http://test") as async_client:
         yield async_client
     
     app.dependency_overrides.clear()
+    set_rate_limiting(get_settings().rate_limit_enabled)
 
 
 @pytest.fixture
@@ -0,0 +1,126 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.repos.timer_repo import TimerRepo
+from app.routers import timer as timer_router
+from app.services import auth
+from app.services.auth import Authenticator, issue_token, owner_key, sign_claims, verify_token
+from benchmarks.harness import app_client, stand_in_engine
+
+
+SECRET = "test-secret"
+NOW = 1_700_000_000.0
+
+
+class TestVerifyToken:
+    """Test HS256 token verification."""
+
+    def test_round_trip(self):
+        """A token signed with the secret yields its subject."""
+        principal = verify_token(issue_token("alice", SECRET, 60, now=NOW), SECRET, NOW)
+        assert principal.subject == "alice"
+        assert principal.owner_key == owner_key("alice")
+        assert principal.expires_at == NOW + 60
+
+    @pytest.mark.parametrize(
+        "token, message",
+        [
+            (issue_token("alice", "other-secret", 60, now=NOW), "Invalid token signature"),
+            (issue_token("alice", SECRET, -1, now=NOW), "Token expired"),
+            ("not-a-token", "Malformed token"),
+            (sign_claims({"sub": "alice"}, SECRET), "Token has no valid expiry"),
+            (sign_claims({"sub": "alice", "exp": "never"}, SECRET), "Token has no valid expiry"),
+            (sign_claims({"sub": "alice", "exp": NOW + 60, "nbf": "soon"}, SECRET), "invalid not-before"),
+        ],
+    )
+    def test_rejections(self, token, message):
+        with pytest.raises(ValueError, match=message):
+            verify_token(token, SECRET, NOW)
+
+
+class TestAuthenticator:
+    """Test the verified-token cache."""
+
+    def test_cached_tokens_skip_verification(self, monkeypatch):
+        """Only the first use of a token pays for the signature check."""
+        calls = []
+        monkeypatch.setattr(auth, "verify_token", lambda *args: calls.append(args) or verify_token(*args))
+        authenticator = Authenticator(SECRET, time_source=lambda: NOW)
+        token = issue_token("alice", SECRET, 60, now=NOW)
+
+        for _ in range(5):
+            assert authenticator.authenticate(token).subject == "alice"
+        assert len(calls) == 1
+
+    def test_cached_token_expires(self):
+        """A cached token is rejected once its exp passes."""
+        now = [NOW]
+        authenticator = Authenticator(SECRET, time_source=lambda: now[0])
+        token = issue_token("alice", SECRET, 60, now=NOW)
+        authenticator.authenticate(token)
+
+        now[0] += 61
+        with pytest.raises(ValueError, match="Token expired"):
+            authenticator.authenticate(token)
+        assert len(authenticator) == 0
+
+    def test_capacity_evicts_least_recently_used(self):
+        """The cache never grows past its capacity."""
+        authenticator = Authenticator(SECRET, max_entries=2, time_source=lambda: NOW)
+        tokens = [issue_token(name, SECRET, 60, now=NOW) for name in ("a", "b", "c")]
+        for token in tokens:
+            authenticator.authenticate(token)
+        assert len(authenticator) == 2
+
+
+class TestOwnerScoping:
+    """Test that timers are scoped to their owner."""
+
+    def test_repo_only_sees_owned_timers(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine, expire_on_commit=False)()
+        alice, bob = TimerRepo(db, "alice"), TimerRepo(db, "bob")
+
+        timer = alice.create_timer(60)
+
+        assert timer.owner_id == "alice"
+        assert alice.get_timer(timer.id) is not None
+        assert bob.get_timer(timer.id) is None
+        assert bob.get_active_timer() is None
+        assert bob.get_timers([timer.id]) == []
+
+    @pytest.mark.asyncio
+    async def test_routes_require_token_and_scope_timers(self, monkeypatch):
+        """Each user drives their own active timer; batches cannot touch others'."""
+        monkeypatch.setattr(timer_router.settings, "auth_enabled", True)
+        alice = {"Authorization": f"Bearer {issue_token('alice', timer_router.settings.jwt_secret)}"}
+        bob = {"Authorization": f"Bearer {issue_token('bob', timer_router.settings.jwt_secret)}"}
+
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            assert (await client.get("/api/timer")).status_code == 401
+
+            created = await client.post("/api/timer", json={"duration": 90, "name": "A"}, headers=alice)
+            timer_id = created.json()["id"]
+            assert (await client.get("/api/timer", headers=bob)).json()["id"] != timer_id
+            assert (await client.get("/api/timer", headers=alice)).json()["id"] == timer_id
+
+            results = await client.post(
+                "/api/timers/batch", json=[{"id": timer_id, "op": "start"}], headers=bob
+            )
+            assert results.json()[0] == {
+                "id": timer_id, "op": "start", "ok": False, "error": "Timer not found", "timer": None,
+            }
+
+    @pytest.mark.asyncio
+    async def test_malformed_time_claims_are_unauthorized(self, monkeypatch):
+        """Tokens without a numeric exp get the usual 401 rather than a server error."""
+        monkeypatch.setattr(timer_router.settings, "auth_enabled", True)
+        secret = timer_router.settings.jwt_secret
+
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            for claims in ({"sub": "alice"}, {"sub": "alice", "exp": "tomorrow"}):
+                headers = {"Authorization": f"Bearer {sign_claims(claims, secret)}"}
+                assert (await client.get("/api/timer", headers=headers)).status_code == 401
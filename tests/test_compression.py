@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import JSONResponse, StreamingResponse
+
+from app.middleware import CompressionMiddleware
+from app.middleware.compression import negotiate_encoding
+
+
+def make_app(size: int):
+    """ASGI app returning a JSON list of roughly ``size`` bytes."""
+
+    async def app(scope, receive, send):
+        await JSONResponse(["x" * 8] * (size // 11))(scope, receive, send)
+
+    return CompressionMiddleware(app, minimum_size=1024)
+
+
+async def fetch(app, accept_encoding: str):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get("/", headers={"Accept-Encoding": accept_encoding})
+
+
+class TestCompression:
+    """Test response compression negotiation."""
+
+    def test_negotiate_prefers_brotli(self):
+        """Brotli wins when both are accepted; q=0 excludes an encoding."""
+        assert negotiate_encoding("gzip, deflate, br") == "br"
+        assert negotiate_encoding("br;q=0, gzip") == "gzip"
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("*") == "br"
+
+    @pytest.mark.asyncio
+    async def test_large_body_is_compressed(self):
+        """Bodies over the minimum size are compressed with the negotiated encoding."""
+        response = await fetch(make_app(5000), "br")
+        assert response.headers["content-encoding"] == "br"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < 5000
+        assert response.json()[0] == "x" * 8
+
+        response = await fetch(make_app(5000), "gzip")
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.asyncio
+    async def test_small_body_passes_through(self):
+        """Polling-sized bodies skip compression."""
+        response = await fetch(make_app(200), "gzip, br")
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_streaming_body_is_forwarded_as_produced(self):
+        """Streams are neither buffered nor compressed, so chunks reach the client as they come."""
+        sent = []
+
+        async def chunks():
+            for _ in range(3):
+                yield b"x" * 2000
+                sent.append(len(received))
+
+        async def app(scope, receive, send):
+            await StreamingResponse(chunks(), media_type="text/plain")(scope, receive, send)
+
+        received = []
+
+        async def record(message):
+            received.append(message)
+
+        async def connected():
+            await asyncio.Event().wait()
+
+        scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"br")]}
+        await CompressionMiddleware(app, minimum_size=1024)(scope, connected, record)
+
+        # The start and the first chunk were sent before the second chunk was produced.
+        assert sent[0] >= 2
+        headers = dict(received[0]["headers"])
+        assert b"content-encoding" not in headers
+        assert b"".join(m.get("body", b"") for m in received[1:]) == b"x" * 6000
@@ -0,0 +1,222 @@
+import socket
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.routers import timer as timer_router
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.clock import ManualClock
+from app.services.degraded import (
+    CommandJournal,
+    JournalFull,
+    JournaledCommand,
+    LastKnownStates,
+    command_journal,
+    db_breaker,
+)
+from benchmarks.harness import app_client, stand_in_engine
+
+
+def operational_error():
+    return sa.exc.OperationalError("SELECT 1", {}, ConnectionRefusedError())
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions."""
+
+    def test_opens_after_threshold_and_half_opens_after_timeout(self):
+        clock = ManualClock(datetime(2024, 1, 1))
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout_seconds=5, clock=clock)
+
+        breaker.record_failure()
+        assert breaker.allow()
+        breaker.record_failure()
+        assert not breaker.allow()
+        assert breaker.retry_after_seconds() == 5
+
+        clock.advance(5)
+        assert breaker.allow()
+        assert not breaker.allow(), "only one half-open trial at a time"
+        breaker.record_success()
+        assert breaker.closed
+
+    def test_failed_trial_reopens(self):
+        clock = ManualClock(datetime(2024, 1, 1))
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=5, clock=clock)
+        breaker.record_failure()
+        clock.advance(5)
+        assert breaker.allow()
+
+        breaker.record_failure()
+
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+
+class TestLastKnownStates:
+    """Test the outage read fallback."""
+
+    def test_command_state_replaces_older_reads(self):
+        clock = ManualClock(datetime(2024, 1, 1))
+        states = LastKnownStates(clock=clock)
+        states.remember("urgency", "alice", {"urgency_level": "calm"})
+        clock.advance(3)
+        states.replace("state", "alice", {"status": "paused"})
+
+        assert states.get("urgency", "alice") is None
+        known = states.get("state", "alice")
+        assert known.state == {"status": "paused"}
+        clock.advance(2)
+        assert states.age_seconds(known) == 2
+
+    def test_bounded_by_owner(self):
+        states = LastKnownStates(max_entries=2)
+        for owner in ("a", "b", "c"):
+            states.remember("state", owner, {})
+        assert states.get("state", "a") is None
+        assert states.get("state", "c") is not None
+
+
+class TestCommandJournal:
+    """Test in-order replay of queued commands."""
+
+    @pytest.mark.asyncio
+    async def test_replays_in_order_and_drops_rejected(self):
+        journal = CommandJournal(CircuitBreaker(), max_entries=10, interval_seconds=1)
+        for description in ("configure", "pause", "resume"):
+            journal.append(JournaledCommand(None, description, None))
+        applied = []
+
+        async def run(command):
+            if command.description == "pause":
+                raise ValueError("Timer is not running")
+            applied.append(command.description)
+
+        assert await journal.replay(run) == 2
+        assert applied == ["configure", "resume"]
+        assert len(journal) == 0
+
+    @pytest.mark.asyncio
+    async def test_stops_while_database_is_down(self):
+        breaker = CircuitBreaker(failure_threshold=1)
+        journal = CommandJournal(breaker, max_entries=2, interval_seconds=1)
+        journal.append(JournaledCommand(None, "reset", None))
+        journal.append(JournaledCommand(None, "pause", None))
+        with pytest.raises(JournalFull):
+            journal.append(JournaledCommand(None, "resume", None))
+
+        async def run(command):
+            raise operational_error()
+
+        assert await journal.replay(run) == 0
+        assert len(journal) == 2
+        assert not breaker.allow()
+
+
+@pytest_asyncio.fixture
+async def client(monkeypatch):
+    """App client whose journal replays against the same stand-in database."""
+    async with stand_in_engine() as engine, app_client(engine) as client:
+        monkeypatch.setattr(
+            timer_router,
+            "async_session_factory",
+            async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+        )
+        try:
+            yield client
+        finally:
+            db_breaker.record_success()
+            command_journal._entries.clear()
+
+
+def trip_breaker():
+    for _ in range(db_breaker.failure_threshold):
+        db_breaker.record_failure()
+
+
+class TestDegradedRoutes:
+    """Test the timer routes while the database breaker is open."""
+
+    @pytest.mark.asyncio
+    async def test_reads_serve_last_known_state(self, client):
+        created = (await client.post("/api/timer", json={"duration": 90})).json()
+        trip_breaker()
+
+        stale = await client.get("/api/timer")
+        assert stale.status_code == 200
+        assert stale.json()["id"] == created["id"]
+        assert stale.headers["X-Degraded"] == "read-only"
+        assert stale.headers["Age"] == "0"
+
+        never_read = await client.get("/api/urgency")
+        assert never_read.status_code == 503
+        assert int(never_read.headers["Retry-After"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_commands_queue_and_replay_in_order(self, client):
+        await client.post("/api/timer", json={"duration": 90})
+        trip_breaker()
+
+        queued = await client.post("/api/timer/reset")
+        assert queued.status_code == 202
+        assert queued.json() == {"queued": True, "command": "reset", "position": 1}
+
+        # Still open: later commands queue behind the reset.
+        assert (await client.post("/api/timer/pause")).json()["position"] == 2
+
+        db_breaker.record_success()
+        assert await command_journal.replay(timer_router.run_journaled) == 2
+        state = await client.get("/api/timer")
+        assert state.json()["is_paused"]
+        assert "X-Degraded" not in state.headers
+
+    @pytest.mark.asyncio
+    async def test_command_after_recovery_drains_journal_first(self, client):
+        await client.post("/api/timer", json={"duration": 90})
+        trip_breaker()
+        assert (await client.post("/api/timer/resume")).status_code == 202
+
+        db_breaker.record_success()
+        paused = await client.post("/api/timer/pause")
+
+        assert paused.status_code == 200
+        assert paused.json()["is_paused"]
+        assert len(command_journal) == 0
+
+    @pytest.mark.asyncio
+    async def test_failure_below_threshold_is_not_journaled(self, client, monkeypatch):
+        await client.post("/api/timer", json={"duration": 90})
+
+        def unreachable(db, owner_id=None):
+            raise operational_error()
+
+        monkeypatch.setattr(timer_router, "get_timer_repo", unreachable)
+        for _ in range(db_breaker.failure_threshold - 1):
+            response = await client.post("/api/timer/reset")
+            assert response.status_code == 503
+            assert response.headers["Retry-After"] == "1"
+            assert len(command_journal) == 0
+
+        tripped = await client.post("/api/timer/reset")
+        assert tripped.status_code == 202
+        assert db_breaker.state == CircuitBreaker.OPEN
+
+    @pytest.mark.asyncio
+    async def test_unexpected_errors_do_not_reset_the_breaker(self, client, monkeypatch):
+        await client.post("/api/timer", json={"duration": 90})
+
+        def lookup_fails(db, owner_id=None):
+            raise socket.gaierror(-2, "Name or service not known")
+
+        def bug(db, owner_id=None):
+            raise RuntimeError("bug")
+
+        monkeypatch.setattr(timer_router, "get_timer_repo", lookup_fails)
+        assert (await client.post("/api/timer/reset")).status_code == 503
+        monkeypatch.setattr(timer_router, "get_timer_repo", bug)
+        with pytest.raises(RuntimeError):
+            await client.post("/api/timer/reset")
+        assert db_breaker.failures == 1
@@ -0,0 +1,134 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pyarrow.dataset as ds
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.timer import Timer, TimerEvent
+from app.services.clock import ManualClock
+from app.services.event_export import PartitionWriters, export_events, read_high_water
+
+
+START = datetime(2024, 3, 1, 23, 0, 0)
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Sync SQLite session standing in for the database."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_events(db, timer_id, times):
+    for sequence, recorded_at in enumerate(times, start=1):
+        db.add(
+            TimerEvent(
+                id=uuid.uuid4(),
+                timer_id=timer_id,
+                event_type="started",
+                recorded_at=recorded_at,
+                remaining_seconds=60,
+                duration_seconds=60,
+                sequence=sequence,
+            )
+        )
+    db.commit()
+
+
+def add_timer(db):
+    timer = Timer(duration_seconds=60, remaining_seconds=60)
+    db.add(timer)
+    db.commit()
+    return timer.id
+
+
+def read_export(path):
+    return ds.dataset(path, format="parquet", partitioning="hive").to_table().to_pylist()
+
+
+class TestExportEvents:
+    """Test incremental Parquet export of timer events."""
+
+    def test_partitions_by_day_and_timer(self, db, tmp_path):
+        first, second = add_timer(db), add_timer(db)
+        # Spans midnight, so two days for the first timer.
+        add_events(db, first, [START + timedelta(minutes=30 * i) for i in range(4)])
+        add_events(db, second, [START])
+        output = str(tmp_path / "export")
+        clock = ManualClock(START + timedelta(hours=3))
+
+        report = export_events(db.get_bind(), output, batch_size=2, settle_seconds=60, clock=clock)
+
+        assert report.rows == 5
+        assert sorted(os.listdir(output)) == ["_export_state.json", "day=2024-03-01", "day=2024-03-02"]
+        assert sorted(os.listdir(os.path.join(output, "day=2024-03-01"))) == sorted(
+            [f"timer_id={first}", f"timer_id={second}"]
+        )
+        rows = read_export(output)
+        assert len(rows) == 5
+        assert {row["timer_id"] for row in rows} == {str(first), str(second)}
+        assert read_high_water(output) == clock.now() - timedelta(seconds=60)
+
+    def test_incremental_runs_skip_exported_and_unsettled_rows(self, db, tmp_path):
+        timer_id = add_timer(db)
+        clock = ManualClock(START)
+        add_events(db, timer_id, [START - timedelta(minutes=5), START - timedelta(seconds=10)])
+        output = str(tmp_path / "export")
+
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock).rows == 1
+
+        clock.advance(120)
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock).rows == 1
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock).rows == 0
+        assert len(read_export(output)) == 2
+
+    def test_back_dated_events_within_grace_are_exported_once(self, db, tmp_path):
+        timer_id = add_timer(db)
+        clock = ManualClock(START)
+        add_events(db, timer_id, [START - timedelta(minutes=5)])
+        output = str(tmp_path / "export")
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock, grace_seconds=600).rows == 1
+
+        # A phase boundary committed late, stamped before the high-water mark.
+        late = TimerEvent(
+            id=uuid.uuid4(), timer_id=timer_id, event_type="phase",
+            recorded_at=START - timedelta(minutes=3), sequence=2,
+        )
+        db.add(late)
+        db.commit()
+        clock.advance(120)
+
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock, grace_seconds=600).rows == 1
+        assert export_events(db.get_bind(), output, settle_seconds=60, clock=clock, grace_seconds=600).rows == 0
+        assert sorted(row["id"] for row in read_export(output)) == sorted(
+            str(event.id) for event in db.query(TimerEvent).all()
+        )
+
+    def test_failed_run_leaves_no_files_or_progress(self, db, tmp_path, monkeypatch):
+        timer_id = add_timer(db)
+        add_events(db, timer_id, [START, START + timedelta(days=1)])
+        output = str(tmp_path / "export")
+        write = PartitionWriters.write
+
+        def fail_on_second_day(self, day, *args):
+            if day == "2024-03-02":
+                raise RuntimeError("disk full")
+            write(self, day, *args)
+
+        monkeypatch.setattr(PartitionWriters, "write", fail_on_second_day)
+        with pytest.raises(RuntimeError):
+            export_events(
+                db.get_bind(), output, batch_size=1, clock=ManualClock(START + timedelta(days=2))
+            )
+
+        assert read_high_water(output) is None
+        day = os.path.join(output, "day=2024-03-01", f"timer_id={timer_id}")
+        assert os.listdir(day) == []
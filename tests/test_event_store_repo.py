@@ -0,0 +1,227 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from unittest.mock import Mock
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.timer import Timer, TimerCheckpoint, TimerEvent
+from app.repos.event_store_repo import (
+    STATE_FIELDS,
+    EventSourcedTimerRepo,
+    SequenceConflict,
+    fold_events,
+    retry_on_conflict,
+)
+from app.repos.program_repo import ProgramRepo
+from app.repos.timer_repo import TimerRepo
+from app.schemas.timer import TimerStatus
+from app.services.clock import ManualClock
+from app.services.program_service import ProgramService
+from app.services.timer_service import TimerService
+
+
+@pytest.fixture
+def row():
+    """Create a timer row as stored at creation."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return Timer(
+        id=uuid4(),
+        name="Station",
+        duration_seconds=60,
+        remaining_seconds=60,
+        started_at=None,
+        paused_at=None,
+        reset_count=0,
+        status="stopped",
+        created_at=now,
+        updated_at=now,
+    )
+
+
+@pytest.fixture
+def repo(row):
+    """Create an event-sourced repo tracking the row with a mocked session."""
+    db = Mock()
+    # No webhook subscriptions to stage deliveries for.
+    db.query.return_value.filter.return_value.all.return_value = []
+    repo = EventSourcedTimerRepo(db, checkpoint_interval=3)
+    state = {field: getattr(row, field) for field in STATE_FIELDS}
+    state["sequence"] = 0
+    state["updated_at"] = row.updated_at
+    repo._track(row, state)
+    return repo
+
+
+def event(event_type, sequence, seconds, remaining=None, duration=None):
+    """Build an event at an offset from a fixed start time."""
+    return TimerEvent(
+        event_type=event_type,
+        sequence=sequence,
+        remaining_seconds=remaining,
+        duration_seconds=duration,
+        recorded_at=datetime(2024, 1, 1, 12, 0, 0) + timedelta(seconds=seconds),
+    )
+
+
+class TestFoldEvents:
+    """Tests for rebuilding state from events."""
+
+    def test_fold_transitions(self):
+        """Test each transition type updates the folded state."""
+        state = {
+            "duration_seconds": 60,
+            "remaining_seconds": 60,
+            "started_at": None,
+            "paused_at": None,
+            "reset_count": 0,
+            "status": "stopped",
+            "sequence": 0,
+        }
+
+        fold_events(state, [
+            event("started", 1, 0, 60, 60),
+            event("paused", 2, 20, 40, 60),
+            event("reset", 3, 30, 90, 90),
+        ])
+
+        assert state["status"] == TimerStatus.stopped
+        assert state["remaining_seconds"] == 90
+        assert state["duration_seconds"] == 90
+        assert state["reset_count"] == 1
+        assert state["started_at"] is None
+        assert state["sequence"] == 3
+
+    def test_fold_expired_and_tick(self):
+        """Test ticks carry remaining time and expiry zeroes it."""
+        state = {"remaining_seconds": 60, "status": "running", "reset_count": 0}
+
+        fold_events(state, [event("tick", 4, 10, 50)])
+        assert state["remaining_seconds"] == 50
+        assert state["status"] == "running"
+
+        fold_events(state, [event("expired", 5, 60, 0)])
+        assert state["status"] == TimerStatus.expired
+        assert state["remaining_seconds"] == 0
+
+
+class TestEventSourcedTimerRepo:
+    """Tests for append-only writes."""
+
+    def test_transition_appends_without_update(self, repo, row):
+        """Test a transition stages state and appends one sequenced event."""
+        started_at = datetime(2024, 1, 1, 12, 1, 0)
+
+        timer = repo.update_timer(row.id, 60, TimerStatus.running, started_at=started_at)
+        repo.record_event(row.id, "started", 0)
+
+        added = [call.args[0] for call in repo.db.add.call_args_list]
+        assert [type(obj) for obj in added] == [TimerEvent]
+        assert added[0].sequence == 1
+        assert added[0].recorded_at == started_at
+        assert timer is not row
+        assert row.status == "stopped"
+
+    def test_checkpoint_every_interval(self, repo, row):
+        """Test a checkpoint is written on every Nth event."""
+        for _ in range(3):
+            repo.record_event(row.id, "paused", 0)
+
+        checkpoints = [c.args[0] for c in repo.db.add.call_args_list if isinstance(c.args[0], TimerCheckpoint)]
+        assert len(checkpoints) == 1
+        assert checkpoints[0].sequence == 3
+        assert checkpoints[0].status == TimerStatus.paused
+
+    def test_countdown_update_appends_tick(self, repo, row):
+        """Test running-to-running updates are persisted as tick events."""
+        repo.update_timer(row.id, 60, TimerStatus.running, started_at=datetime(2024, 1, 1, 12, 1, 0))
+        repo.record_event(row.id, "started", 0)
+        repo.db.reset_mock()
+
+        repo.update_timer(row.id, 59, TimerStatus.running)
+
+        tick = repo.db.add.call_args.args[0]
+        assert tick.event_type == "tick"
+        assert tick.remaining_seconds == 59
+        repo.db.commit.assert_called_once()
+
+    def test_save_batch_appends_ticks_for_dirty_timers(self, repo, row):
+        """Test batch changes without an event still reach the log."""
+        timer = repo._timers[row.id]
+        timer.status = TimerStatus.running
+        repo._states[row.id]["status"] = "running"
+        timer.remaining_seconds = 55
+
+        repo.save_batch([])
+
+        tick = repo.db.add.call_args.args[0]
+        assert tick.event_type == "tick"
+        assert tick.remaining_seconds == 55
+
+
+class TestEventSourcedStorage:
+    """Tests against a real database for programs and concurrent appends."""
+
+    @pytest.fixture
+    def db_factory(self, tmp_path):
+        """Sessions on a fresh SQLite file so two of them can race."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'events.db'}")
+        Base.metadata.create_all(engine)
+        yield sessionmaker(bind=engine)
+        engine.dispose()
+
+    def test_program_phases_are_sequenced_events(self, db_factory):
+        """Test a program start survives folding and later commands."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        db = db_factory()
+        timer = EventSourcedTimerRepo(db, clock=clock).create_timer(90, "Station")
+        program = ProgramRepo(db, EventSourcedTimerRepo(db, clock=clock)).create_program(
+            "Circuit", 1, [{"name": "Work", "kind": "work", "duration_seconds": 30}], [timer.id]
+        )
+
+        ProgramService(ProgramRepo(db, EventSourcedTimerRepo(db, clock=clock))).start_program(
+            program.id, clock.now()
+        )
+
+        started = EventSourcedTimerRepo(db_factory(), clock=clock).get_timer(timer.id)
+        assert started.status == TimerStatus.running
+        assert (started.duration_seconds, started.remaining_seconds) == (30, 30)
+        assert started.started_at == clock.now()
+
+        clock.advance(10)
+        TimerService(EventSourcedTimerRepo(db, clock=clock), clock).pause_timer(timer.id)
+        paused = EventSourcedTimerRepo(db_factory(), clock=clock).get_timer(timer.id)
+        assert paused.status == TimerStatus.paused
+        assert paused.duration_seconds == 30
+        sequences = [event.sequence for event in TimerRepo(db_factory()).get_timer_events(timer.id)]
+        assert sequences == [1, 2]
+
+    def test_losing_append_is_retried_on_fresh_state(self, db_factory):
+        """Test a concurrent append conflicts instead of failing with an integrity error."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        timer_id = EventSourcedTimerRepo(db_factory(), clock=clock).create_timer(60).id
+        first, second = db_factory(), db_factory()
+        winner = EventSourcedTimerRepo(first, clock=clock)
+        loser = EventSourcedTimerRepo(second, clock=clock)
+        winner.get_timer(timer_id)
+        loser.get_timer(timer_id)
+
+        winner.record_event(timer_id, "started")
+        repos = iter([loser, EventSourcedTimerRepo(second, clock=clock)])
+
+        event = retry_on_conflict(second, lambda: next(repos).record_event(timer_id, "paused"))
+
+        assert event.sequence == 2
+        with pytest.raises(SequenceConflict):
+            retry_on_conflict(second, lambda: loser.record_event(timer_id, "reset"), attempts=1)
+
+    def test_events_are_stamped_by_the_injected_clock(self, db_factory):
+        """Test ticks and unstamped transitions use the repository clock."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        repo = EventSourcedTimerRepo(db_factory(), clock=clock)
+        timer = repo.create_timer(60)
+        clock.advance(5)
+
+        assert repo.record_event(timer.id, "reset").recorded_at == clock.now()
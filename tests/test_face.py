@@ -0,0 +1,73 @@
+import xml.etree.ElementTree as ElementTree
+
+import pytest
+
+from app.schemas.timer import UrgencyLevel
+from app.services.face import FaceCatalog, face_catalog, intensity_to_colour, render_face
+from benchmarks.harness import app_client, stand_in_engine
+
+
+class TestFaceCatalog:
+    """Test pre-rendered face variants."""
+
+    @pytest.mark.parametrize(
+        "intensity, colour",
+        [
+            (0.0, "#00FF00"),
+            (1 / 1020, "#01FF00"),  # halves round up, as Math.round does
+            (0.25, "#80FF00"),
+            (0.5, "#FFFF00"),
+            (1.0, "#FF0000"),
+            (2.0, "#FF0000"),
+        ],
+    )
+    def test_colour_ramp_matches_web_client(self, intensity, colour):
+        assert intensity_to_colour(intensity) == colour
+
+    def test_every_variant_is_valid_svg(self):
+        catalog = FaceCatalog(steps=4)
+        assert len(catalog) == 4 * 5
+        for level in (UrgencyLevel.calm, UrgencyLevel.elevated, UrgencyLevel.anxious, UrgencyLevel.alarm):
+            root = ElementTree.fromstring(render_face(level, 0.3))
+            assert root.tag.endswith("svg")
+
+    def test_nearby_intensities_share_a_variant(self):
+        catalog = FaceCatalog(steps=20)
+        assert catalog.url_for(UrgencyLevel.calm, 0.31) == catalog.url_for(UrgencyLevel.calm, 0.29)
+        assert catalog.url_for(UrgencyLevel.calm, 0.31) != catalog.url_for(UrgencyLevel.calm, 0.4)
+        assert catalog.url_for(UrgencyLevel.calm, 0.3) != catalog.url_for(UrgencyLevel.alarm, 0.3)
+
+    def test_digest_is_stable_across_builds(self):
+        assert FaceCatalog(steps=20).url_for(UrgencyLevel.anxious, 0.8) == face_catalog.url_for(
+            UrgencyLevel.anxious, 0.8
+        )
+
+
+class TestFaceRoutes:
+    """Test serving faces by content hash."""
+
+    @pytest.mark.asyncio
+    async def test_urgency_links_an_immutable_face(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            await client.post("/api/timer", json={"duration": 60})
+            face_url = (await client.get("/api/urgency")).json()["face_url"]
+
+            face = await client.get(face_url)
+            assert face.status_code == 200
+            assert face.headers["content-type"] == "image/svg+xml"
+            assert "immutable" in face.headers["cache-control"]
+            assert face.content.startswith(b"<svg")
+
+            cached = await client.get(face_url, headers={"If-None-Match": face.headers["etag"]})
+            assert cached.status_code == 304
+
+            redirect = await client.get("/api/face", params={"level": "calm", "intensity": 0})
+            assert redirect.status_code == 307
+            assert redirect.headers["location"] == face_url
+
+    @pytest.mark.asyncio
+    async def test_unknown_faces(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            assert (await client.get("/api/face/0123.svg")).status_code == 404
+            response = await client.get("/api/face", params={"level": "smug", "intensity": 0})
+            assert response.status_code == 400
@@ -0,0 +1,95 @@
+import pytest
+from datetime import datetime
+from unittest.mock import Mock
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.services.clock import ManualClock
+from app.services.health import HealthMonitor
+
+
+@pytest.fixture
+def clock():
+    """Manual clock for probe ages."""
+    return ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+
+
+@pytest.fixture
+def monitor(clock):
+    """Monitor over healthy mocked components."""
+    engine = Mock()
+    engine.pool.checkedout.return_value = 1
+    cache = Mock(alive=True, interval_seconds=30.0)
+    cache.lag_seconds.return_value = 10.0
+    programs = Mock()
+    programs.scheduler.alive = True
+    programs.scheduler.lag_seconds.return_value = 0.0
+    programs.scheduler.__len__ = Mock(return_value=2)
+    monitor = HealthMonitor(engine, cache, programs, 5.0, pool_limit=15, clock=clock)
+    monitor.last_ok_at = clock.monotonic()
+    return monitor
+
+
+class TestHealthMonitor:
+    """Test readiness checks against cached state."""
+
+    def test_all_checks_pass(self, monitor):
+        """Healthy components are all ready."""
+        assert all(ok for ok, _ in monitor.readiness().values())
+
+    def test_stale_probe_fails_database(self, monitor, clock):
+        """A probe older than three intervals fails the database check."""
+        clock.advance(16)
+        ok, detail = monitor.check_database()
+        assert not ok
+        assert "16.0s ago" in detail
+
+    def test_database_only_gates_readiness_when_required(self, monitor, clock):
+        """Stale reads keep the worker in rotation unless the database is required."""
+        clock.advance(16)
+        assert not monitor.check_database()[0]
+        assert not monitor.required("database")
+        assert monitor.required("pool")
+
+        monitor.database_required = True
+        assert monitor.required("database")
+
+    def test_exhausted_pool_fails(self, monitor):
+        """All connections checked out fails the pool check."""
+        monitor.engine.pool.checkedout.return_value = 15
+        assert monitor.check_pool() == (False, "15/15 connections in use")
+
+    def test_dead_cache_task_fails(self, monitor):
+        """A stopped refresh task fails the cache check."""
+        monitor.cache.alive = False
+        assert monitor.check_timer_cache()[0] is False
+
+    def test_lagging_cache_fails(self, monitor):
+        """A cache far behind the database fails the cache check."""
+        monitor.cache.lag_seconds.return_value = 120.0
+        assert monitor.check_timer_cache()[0] is False
+
+    def test_overdue_scheduler_fails(self, monitor):
+        """Deadlines stuck past their due time fail the scheduler check."""
+        monitor.programs.scheduler.lag_seconds.return_value = 30.0
+        ok, detail = monitor.check_scheduler()
+        assert not ok
+        assert detail == "2 pending, 30.0s overdue"
+
+    @pytest.mark.asyncio
+    async def test_probe_records_success_and_failure(self, clock, tmp_path):
+        """Probes keep the outcome for readiness to read."""
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'health.db'}")
+        monitor = HealthMonitor(engine, Mock(), Mock(), 5.0, pool_limit=15, clock=clock)
+        await monitor.probe()
+        assert monitor.check_database()[0]
+        await engine.dispose()
+
+        broken = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'health.db'}")
+        monitor.engine = broken
+        clock.advance(20)
+        await monitor.probe()
+        ok, detail = monitor.check_database()
+        assert not ok
+        assert "OperationalError" in detail
+        await broken.dispose()
@@ -0,0 +1,201 @@
+import random
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.timer import Timer, TimerEvent
+from app.routers import timer as timer_router
+from app.services.auth import issue_token
+from app.services.leaderboard import Leaderboards, Ranking, SkipList
+from app.services.timer_service import TimerService
+from benchmarks.harness import app_client, stand_in_engine
+
+
+START = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def make_timer(name="Station", reset_count=0, owner_id=None):
+    return Timer(
+        id=uuid.uuid4(), name=name, duration_seconds=60, reset_count=reset_count, owner_id=owner_id
+    )
+
+
+def reset_at(boards, timer, *offsets):
+    """Record resets of ``timer`` at the given seconds after START."""
+    for offset in offsets:
+        timer.reset_count += 1
+        boards.record_reset(timer, START + timedelta(seconds=offset))
+
+
+class TestSkipList:
+    """Test the sorted structure behind each ranking."""
+
+    def test_matches_sorted_under_random_operations(self):
+        rng = random.Random(7)
+        skip_list, expected = SkipList(rng), set()
+        for _ in range(2000):
+            key = rng.randrange(300)
+            if key in expected:
+                assert skip_list.remove(key)
+                expected.discard(key)
+            else:
+                skip_list.insert(key)
+                expected.add(key)
+        assert list(skip_list) == sorted(expected)
+        assert len(skip_list) == len(expected)
+        assert not skip_list.remove(1000)
+
+    def test_ranking_moves_updated_members(self):
+        ranking = Ranking()
+        ranking.update("a", 3)
+        ranking.update("b", 2)
+        ranking.update("c", 1)
+        ranking.update("c", 5)
+        assert ranking.top(2) == ["b", "a"]
+        assert ranking.top(10) == ["b", "a", "c"]
+
+
+class TestLeaderboards:
+    """Test incremental board updates and reconciliation."""
+
+    def test_resets_board_ranks_by_reset_count(self):
+        boards = Leaderboards(Mock(), 60)
+        busy, quiet = make_timer("Busy"), make_timer("Quiet")
+        reset_at(boards, quiet, 0)
+        reset_at(boards, busy, 0, 10, 20)
+
+        top = boards.top("resets", 10)
+        assert [entry["name"] for entry in top] == ["Busy", "Quiet"]
+        assert [entry["rank"] for entry in top] == [1, 2]
+        assert top[0]["resets"] == 3
+        assert boards.top("resets", 1) == top[:1]
+
+    def test_consistency_board_needs_enough_intervals(self):
+        boards = Leaderboards(Mock(), 60, min_intervals=3)
+        steady, erratic, new = make_timer("Steady"), make_timer("Erratic"), make_timer("New")
+        reset_at(boards, steady, 0, 60, 120, 180)
+        reset_at(boards, erratic, 0, 10, 100, 110)
+        reset_at(boards, new, 0, 60)
+
+        top = boards.top("consistency", 10)
+        assert [entry["name"] for entry in top] == ["Steady", "Erratic"]
+        assert top[0]["variation"] == 0
+        assert top[0]["mean_interval_seconds"] == 60
+
+    def test_owner_boards_rank_only_their_timers(self):
+        boards = Leaderboards(Mock(), 60)
+        reset_at(boards, make_timer("Alice's", owner_id="alice"), 0)
+        reset_at(boards, make_timer("Bob's", owner_id="bob"), 0, 10)
+
+        assert [entry["name"] for entry in boards.top("resets", 10, "alice")] == ["Alice's"]
+        assert [entry["rank"] for entry in boards.top("resets", 10, "bob")] == [1]
+        assert boards.top("resets", 10, "carol") == []
+        assert [entry["name"] for entry in boards.top("resets", 10)] == ["Bob's", "Alice's"]
+
+    def test_unknown_board(self):
+        with pytest.raises(ValueError, match="Unknown leaderboard"):
+            Leaderboards(Mock(), 60).top("fastest", 10)
+
+    def test_reconcile_rebuilds_from_reset_events(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        timer = Timer(
+            name="Rower", duration_seconds=60, remaining_seconds=60, reset_count=4, owner_id="alice"
+        )
+        db.add(timer)
+        db.flush()
+        for offset in (0, 30, 60, 90):
+            db.add(
+                TimerEvent(
+                    timer_id=timer.id, event_type="reset", recorded_at=START + timedelta(seconds=offset)
+                )
+            )
+        db.add(TimerEvent(timer_id=timer.id, event_type="started", recorded_at=START))
+        db.commit()
+        boards = Leaderboards(Mock(), 60)
+        reset_at(boards, make_timer("Gone"), 0)
+
+        boards._reconcile(db)
+
+        assert [entry["name"] for entry in boards.top("resets", 10)] == ["Rower"]
+        consistency = boards.top("consistency", 10)
+        assert consistency[0]["resets"] == 4
+        assert consistency[0]["mean_interval_seconds"] == 30
+        assert boards.top("resets", 10, "alice") == boards.top("resets", 10)
+        assert boards.top("resets", 10, "bob") == []
+        assert boards.reconciled_at is not None
+
+    def test_resets_recorded_during_reconcile_survive_the_swap(self):
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db = sessionmaker(bind=engine)()
+        rower = Timer(name="Rower", duration_seconds=60, remaining_seconds=60, reset_count=1)
+        db.add(rower)
+        db.flush()
+        db.add(TimerEvent(timer_id=rower.id, event_type="reset", recorded_at=START))
+        db.commit()
+        boards = Leaderboards(Mock(), 60)
+        seen = make_timer("Rower", reset_count=1)
+        seen.id = rower.id
+        late = make_timer("Late")
+        execute = db.execute
+
+        def scan_then_reset(*args, **kwargs):
+            result = execute(*args, **kwargs)
+            # One reset the scan saw, one committed after its snapshot.
+            boards.record_reset(seen, START)
+            reset_at(boards, late, 5, 10)
+            return result
+
+        db.execute = scan_then_reset
+        boards._reconcile(db)
+
+        resets = {entry["name"]: entry["resets"] for entry in boards.top("resets", 10)}
+        assert resets == {"Late": 2, "Rower": 1}
+
+        db.execute = execute
+        boards._reconcile(db)
+        assert [entry["name"] for entry in boards.top("resets", 10)] == ["Rower"]
+
+
+class TestLeaderboardRoute:
+    """Test the leaderboard endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_resets_through_the_api_show_up(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            created = (await client.post("/api/timer", json={"duration": 90, "name": "Bike"})).json()
+            for _ in range(3):
+                await client.post("/api/timer/reset")
+
+            response = await client.get("/api/leaderboard", params={"board": "resets", "limit": 100})
+            assert response.status_code == 200
+            entries = {entry["timer_id"]: entry for entry in response.json()["entries"]}
+            assert entries[created["id"]]["resets"] == 3
+            assert entries[created["id"]]["name"] == "Bike"
+
+            assert (await client.get("/api/leaderboard", params={"board": "fastest"})).status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_callers_see_only_their_own_timers(self, monkeypatch):
+        monkeypatch.setattr(timer_router.settings, "auth_enabled", True)
+        alice = {"Authorization": f"Bearer {issue_token('alice', timer_router.settings.jwt_secret)}"}
+        bob = {"Authorization": f"Bearer {issue_token('bob', timer_router.settings.jwt_secret)}"}
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            created = (await client.post("/api/timer", json={"duration": 90}, headers=alice)).json()
+            await client.post("/api/timer/reset", headers=alice)
+
+            mine = await client.get("/api/leaderboard", headers=alice)
+            theirs = await client.get("/api/leaderboard", headers=bob)
+            assert [entry["timer_id"] for entry in mine.json()["entries"]] == [created["id"]]
+            assert theirs.json()["entries"] == []
+            assert (await client.get("/api/leaderboard")).status_code == 401
+
+    def test_service_feeds_only_injected_boards(self):
+        assert TimerService(Mock()).boards is None
@@ -0,0 +1,52 @@
+import pytest
+
+from benchmarks.harness import latency_summary, percentile, stand_in_engine
+from benchmarks.load_test import LoadStats, compare_to_baseline
+
+
+class TestLoadTestStats:
+    """Test load test statistics helpers."""
+
+    def test_percentile_nearest_rank(self):
+        """Percentiles pick the nearest ranked sample."""
+        samples = [float(i) for i in range(1, 101)]
+        assert percentile(samples, 50) == 50.0
+        assert percentile(samples, 95) == 95.0
+        assert percentile(samples, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_latency_summary(self):
+        """Summary reports count, mean and tail latencies."""
+        summary = latency_summary([10.0, 20.0, 30.0, 40.0])
+        assert summary["count"] == 4
+        assert summary["mean_ms"] == 25.0
+        assert summary["max_ms"] == 40.0
+
+    def test_record_splits_client_and_server_errors(self):
+        """4xx and 5xx responses are counted separately."""
+        stats = LoadStats()
+        stats.record("POST /api/timer/pause", 5.0, 200)
+        stats.record("POST /api/timer/pause", 5.0, 400)
+        stats.record("POST /api/timer/pause", 5.0, 500)
+        assert len(stats.latencies["POST /api/timer/pause"]) == 3
+        assert stats.client_errors["POST /api/timer/pause"] == 1
+        assert stats.server_errors["POST /api/timer/pause"] == 1
+
+    def test_compare_to_baseline_flags_p95_regression(self):
+        """Routes whose p95 grows past the threshold are reported."""
+        baseline = {"routes": {"GET /api/timer": {"p95_ms": 10.0}, "GET /api/urgency": {"p95_ms": 10.0}}}
+        results = {"routes": {"GET /api/timer": {"p95_ms": 13.0}, "GET /api/urgency": {"p95_ms": 11.0}}}
+        regressions = compare_to_baseline(results, baseline, 0.2)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("GET /api/timer")
+
+
+class TestStandInEngine:
+    """Test the guard around dropping a benchmark database."""
+
+    @pytest.mark.asyncio
+    async def test_refuses_to_reset_a_database_not_named_for_benchmarks(self):
+        """Pointing at a real database needs a *_bench name or an explicit reset."""
+        with pytest.raises(ValueError, match="--reset-schema"):
+            async with stand_in_engine("postgresql+asyncpg://app@db/timers"):
+                pass
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from app.services.metrics import (
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    current_repo_call,
+    db_repo_call_seconds,
+    instrument_repo,
+)
+
+
+@pytest.fixture
+def registered():
+    """Remove metrics created by a test from the global registry."""
+    created = []
+    yield created
+    for metric in created:
+        REGISTRY.remove(metric)
+
+
+class TestMetrics:
+    """Test sharded metrics and Prometheus rendering."""
+
+    def test_counter_merges_thread_shards(self, registered):
+        """Counts from every thread are summed at scrape time."""
+        counter = Counter("test_requests_total", "Requests.", ("route",))
+        registered.append(counter)
+
+        def work():
+            for _ in range(100):
+                counter.inc(("/api/timer",))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.inc(("/api/urgency",), 2)
+
+        assert counter.values() == {("/api/timer",): 400, ("/api/urgency",): 2}
+        assert 'test_requests_total{route="/api/timer"} 400' in counter.render()
+
+    def test_histogram_renders_cumulative_buckets(self, registered):
+        """Buckets are cumulative with +Inf, sum and count."""
+        histogram = Histogram("test_seconds", "Latency.", buckets=(0.1, 1.0))
+        registered.append(histogram)
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value)
+
+        lines = histogram.render().splitlines()
+        assert 'test_seconds_bucket{le="0.1"} 2' in lines
+        assert 'test_seconds_bucket{le="1.0"} 3' in lines
+        assert 'test_seconds_bucket{le="+Inf"} 4' in lines
+        assert "test_seconds_sum 3.65" in lines
+        assert "test_seconds_count 4" in lines
+
+    def test_gauge_reads_callback(self, registered):
+        """Gauges are computed when rendered."""
+        gauge = Gauge("test_timers", "Timers.", ("status",), lambda: {("running",): 3})
+        registered.append(gauge)
+        assert 'test_timers{status="running"} 3' in gauge.render()
+
+    def test_instrument_repo_times_public_methods(self):
+        """Public methods are timed and set the current repo call."""
+        seen = []
+
+        @instrument_repo
+        class FakeRepo:
+            def get_thing(self):
+                seen.append(current_repo_call.get())
+                return "thing"
+
+            def _helper(self):
+                return "helper"
+
+        assert FakeRepo().get_thing() == "thing"
+        assert FakeRepo()._helper() == "helper"
+        assert seen == [("FakeRepo", "get_thing")]
+        assert current_repo_call.get() == ("none", "none")
+        assert ("FakeRepo", "get_thing") in db_repo_call_seconds.values()
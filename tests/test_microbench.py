@@ -0,0 +1,37 @@
+from benchmarks.microbench import BenchResult, compare_to_baseline, measure
+
+
+class TestMicrobench:
+    """Test microbenchmark measurement and baseline checks."""
+
+    def test_measure_reports_allocations(self):
+        """Allocating calls report their peak bytes per call."""
+        result = measure("alloc", lambda: bytearray(10_000), iterations=20, rounds=1)
+        assert result.name == "alloc"
+        assert result.ns_per_call > 0
+        assert result.bytes_per_call >= 10_000
+
+    def test_compare_flags_time_and_allocation_regressions(self):
+        """Growth past the threshold in either metric is reported."""
+        baseline = {
+            "cases": {
+                "fast": {"ns_per_call": 100.0, "bytes_per_call": 100},
+                "lean": {"ns_per_call": 100.0, "bytes_per_call": 100},
+            }
+        }
+        results = [BenchResult("fast", 110.0, 100), BenchResult("lean", 100.0, 200)]
+        regressions = compare_to_baseline(results, baseline, 0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("lean: bytes_per_call")
+
+    def test_compare_ignores_new_cases(self):
+        """Cases without a baseline are not regressions."""
+        assert compare_to_baseline([BenchResult("new", 1.0, 1)], {"cases": {}}, 0.25) == []
+
+    def test_timings_are_normalised_by_calibration(self):
+        """A uniformly slower host is not a regression; timings without calibration are skipped."""
+        baseline = {"calibration_ns": 100.0, "cases": {"tick": {"ns_per_call": 100.0, "bytes_per_call": 10}}}
+        slow = [BenchResult("tick", 190.0, 10)]
+        assert compare_to_baseline(slow, baseline, 0.25, calibration_ns=200.0) == []
+        assert compare_to_baseline(slow, baseline, 0.25, calibration_ns=100.0)[0].startswith("tick: ns_per_call")
+        assert compare_to_baseline(slow, {"cases": baseline["cases"]}, 0.25, calibration_ns=100.0) == []
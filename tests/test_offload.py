@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+from sqlalchemy import text
+
+from app.services.offload import RepoExecutor, sync_database_url, sync_engine_options
+
+
+@pytest.fixture
+def executor(tmp_path):
+    """Two-thread executor over a SQLite file."""
+    executor = RepoExecutor(f"sqlite+aiosqlite:///{tmp_path / 'offload.db'}", max_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestRepoExecutor:
+    """Test offloading repository calls to the thread pool."""
+
+    def test_sync_database_url(self):
+        """Async drivers map to their blocking counterparts."""
+        assert sync_database_url("postgresql+asyncpg://u:p@db/timer") == "postgresql+psycopg2://u:p@db/timer"
+        assert sync_database_url("postgresql://u:p@db/timer") == "postgresql://u:p@db/timer"
+        assert sync_database_url("sqlite+aiosqlite:///x.db") == "sqlite:///x.db"
+
+    def test_server_connects_and_pool_waits_are_capped(self):
+        """Offloaded calls fail fast like the async engine instead of hanging a thread."""
+        options = sync_engine_options("postgresql+psycopg2://u:p@db/timer", 4, 2.5)
+        assert options == {
+            "pool_size": 4,
+            "max_overflow": 0,
+            "pool_timeout": 2.5,
+            "connect_args": {"connect_timeout": 3},
+        }
+        assert sync_engine_options("sqlite:///x.db", 4, 2.5)["connect_args"] == {"check_same_thread": False}
+
+    @pytest.mark.asyncio
+    async def test_runs_off_the_loop_thread(self, executor):
+        """Calls run on a pool thread with a session of their own."""
+        loop_thread = threading.get_ident()
+        thread, value = await executor.run(
+            lambda db: (threading.get_ident(), db.execute(text("SELECT 1")).scalar())
+        )
+        assert thread != loop_thread
+        assert value == 1
+        assert executor.depth() == {("queued",): 0, ("running",): 0}
+
+    @pytest.mark.asyncio
+    async def test_errors_propagate_and_release_the_thread(self, executor):
+        """A failing call raises in the caller and leaves the pool usable."""
+
+        def fail(db):
+            db.execute(text("SELECT 1"))
+            raise ValueError("Timer has expired")
+
+        with pytest.raises(ValueError, match="expired"):
+            await executor.run(fail)
+        assert await executor.run(lambda db: db.execute(text("SELECT 2")).scalar()) == 2
+        assert executor.depth() == {("queued",): 0, ("running",): 0}
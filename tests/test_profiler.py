@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+import pytest
+
+from app.services.profiler import profile_event_loop
+
+
+def blocking_repo_call(seconds: float) -> None:
+    """Stand-in for a synchronous DB round trip on the loop thread."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class TestSamplingProfiler:
+    """Test event loop profiling."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_call_shows_in_stacks_and_lag(self):
+        """Sync work on the loop appears in the flamegraph and as loop lag."""
+
+        async def block_loop():
+            await asyncio.sleep(0.05)
+            blocking_repo_call(0.2)
+
+        task = asyncio.create_task(block_loop())
+        result = await profile_event_loop(0.4, interval_seconds=0.002)
+        await task
+
+        assert result.samples > 0
+        assert "blocking_repo_call (tests/test_profiler.py:" in result.collapsed
+        for line in result.collapsed.splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0
+        assert result.lag_max_ms >= 100
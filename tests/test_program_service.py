@@ -0,0 +1,296 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from unittest.mock import Mock
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.program import IntervalProgram, ProgramPhase
+from app.repos.program_repo import ProgramRepo
+from app.repos.timer_repo import TimerRepo
+from app.routers import timer as timer_router
+from app.schemas.program import ProgramStatus
+from app.services.auth import issue_token
+from app.services.clock import ManualClock
+from app.services.program_engine import ProgramEngine
+from app.services.program_service import ProgramService, TimersNotFound, next_position
+from app.services.scheduler import DeadlineScheduler
+from benchmarks.harness import app_client, stand_in_engine
+
+
+@pytest.fixture
+def mock_repo():
+    """Create a mock ProgramRepo."""
+    repo = Mock()
+    repo.save_program.side_effect = lambda program: program
+    return repo
+
+
+@pytest.fixture
+def program_service(mock_repo):
+    """Create ProgramService with mocked repo."""
+    return ProgramService(mock_repo)
+
+
+@pytest.fixture
+def tabata():
+    """Create a two-round work/rest program."""
+    return IntervalProgram(
+        id=uuid4(),
+        name="Tabata",
+        repeat_count=2,
+        status=ProgramStatus.stopped,
+        current_phase_index=0,
+        current_round=0,
+        phases=[
+            ProgramPhase(position=0, name="Work", kind="work", duration_seconds=20),
+            ProgramPhase(position=1, name="Rest", kind="rest", duration_seconds=10),
+        ],
+    )
+
+
+class TestNextPosition:
+    """Tests for phase sequencing."""
+
+    def test_next_phase_same_round(self):
+        """Test moving to the next phase within a round."""
+        assert next_position(0, 1, 2, 3) == (1, 1)
+
+    def test_wraps_to_next_round(self):
+        """Test wrapping to the first phase of the next round."""
+        assert next_position(1, 1, 2, 3) == (0, 2)
+
+    def test_finished_after_last_round(self):
+        """Test the program ends after the last round."""
+        assert next_position(1, 3, 2, 3) is None
+
+
+class TestProgramServiceAdvance:
+    """Tests for deadline-driven phase changes."""
+
+    def test_start_program_sets_first_deadline(self, program_service, mock_repo, tabata):
+        """Test starting arms the first phase deadline."""
+        mock_repo.get_program.return_value = tabata
+        now = datetime(2024, 1, 1, 12, 0, 0)
+
+        program = program_service.start_program(tabata.id, now)
+
+        assert program.status == ProgramStatus.running
+        assert program.current_round == 1
+        assert program.phase_deadline == now + timedelta(seconds=20)
+        mock_repo.update_group_timers.assert_called_once()
+        assert mock_repo.update_group_timers.call_args.args[1] == "phase"
+
+    def test_advance_before_deadline_is_noop(self, program_service, mock_repo, tabata):
+        """Test advancing early leaves the phase unchanged."""
+        mock_repo.get_program.return_value = tabata
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        program_service.start_program(tabata.id, now)
+        mock_repo.update_group_timers.reset_mock()
+
+        program = program_service.advance_program(tabata.id, now + timedelta(seconds=19))
+
+        assert program.current_phase_index == 0
+        mock_repo.update_group_timers.assert_not_called()
+
+    def test_advance_catches_up_from_deadlines(self, program_service, mock_repo, tabata):
+        """Test a late wake-up lands on deadline-aligned phase boundaries."""
+        mock_repo.get_program.return_value = tabata
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        program_service.start_program(tabata.id, now)
+
+        program = program_service.advance_program(tabata.id, now + timedelta(seconds=35))
+
+        assert (program.current_phase_index, program.current_round) == (0, 2)
+        assert program.phase_started_at == now + timedelta(seconds=30)
+        assert program.phase_deadline == now + timedelta(seconds=50)
+
+    def test_advance_finishes_program(self, program_service, mock_repo, tabata):
+        """Test the final deadline expires every timer in the group."""
+        mock_repo.get_program.return_value = tabata
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        program_service.start_program(tabata.id, now)
+
+        program = program_service.advance_program(tabata.id, now + timedelta(minutes=5))
+
+        assert program.status == ProgramStatus.finished
+        assert program.phase_deadline is None
+        assert mock_repo.update_group_timers.call_args.args[1] == "expired"
+
+
+class TestProgramServiceCreate:
+    """Tests for attaching timers to a new program."""
+
+    def test_unknown_timers_are_rejected(self, program_service, mock_repo):
+        """Test a program cannot claim timers the repository cannot see."""
+        known, unknown = uuid4(), uuid4()
+        mock_repo.get_timers.return_value = [Mock(id=known)]
+
+        with pytest.raises(TimersNotFound, match=str(unknown)):
+            program_service.create_program("Circuit", [], timer_ids=[known, unknown])
+        mock_repo.create_program.assert_not_called()
+
+        mock_repo.get_timers.return_value = [Mock(id=known)]
+        program_service.create_program("Circuit", [], timer_ids=[known, known])
+        mock_repo.create_program.assert_called_once_with("Circuit", 1, [], [known])
+
+
+class TestProgramRoutes:
+    """Tests for program ownership through the API."""
+
+    @pytest.mark.asyncio
+    async def test_programs_and_their_timers_are_scoped_to_the_caller(self, monkeypatch):
+        """Test callers cannot attach, read or stop programs and timers of others."""
+        monkeypatch.setattr(timer_router.settings, "auth_enabled", True)
+        secret = timer_router.settings.jwt_secret
+        alice = {"Authorization": f"Bearer {issue_token('alice', secret)}"}
+        bob = {"Authorization": f"Bearer {issue_token('bob', secret)}"}
+        phases = [{"name": "Work", "kind": "work", "duration_seconds": 20}]
+
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            timer_id = (
+                await client.post("/api/timer", json={"duration": 60}, headers=alice)
+            ).json()["id"]
+            program = {"phases": phases, "timer_ids": [timer_id]}
+
+            assert (await client.post("/api/programs", json=program)).status_code == 401
+            stolen = await client.post("/api/programs", json=program, headers=bob)
+            assert stolen.status_code == 404
+            assert timer_id in stolen.json()["detail"]
+
+            created = await client.post("/api/programs", json=program, headers=alice)
+            assert created.status_code == 200
+            program_id = created.json()["id"]
+
+            assert (await client.get(f"/api/programs/{program_id}", headers=alice)).status_code == 200
+            assert (await client.get(f"/api/programs/{program_id}", headers=bob)).status_code == 404
+            stop = await client.post(f"/api/programs/{program_id}/stop", headers=bob)
+            assert stop.status_code == 404
+
+
+class TestProgramEngine:
+    """Tests for dispatching phase boundaries."""
+
+    @pytest.mark.asyncio
+    async def test_failed_boundary_is_retried(self, monkeypatch):
+        """Test a boundary that fails to apply is re-armed and later advances the phase."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            phases = [
+                {"name": "Work", "kind": "work", "duration_seconds": 20},
+                {"name": "Rest", "kind": "rest", "duration_seconds": 10},
+            ]
+
+            def start(db):
+                service = ProgramService(ProgramRepo(db, TimerRepo(db)))
+                return service.start_program(service.create_program("Circuit", phases).id, clock.now())
+
+            async with factory() as session:
+                program = await session.run_sync(start)
+            programs = ProgramEngine(factory, clock=clock, retry_seconds=2)
+            advance = ProgramService.advance_program
+            calls = []
+
+            def flaky(service, program_id, now):
+                calls.append(now)
+                if len(calls) == 1:
+                    raise OSError("connection reset")
+                return advance(service, program_id, now)
+
+            monkeypatch.setattr(ProgramService, "advance_program", flaky)
+            clock.advance(20)
+            await programs._on_deadline(program.id, program.phase_deadline)
+
+            assert programs.scheduler.next_deadline() == clock.now() + timedelta(seconds=2)
+            clock.advance(2)
+            for key, deadline, callback in programs.scheduler.pop_due():
+                assert programs.scheduler.claim(key)
+                await callback(key, deadline)
+
+            assert len(calls) == 2
+            async with factory() as session:
+                advanced = await session.get(IntervalProgram, program.id)
+            assert advanced.current_phase_index == 1
+            assert advanced.phase_started_at == program.phase_deadline
+            assert programs.scheduler.next_deadline() == program.phase_deadline + timedelta(seconds=10)
+
+
+class TestDeadlineScheduler:
+    """Tests for deadline ordering."""
+
+    def test_pop_due_in_deadline_order(self):
+        """Test due entries are returned earliest first."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        clock = ManualClock(now)
+        scheduler = DeadlineScheduler(clock)
+        callback = Mock()
+        scheduler.schedule("b", now + timedelta(seconds=2), callback)
+        scheduler.schedule("a", now + timedelta(seconds=1), callback)
+        scheduler.schedule("c", now + timedelta(seconds=9), callback)
+        clock.advance(5)
+
+        due = scheduler.pop_due()
+
+        assert [key for key, _, _ in due] == ["a", "b"]
+        assert len(scheduler) == 1
+
+    def test_reschedule_replaces_entry(self):
+        """Test rescheduling a key supersedes its earlier deadline."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        clock = ManualClock(now)
+        scheduler = DeadlineScheduler(clock)
+        scheduler.schedule("a", now + timedelta(seconds=1), Mock())
+        scheduler.schedule("a", now + timedelta(seconds=10), Mock())
+        clock.advance(5)
+
+        assert scheduler.pop_due() == []
+        assert scheduler.next_deadline() == now + timedelta(seconds=10)
+
+    def test_cancel_drops_entry(self):
+        """Test cancelled keys never fire."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        scheduler = DeadlineScheduler(ManualClock(now))
+        scheduler.schedule("a", now, Mock())
+        scheduler.cancel("a")
+
+        assert scheduler.next_deadline() is None
+
+    def test_wall_clock_jump_does_not_fire_early(self):
+        """Test deadlines follow the monotonic clock, not wall-clock jumps."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        clock = ManualClock(now)
+        scheduler = DeadlineScheduler(clock)
+        scheduler.schedule("a", now + timedelta(seconds=10), Mock())
+        clock._start += timedelta(hours=1)
+
+        assert scheduler.pop_due() == []
+
+    @pytest.mark.asyncio
+    async def test_callback_cancelling_later_entry_in_same_batch(self):
+        """Test an entry cancelled or rescheduled by an earlier callback in its batch does not fire."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        clock = ManualClock(now)
+        scheduler = DeadlineScheduler(clock)
+        fired = []
+
+        async def first(key, deadline):
+            fired.append(key)
+            scheduler.cancel("b")
+            scheduler.schedule("c", now + timedelta(hours=1), record)
+
+        async def record(key, deadline):
+            fired.append(key)
+
+        scheduler.schedule("a", now + timedelta(seconds=1), first)
+        scheduler.schedule("b", now + timedelta(seconds=2), record)
+        scheduler.schedule("c", now + timedelta(seconds=3), record)
+        clock.advance(5)
+
+        await scheduler.start()
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert fired == ["a"]
+        assert scheduler.next_deadline() == now + timedelta(hours=1)
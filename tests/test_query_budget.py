@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import create_engine, text
+from starlette.responses import PlainTextResponse
+
+from app.config import get_settings
+from app.middleware import QueryBudgetMiddleware
+from app.services.metrics import instrument_engine
+from benchmarks.harness import StatementCounter, app_client, stand_in_engine
+
+
+@pytest.fixture
+def engine():
+    """Instrumented in-memory SQLite engine."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    yield engine
+    engine.dispose()
+
+
+def make_app(engine, statements: int):
+    """ASGI app that runs ``statements`` identical queries per request."""
+
+    async def app(scope, receive, send):
+        with engine.connect() as conn:
+            for _ in range(statements):
+                conn.execute(text("SELECT 1"))
+        await PlainTextResponse("ok")(scope, receive, send)
+
+    return app
+
+
+async def request(app):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        return await client.get("/timers")
+
+
+class TestQueryBudgetMiddleware:
+    """Test per-request statement counting."""
+
+    @pytest.mark.asyncio
+    async def test_server_timing_reports_statements(self, engine):
+        """Server-Timing carries the statement count when enabled."""
+        app = QueryBudgetMiddleware(make_app(engine, 3), budget=10, server_timing=True)
+        response = await request(app)
+        assert 'desc="3 statements"' in response.headers["server-timing"]
+
+    @pytest.mark.asyncio
+    async def test_server_timing_off_by_default(self, engine):
+        """No header is added outside debug mode."""
+        app = QueryBudgetMiddleware(make_app(engine, 3), budget=10)
+        response = await request(app)
+        assert "server-timing" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_warns_with_most_repeated_statement(self, engine, caplog):
+        """Going over budget logs the repeated statement."""
+        app = QueryBudgetMiddleware(make_app(engine, 4), budget=2)
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_budget"):
+            await request(app)
+        assert "ran 4 SQL statements (budget 2)" in caplog.text
+        assert "x4: SELECT 1" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_within_budget_is_quiet(self, engine, caplog):
+        """Requests within budget log nothing."""
+        app = QueryBudgetMiddleware(make_app(engine, 2), budget=2)
+        with caplog.at_level(logging.WARNING, logger="app.middleware.query_budget"):
+            await request(app)
+        assert caplog.text == ""
+
+    @pytest.mark.asyncio
+    async def test_stock_routes_stay_within_the_default_budget(self):
+        """The heaviest command leaves headroom under the default budget."""
+        async with stand_in_engine() as db_engine, app_client(db_engine) as client:
+            await client.post("/api/timer", json={"duration": 90})
+            counter = StatementCounter(db_engine)
+            assert (await client.post("/api/timer/reset")).status_code == 200
+        assert counter.total + 5 <= get_settings().sql_statement_budget
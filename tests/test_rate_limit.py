@@ -0,0 +1,183 @@
+from datetime import datetime
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import PlainTextResponse
+
+from app.config import get_settings
+from app.main import app as main_app
+from app.middleware import RateLimitMiddleware
+from app.services.auth import Authenticator, issue_token
+from app.services.clock import ManualClock
+from app.services.rate_limit import (
+    TokenBucketLimiter,
+    read_limiter,
+    retry_after_header,
+    set_rate_limiting,
+)
+
+
+SECRET = "rate-limit-test-secret"
+settings = get_settings()
+
+
+@pytest.fixture
+def clock():
+    return ManualClock(datetime(2024, 1, 1))
+
+
+async def ok(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+class TestTokenBucketLimiter:
+    """Test token accounting and idle eviction."""
+
+    def test_burst_then_refill(self, clock):
+        """A full bucket allows ``burst`` calls, then refills at ``rate``."""
+        limiter = TokenBucketLimiter(rate=2, burst=3, clock=clock)
+        assert [limiter.acquire("a") for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire("a") == pytest.approx(0.5)
+
+        clock.advance(0.5)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") > 0
+
+    def test_keys_are_independent(self, clock):
+        """One client draining its bucket does not affect another."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=clock)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") > 0
+        assert limiter.acquire("b") == 0.0
+
+    def test_idle_keys_are_evicted(self, clock):
+        """Keys idle past the cutoff are dropped on later checks."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, idle_seconds=60, clock=clock)
+        limiter.acquire("a")
+        clock.advance(30)
+        limiter.acquire("b")
+        clock.advance(31)
+        limiter.acquire("c")
+        assert len(limiter) == 2
+
+    def test_disabled_always_allows(self, clock):
+        """A disabled limiter keeps no state."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=clock)
+        limiter.enabled = False
+        assert all(limiter.acquire("a") == 0.0 for _ in range(5))
+        assert len(limiter) == 0
+
+    def test_retry_after_rounds_up(self):
+        assert retry_after_header(0.2) == "1"
+        assert retry_after_header(2.1) == "3"
+
+
+class TestRateLimitMiddleware:
+    """Test route classes and 429 responses."""
+
+    @pytest.mark.asyncio
+    async def test_commands_limited_separately_from_reads(self, clock):
+        """Exhausting the command bucket still leaves reads available."""
+        app = RateLimitMiddleware(
+            ok,
+            reads=TokenBucketLimiter(rate=10, burst=5, clock=clock),
+            commands=TokenBucketLimiter(rate=0.5, burst=1, clock=clock),
+            limit_anonymous=True,
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.post("/api/timer/pause")).status_code == 200
+            limited = await client.post("/api/timer/pause")
+            assert limited.status_code == 429
+            assert limited.headers["retry-after"] == "2"
+            assert (await client.get("/api/timer")).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_principal_and_skips_non_api_paths(self, clock):
+        """Each authenticated subject gets its own bucket; probes and metrics are never limited."""
+        app = RateLimitMiddleware(
+            ok,
+            reads=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            commands=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            authenticator=Authenticator(SECRET),
+        )
+        alice = {"Authorization": f"Bearer {issue_token('alice', SECRET)}"}
+        bob = {"Authorization": f"Bearer {issue_token('bob', SECRET)}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/api/timer", headers=alice)).status_code == 200
+            assert (await client.get("/api/timer", headers=alice)).status_code == 429
+            assert (await client.get("/api/timer", headers=bob)).status_code == 200
+            for _ in range(3):
+                assert (await client.get("/health/live")).status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_clients_share_their_address_bucket(self, clock):
+        """Made-up API keys and bad tokens cannot mint fresh buckets."""
+        app = RateLimitMiddleware(
+            ok,
+            reads=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            commands=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            authenticator=Authenticator(SECRET),
+            limit_anonymous=True,
+        )
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            assert (await client.get("/api/timer", headers={"X-API-Key": "a"})).status_code == 200
+            assert (await client.get("/api/timer", headers={"X-API-Key": "b"})).status_code == 429
+            forged = {"Authorization": "Bearer not.a.token"}
+            assert (await client.get("/api/timer", headers=forged)).status_code == 429
+
+    @pytest.mark.asyncio
+    async def test_anonymous_clients_and_preflights_pass_by_default(self, clock):
+        """Displays sharing a NAT are not throttled together, and preflights cost nothing."""
+        app = RateLimitMiddleware(
+            ok,
+            reads=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            commands=TokenBucketLimiter(rate=1, burst=1, clock=clock),
+            authenticator=Authenticator(SECRET),
+        )
+        alice = {"Authorization": f"Bearer {issue_token('alice', SECRET)}"}
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            for _ in range(3):
+                assert (await client.get("/api/timer")).status_code == 200
+                assert (await client.options("/api/timer", headers=alice)).status_code == 200
+            assert (await client.get("/api/timer", headers=alice)).status_code == 200
+            assert (await client.get("/api/timer", headers=alice)).status_code == 429
+
+    def test_trusted_proxy_forwards_the_client_address(self, clock):
+        """Behind a trusted proxy each forwarded client gets its own bucket; others cannot spoof one."""
+        limiter = TokenBucketLimiter(rate=1, burst=1, clock=clock)
+        app = RateLimitMiddleware(
+            ok, reads=limiter, commands=limiter, limit_anonymous=True, trusted_proxies=["10.0.0.0/8"]
+        )
+        scope = {"type": "http", "client": ("10.0.0.2", 1234), "headers": []}
+
+        def forwarded(value, peer="10.0.0.2"):
+            return {**scope, "client": (peer, 1234), "headers": [(b"x-forwarded-for", value.encode())]}
+
+        assert app.client_key(forwarded("203.0.113.9")) == ("address", "203.0.113.9")
+        assert app.client_key(forwarded("198.51.100.1, 203.0.113.9, 10.0.0.7")) == ("address", "203.0.113.9")
+        assert app.client_key(forwarded("203.0.113.9", peer="192.0.2.1")) == ("address", "192.0.2.1")
+        assert app.client_key(scope) == ("address", "10.0.0.2")
+
+    @pytest.mark.asyncio
+    async def test_limited_responses_carry_cors_headers(self, monkeypatch):
+        """The limiter sits inside CORS, so browsers can read 429 and Retry-After."""
+        origin = settings.cors_origins[0]
+        if main_app.middleware_stack is None:
+            main_app.middleware_stack = main_app.build_middleware_stack()
+        layer = main_app.middleware_stack
+        while not isinstance(layer, RateLimitMiddleware):
+            layer = layer.app
+        monkeypatch.setattr(layer, "limit_anonymous", True)
+        set_rate_limiting(True)
+        try:
+            async with AsyncClient(transport=ASGITransport(app=main_app), base_url="http://test") as client:
+                for _ in range(10 * settings.rate_limit_read_burst):
+                    response = await client.get("/api/time", headers={"Origin": origin})
+                    if response.status_code == 429:
+                        break
+                assert response.status_code == 429
+                assert "retry-after" in response.headers
+                assert response.headers["access-control-allow-origin"] == origin
+        finally:
+            set_rate_limiting(settings.rate_limit_enabled)
+            read_limiter._buckets.clear()
@@ -0,0 +1,194 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.archive import TimerArchive, TimerEventArchive
+from app.models.program import IntervalProgram
+from app.models.timer import Timer, TimerCheckpoint, TimerEvent
+from app.models.webhook import WebhookDelivery
+from app.repos.archive_repo import ArchiveRepo
+from app.repos.webhook_repo import WebhookRepo
+from app.services.clock import ManualClock
+from app.services.reaper import TimerReaper
+from benchmarks.harness import stand_in_engine
+
+
+NOW = datetime(2024, 3, 1, 12, 0, 0)
+
+
+def add_timer(db, updated_at, events=(), created_at=None, **fields):
+    """Insert a timer last updated at ``updated_at`` with events at the given times."""
+    timer = Timer(
+        name="Station",
+        duration_seconds=60,
+        remaining_seconds=60,
+        status="stopped",
+        created_at=created_at or updated_at,
+        updated_at=updated_at,
+        **fields,
+    )
+    db.add(timer)
+    db.flush()
+    for sequence, recorded_at in enumerate(events, start=1):
+        db.add(
+            TimerEvent(
+                timer_id=timer.id, event_type="started", recorded_at=recorded_at, sequence=sequence
+            )
+        )
+    db.commit()
+    return timer.id
+
+
+class TestArchiveRepo:
+    """Test moving cold timers into the archive tables."""
+
+    @pytest.mark.asyncio
+    async def test_moves_only_untouched_timers_with_their_events(self):
+        old = NOW - timedelta(days=30)
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with factory() as session:
+
+                def seed(db):
+                    cold = add_timer(db, old, [old, old + timedelta(seconds=5)])
+                    db.add(
+                        TimerCheckpoint(
+                            timer_id=cold, sequence=2, duration_seconds=60,
+                            remaining_seconds=60, status="running",
+                        )
+                    )
+                    db.commit()
+                    # Row untouched, but event-sourced mode only appends events.
+                    evented = add_timer(db, old, [NOW - timedelta(hours=1)])
+                    fresh = add_timer(db, NOW - timedelta(hours=1))
+                    return cold, evented, fresh
+
+                cold, evented, fresh = await session.run_sync(seed)
+                archived, events = await session.run_sync(
+                    lambda db: ArchiveRepo(db).archive_untouched(NOW - timedelta(days=7), 100, NOW)
+                )
+
+                assert archived == [cold]
+                assert events == 2
+                remaining = (await session.execute(select(Timer.id))).scalars().all()
+                assert set(remaining) == {evented, fresh}
+                assert (await session.execute(select(TimerCheckpoint))).first() is None
+
+                archive = await session.get(TimerArchive, cold)
+                assert archive.updated_at == old
+                assert archive.archived_at == NOW
+                moved = await session.run_sync(lambda db: ArchiveRepo(db).get_archived_events(cold))
+                assert [event.sequence for event in moved] == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_keeps_program_timers_and_each_owners_newest(self):
+        old = NOW - timedelta(days=30)
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with factory() as session:
+
+                def seed(db):
+                    program = IntervalProgram(name="Circuit")
+                    db.add(program)
+                    db.flush()
+                    stale = add_timer(db, old, owner_id="alice")
+                    station = add_timer(db, old, created_at=old + timedelta(seconds=1),
+                                        owner_id="alice", program_id=program.id)
+                    alice_newest = add_timer(db, old, created_at=old + timedelta(seconds=2), owner_id="alice")
+                    bob_only = add_timer(db, old, owner_id="bob")
+                    return stale, station, alice_newest, bob_only
+
+                stale, station, alice_newest, bob_only = await session.run_sync(seed)
+                archived, _ = await session.run_sync(
+                    lambda db: ArchiveRepo(db).archive_untouched(NOW - timedelta(days=7), 100, NOW)
+                )
+
+                assert archived == [stale]
+                remaining = (await session.execute(select(Timer.id))).scalars().all()
+                assert set(remaining) == {station, alice_newest, bob_only}
+
+
+class TestTimerReaper:
+    """Test batched archival runs."""
+
+    @pytest.mark.asyncio
+    async def test_run_archives_in_bounded_batches(self):
+        clock = ManualClock(NOW)
+        discarded = []
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with factory() as session:
+                old = NOW - timedelta(days=30)
+                # The newest timer stays behind as the active one.
+                newest = (await session.run_sync(
+                    lambda db: [add_timer(db, old, created_at=old + timedelta(seconds=i)) for i in range(6)]
+                ))[-1]
+            reaper = TimerReaper(
+                factory,
+                retention=timedelta(days=7),
+                batch_size=2,
+                max_batches=2,
+                pause_seconds=0,
+                interval_seconds=60,
+                on_archived=discarded.extend,
+                clock=clock,
+            )
+
+            assert await reaper.run_once() == 4
+            assert await reaper.run_once() == 1
+            assert await reaper.run_once() == 0
+            assert len(set(discarded)) == 5
+            async with factory() as session:
+                assert (await session.execute(select(Timer.id))).scalars().all() == [newest]
+                archived = (await session.execute(select(TimerArchive.id))).scalars().all()
+                assert len(archived) == 5
+                assert (await session.execute(select(TimerEventArchive))).first() is None
+
+    @pytest.mark.asyncio
+    async def test_prunes_retired_deliveries_after_retention(self):
+        clock = ManualClock(NOW)
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            async with factory() as session:
+
+                def seed(db):
+                    timer_id = add_timer(db, NOW)
+                    subscription = WebhookRepo(db).create_subscription(
+                        timer_id, "https://hooks.test/timer", ["expired"]
+                    )
+                    for created_at, next_attempt_at in (
+                        (NOW - timedelta(days=5), None),
+                        (NOW - timedelta(days=5), None),
+                        (NOW - timedelta(days=5), NOW),
+                        (NOW - timedelta(hours=1), None),
+                    ):
+                        db.add(
+                            WebhookDelivery(
+                                subscription_id=subscription.id,
+                                event="expired",
+                                payload="{}",
+                                next_attempt_at=next_attempt_at,
+                                created_at=created_at,
+                            )
+                        )
+                    db.commit()
+
+                await session.run_sync(seed)
+            reaper = TimerReaper(
+                factory,
+                retention=timedelta(days=7),
+                batch_size=1,
+                max_batches=5,
+                pause_seconds=0,
+                interval_seconds=60,
+                clock=clock,
+                retired_delivery_retention=timedelta(days=3),
+                archive=False,
+            )
+
+            assert await reaper.prune_deliveries() == 2
+            async with factory() as session:
+                rows = (await session.execute(select(WebhookDelivery))).scalars().all()
+            assert sorted(row.next_attempt_at is None for row in rows) == [False, True]
@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.database as database
+from app.database import SCHEMA_REVISION, check_schema_version
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path, monkeypatch):
+    """SQLite engine standing in for the app engine."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    monkeypatch.setattr(database, "async_engine", engine)
+    yield engine
+    await engine.dispose()
+
+
+async def stamp(engine, revision: str) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL)"))
+        await conn.execute(text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision})
+
+
+class TestSchemaVersion:
+    """Test the migrations-mode startup check."""
+
+    def test_revision_matches_alembic_head(self):
+        """SCHEMA_REVISION must be bumped with every migration."""
+        config = Config(str(ROOT / "alembic.ini"))
+        config.set_main_option("script_location", str(ROOT / "alembic"))
+        assert SCHEMA_REVISION == ScriptDirectory.from_config(config).get_current_head()
+
+    @pytest.mark.asyncio
+    async def test_current_schema_passes(self, engine):
+        """A database at the head revision starts."""
+        await stamp(engine, SCHEMA_REVISION)
+        await check_schema_version()
+
+    @pytest.mark.asyncio
+    async def test_outdated_schema_fails(self, engine):
+        """An older revision stops startup."""
+        await stamp(engine, "0001")
+        with pytest.raises(RuntimeError, match="at revision 0001"):
+            await check_schema_version()
+
+    @pytest.mark.asyncio
+    async def test_unmigrated_database_fails(self, engine):
+        """A database without alembic_version stops startup."""
+        with pytest.raises(RuntimeError, match="at revision None"):
+            await check_schema_version()
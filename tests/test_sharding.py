@@ -0,0 +1,143 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+
+from app.services.sharding import HashRing, ShardNode, read_frame
+
+
+def recording_handler(name: str, applied: dict):
+    """Batch handler that records which node applied each command."""
+
+    async def apply_local(commands, owner_id):
+        results = []
+        for command in commands:
+            applied[command["id"]] = name
+            results.append({"id": str(command["id"]), "op": command["op"], "ok": True})
+        return results
+
+    return apply_local
+
+
+@pytest_asyncio.fixture
+async def nodes(tmp_path):
+    """Two started nodes sharing a socket directory."""
+    applied = {}
+    a = ShardNode(str(tmp_path), recording_handler("a", applied), name="a")
+    b = ShardNode(str(tmp_path), recording_handler("b", applied), name="b")
+    await a.start()
+    await b.start()
+    a.refresh()
+    yield a, b, applied
+    await a.stop()
+    await b.stop()
+
+
+class TestHashRing:
+    """Test consistent hashing of timer ids onto workers."""
+
+    def test_keys_spread_across_nodes(self):
+        """Every node owns a reasonable share of keys."""
+        ring = HashRing(["w1", "w2", "w3", "w4"])
+        owners = [ring.owner(uuid4()) for _ in range(4000)]
+        for node in ring.nodes:
+            assert 500 < owners.count(node) < 1500
+
+    def test_removing_a_node_only_moves_its_keys(self):
+        """Keys owned by the remaining nodes keep their owner."""
+        ring = HashRing(["w1", "w2", "w3", "w4"])
+        keys = [uuid4() for _ in range(2000)]
+        before = {key: ring.owner(key) for key in keys}
+        ring.remove("w2")
+        for key in keys:
+            if before[key] != "w2":
+                assert ring.owner(key) == before[key]
+            else:
+                assert ring.owner(key) != "w2"
+
+    def test_empty_ring_has_no_owner(self):
+        assert HashRing().owner(uuid4()) is None
+
+
+class TestShardNode:
+    """Test forwarding batches to owning workers over Unix sockets."""
+
+    @pytest.mark.asyncio
+    async def test_commands_applied_by_their_owner(self, nodes):
+        """Each command runs on its ring owner and results keep command order."""
+        a, b, applied = nodes
+        assert a.ring.nodes == {"a", "b"}
+        commands = [{"id": uuid4(), "op": "pause", "args": None} for _ in range(50)]
+
+        results = await a.apply_batch(commands)
+
+        assert [result["id"] for result in results] == [str(c["id"]) for c in commands]
+        assert {applied[c["id"]] for c in commands} == {"a", "b"}
+        for command in commands:
+            assert applied[command["id"]] == a.ring.owner(command["id"])
+
+    @pytest.mark.asyncio
+    async def test_departed_owner_is_dropped_and_commands_rerouted(self, nodes):
+        """A stopped peer leaves the ring and its share is applied elsewhere."""
+        a, b, applied = nodes
+        await b.stop()
+        commands = [{"id": uuid4(), "op": "pause", "args": None} for _ in range(20)]
+
+        results = await a.apply_batch(commands)
+
+        assert all(result["ok"] for result in results)
+        assert a.ring.nodes == {"a"}
+        assert {applied[c["id"]] for c in commands} == {"a"}
+
+    @pytest.mark.asyncio
+    async def test_owner_error_is_reported_without_rerouting(self, nodes):
+        """A peer that fails a batch keeps its place and its commands are not retried."""
+        a, b, applied = nodes
+
+        async def failing(commands, owner_id):
+            raise RuntimeError("database is locked")
+
+        b.apply_local = failing
+        commands = [{"id": uuid4(), "op": "reset", "args": None} for _ in range(20)]
+
+        results = await a.apply_batch(commands)
+
+        assert a.ring.nodes == {"a", "b"}
+        for command, result in zip(commands, results):
+            if a.ring.owner(command["id"]) == "b":
+                assert result["error"] == "Timer owner failed: RuntimeError: database is locked"
+                assert command["id"] not in applied
+            else:
+                assert result["ok"]
+
+    @pytest.mark.asyncio
+    async def test_lost_reply_is_not_resent(self, tmp_path):
+        """A peer that drops the connection after reading a batch may have applied it."""
+        received = []
+
+        async def read_then_hang_up(reader, writer):
+            received.append(await read_frame(reader))
+            writer.close()
+
+        server = await asyncio.start_unix_server(read_then_hang_up, path=str(tmp_path / "c.sock"))
+        applied = {}
+        a = ShardNode(str(tmp_path), recording_handler("a", applied), name="a")
+        await a.start()
+        try:
+            commands = [{"id": uuid4(), "op": "tick", "args": None} for _ in range(20)]
+            results = await a.apply_batch(commands)
+        finally:
+            await a.stop()
+            server.close()
+            await server.wait_closed()
+
+        assert a.ring.nodes == {"a", "c"}
+        assert len(received) == 1
+        for command, result in zip(commands, results):
+            if a.ring.owner(command["id"]) == "c":
+                assert not result["ok"]
+                assert "may have been applied" in result["error"]
+                assert command["id"] not in applied
+            else:
+                assert applied[command["id"]] == "a"
@@ -0,0 +1,45 @@
+from dataclasses import asdict
+
+from app.services.timer_service import TimerService
+from benchmarks.simulation import Simulation, seconds_to_urgency_change
+
+
+def report_without_timing(simulation: Simulation, seconds: int) -> dict:
+    report = asdict(simulation.run(seconds))
+    del report["wall_seconds"], report["speedup"]
+    return report
+
+
+class TestSimulation:
+    """Test the virtual-clock timer simulation."""
+
+    def test_seconds_to_urgency_change(self):
+        """Ticks land on urgency boundaries, then on expiry."""
+        assert seconds_to_urgency_change(60, 60) == 30
+        assert seconds_to_urgency_change(30, 60) == 15
+        assert seconds_to_urgency_change(15, 60) == 15
+        assert seconds_to_urgency_change(7, 60) == 7
+
+    def test_invariants_hold_over_simulated_hours(self):
+        """A few hundred timers over two hours violate no invariant."""
+        report = Simulation(300, seed=3).run(2 * 3600)
+        assert report.violations == []
+        assert report.events["expired"] > 0
+        assert report.events["paused"] > 0
+
+    def test_same_seed_replays_identically(self):
+        """Runs are deterministic for a seed."""
+        assert report_without_timing(Simulation(50, seed=7), 3600) == report_without_timing(
+            Simulation(50, seed=7), 3600
+        )
+
+    def test_detects_late_expiry(self, monkeypatch):
+        """A countdown that loses a second per tick is reported."""
+        tick_timer = TimerService.tick_timer
+        monkeypatch.setattr(
+            TimerService,
+            "tick_timer",
+            lambda self, timer_id, delta_seconds=1: tick_timer(self, timer_id, delta_seconds - 1),
+        )
+        report = Simulation(50, seed=1).run(3600)
+        assert any("due at" in violation for violation in report.violations)
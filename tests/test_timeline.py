@@ -0,0 +1,148 @@
+import uuid
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from app.models.timer import TimerEvent
+from app.schemas.timer import UrgencyLevel
+from app.services.timeline import Timeline, TimelineCache, build_segments
+from benchmarks.harness import app_client, stand_in_engine
+
+
+START = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def event(event_type, offset, remaining, duration=60):
+    """Event recorded ``offset`` seconds after START leaving ``remaining`` seconds."""
+    return TimerEvent(
+        id=uuid.uuid4(),
+        event_type=event_type,
+        recorded_at=START + timedelta(seconds=offset),
+        remaining_seconds=remaining,
+        duration_seconds=duration,
+    )
+
+
+SESSION = [
+    event("started", 0, 60),
+    event("paused", 20, 40),
+    event("started", 30, 40),
+    event("expired", 70, 0),
+    event("reset", 80, 60),
+]
+
+
+class TestTimeline:
+    """Test rebuilding urgency over time from sparse events."""
+
+    def test_segments_follow_transitions(self):
+        segments = build_segments(SESSION)
+        assert [(s.status, s.running) for s in segments] == [
+            ("running", True),
+            ("paused", False),
+            ("running", True),
+            ("expired", False),
+            ("stopped", False),
+        ]
+        assert segments[0].remaining_at(START + timedelta(seconds=15)) == 45
+        assert segments[-1].start == segments[-1].end == START + timedelta(seconds=80)
+
+    def test_countdown_without_expiry_event_stops_at_zero(self):
+        segments = build_segments([event("started", 0, 10), event("reset", 30, 60)])
+        assert [s.status for s in segments] == ["running", "expired", "stopped"]
+        assert segments[1].start == START + timedelta(seconds=10)
+
+    def test_out_of_order_events_are_sorted(self):
+        shuffled = [SESSION[3], SESSION[0], SESSION[4], SESSION[2], SESSION[1]]
+        assert build_segments(shuffled) == build_segments(SESSION)
+        assert all(s.end is None or s.start <= s.end for s in build_segments(shuffled))
+
+    def test_series_keeps_lowest_remaining_and_highest_urgency(self):
+        timeline = Timeline(SESSION)
+        now = START + timedelta(hours=1)
+        points = timeline.series(10, now)
+
+        assert [p["offset_seconds"] for p in points] == list(range(0, 80, 10))
+        assert [p["remaining_seconds"] for p in points] == [50, 40, 40, 30, 20, 10, 0, 0]
+        assert points[0]["urgency_level"] == UrgencyLevel.calm
+        assert points[4]["urgency_level"] == UrgencyLevel.elevated
+        assert points[6]["urgency_level"] == UrgencyLevel.alarm
+        assert points[-1]["status"] == "stopped"
+
+        coarse = timeline.series(80, now)
+        assert len(coarse) == 1
+        assert coarse[0]["remaining_seconds"] == 0
+        assert coarse[0]["urgency_level"] == UrgencyLevel.alarm
+
+    def test_running_timeline_is_not_final_until_it_runs_out(self):
+        timeline = Timeline([event("started", 0, 60)])
+        halfway = START + timedelta(seconds=30)
+        assert not timeline.is_final(halfway)
+        assert timeline.ends_at(halfway) == halfway
+        assert timeline.series(10, halfway)[-1]["remaining_seconds"] == 30
+        assert timeline._series == {}
+
+        later = START + timedelta(hours=1)
+        assert timeline.is_final(later)
+        assert timeline.ends_at(later) == START + timedelta(seconds=60)
+        assert timeline.series(10, later) is timeline.series(10, later)
+
+    def test_too_many_points(self):
+        timeline = Timeline(SESSION, max_points=10)
+        with pytest.raises(ValueError, match="limit is 10"):
+            timeline.series(1, START + timedelta(hours=1))
+        assert timeline.default_resolution(START, 10) == 8
+
+
+class TestTimelineCache:
+    """Test reusing timelines until a timer records another event."""
+
+    def test_rebuilds_only_after_new_events(self):
+        cache = TimelineCache(max_entries=1)
+        repo = Mock()
+        repo.get_last_event_id.return_value = SESSION[-1].id
+        repo.get_timer_events.return_value = SESSION
+        timer_id, other_id = uuid.uuid4(), uuid.uuid4()
+
+        first = cache.load(repo, timer_id)
+        assert cache.load(repo, timer_id) is first
+        assert repo.get_timer_events.call_count == 1
+
+        repo.get_last_event_id.return_value = uuid.uuid4()
+        assert cache.load(repo, timer_id) is not first
+        assert repo.get_timer_events.call_count == 2
+
+        cache.load(repo, other_id)
+        assert len(cache) == 1
+
+
+class TestTimelineRoute:
+    """Test the timeline endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_timeline_of_a_session(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            timer_id = (await client.post("/api/timer", json={"duration": 60})).json()["id"]
+            await client.post("/api/timer/resume")
+            await client.post("/api/timer/pause")
+
+            response = await client.get(f"/api/timer/{timer_id}/timeline", params={"resolution": 5})
+            assert response.status_code == 200
+            body = response.json()
+            assert body["final"] is True
+            assert body["resolution_seconds"] == 5
+            assert body["points"][-1]["status"] == "paused"
+            assert body["points"][-1]["urgency_level"] == UrgencyLevel.calm
+
+            default = (await client.get(f"/api/timer/{timer_id}/timeline")).json()
+            assert default["resolution_seconds"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unknown_timer(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            response = await client.get(f"/api/timer/{uuid.uuid4()}/timeline")
+            assert response.status_code == 404
+            timer_id = (await client.post("/api/timer", json={"duration": 60})).json()["id"]
+            response = await client.get(f"/api/timer/{timer_id}/timeline", params={"resolution": 0})
+            assert response.status_code == 422
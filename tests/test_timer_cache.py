@@ -0,0 +1,170 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import uuid4
+from unittest.mock import Mock, patch
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.timer import Timer
+from app.repos.timer_repo import TimerRepo
+from app.schemas.timer import TimerStatus
+from app.services.clock import ManualClock
+from app.services.snapshot import read_snapshot, write_snapshot
+from app.services.timer_cache import TimerCache, cache_entry
+from benchmarks.harness import stand_in_engine
+
+
+def make_timer(status=TimerStatus.running, remaining=30, updated_at=None):
+    """Create a timer row for cache tests."""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    return Timer(
+        id=uuid4(),
+        name="Station",
+        duration_seconds=60,
+        remaining_seconds=remaining,
+        started_at=now if status == TimerStatus.running else None,
+        paused_at=None,
+        reset_count=0,
+        status=status,
+        created_at=now,
+        updated_at=updated_at or now,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache writing snapshots under a temp directory."""
+    return TimerCache(
+        Mock(),
+        str(tmp_path / "snapshot.bin"),
+        30,
+        ManualClock(datetime(2024, 1, 1, 13, 0, 0)),
+    )
+
+
+class TestSnapshot:
+    """Tests for the binary snapshot format."""
+
+    def test_round_trip(self, tmp_path):
+        """Test snapshots read back exactly what was written."""
+        path = str(tmp_path / "snapshot.bin")
+        timers = [cache_entry(make_timer()), cache_entry(make_timer(TimerStatus.paused))]
+        watermark = datetime(2024, 1, 1, 12, 30, 0, 123456)
+
+        write_snapshot(path, watermark, timers)
+
+        assert read_snapshot(path) == (watermark, timers)
+
+    def test_writers_do_not_share_a_temp_file(self, tmp_path):
+        """Test a stale temp file from another writer is neither clobbered nor left behind by ours."""
+        path = str(tmp_path / "snapshot.bin")
+        (tmp_path / "snapshot.bin.tmp").write_bytes(b"other writer")
+
+        write_snapshot(path, datetime(2024, 1, 1), [cache_entry(make_timer())])
+
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["snapshot.bin", "snapshot.bin.tmp"]
+        assert (tmp_path / "snapshot.bin.tmp").read_bytes() == b"other writer"
+
+    def test_missing_file(self, tmp_path):
+        """Test a missing snapshot reads as None."""
+        assert read_snapshot(str(tmp_path / "missing.bin")) is None
+
+    def test_truncated_file_rejected(self, tmp_path):
+        """Test a partially written snapshot is ignored."""
+        path = str(tmp_path / "snapshot.bin")
+        write_snapshot(path, datetime(2024, 1, 1), [cache_entry(make_timer())])
+        with open(path, "r+b") as f:
+            f.truncate(30)
+
+        assert read_snapshot(path) is None
+
+
+class TestTimerCache:
+    """Tests for cache warm-up and replay."""
+
+    def test_cache_entry_deadline(self):
+        """Test running timers carry their absolute deadline."""
+        timer = make_timer(remaining=30)
+
+        entry = cache_entry(timer)
+
+        assert entry.deadline == timer.started_at + timedelta(seconds=30)
+
+    def test_cold_refresh_scans_active_timers(self, cache):
+        """Test a cache without snapshot loads all active timers."""
+        timers = [make_timer(), make_timer(TimerStatus.stopped)]
+        with patch("app.services.timer_cache.get_timer_repo") as repo_cls:
+            repo_cls.return_value.list_active_timers.return_value = timers
+            cache._refresh(Mock())
+
+        assert len(cache) == 2
+        assert len(cache.running()) == 1
+        assert cache.watermark == datetime(2024, 1, 1, 13, 0, 0)
+
+    def test_warm_refresh_replays_touched_timers_only(self, cache):
+        """Test a loaded snapshot only refetches timers with newer events."""
+        kept, expired = make_timer(), make_timer()
+        cache._timers = {kept.id: cache_entry(kept), expired.id: cache_entry(expired)}
+        cache.watermark = datetime(2024, 1, 1, 12, 30, 0)
+        expired.status = TimerStatus.expired
+        expired.updated_at = datetime(2024, 1, 1, 12, 45, 0)
+
+        with patch("app.services.timer_cache.get_timer_repo") as repo_cls:
+            repo = repo_cls.return_value
+            repo.get_touched_timer_ids.return_value = [(expired.id, expired.updated_at)]
+            repo.get_updated_timer_ids.return_value = []
+            repo.get_timers.return_value = [expired]
+            cache._refresh(Mock())
+
+        repo.list_active_timers.assert_not_called()
+        repo.get_touched_timer_ids.assert_called_once_with(datetime(2024, 1, 1, 12, 29, 55))
+        assert cache.get(kept.id) is not None
+        assert cache.get(expired.id) is None
+
+    @pytest.mark.asyncio
+    async def test_warm_refresh_picks_up_rows_written_without_events(self):
+        """Test new timers and ticks that record no event reach the cache."""
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            cache = TimerCache(factory, "unused.bin", 30)
+            await cache.refresh()
+            assert len(cache) == 0
+
+            async with factory() as session:
+                created = await session.run_sync(lambda db: TimerRepo(db).create_timer(60, "Rower"))
+            await cache.refresh()
+            assert cache.get(created.id).remaining_seconds == 60
+
+            async with factory() as session:
+                await session.run_sync(
+                    lambda db: TimerRepo(db).update_timer(
+                        created.id, remaining_seconds=42, status=TimerStatus.running
+                    )
+                )
+            await cache.refresh()
+            assert cache.get(created.id).remaining_seconds == 42
+
+    def test_apply_ignores_older_versions(self, cache):
+        """Test stale rows never overwrite newer cached state."""
+        timer = make_timer(updated_at=datetime(2024, 1, 1, 12, 10, 0))
+        cache.apply(timer)
+        stale = make_timer(TimerStatus.paused, updated_at=datetime(2024, 1, 1, 12, 5, 0))
+        stale.id = timer.id
+
+        cache.apply(stale)
+
+        assert cache.get(timer.id).status == TimerStatus.running
+
+    @pytest.mark.asyncio
+    async def test_snapshot_reload(self, cache):
+        """Test a saved cache loads back from disk."""
+        timer = make_timer()
+        cache.apply(timer)
+        cache.watermark = datetime(2024, 1, 1, 12, 30, 0)
+        await cache.save_snapshot()
+
+        restored = TimerCache(Mock(), cache.path, 30)
+
+        assert restored.load_snapshot()
+        assert restored.get(timer.id) == cache.get(timer.id)
+        assert restored.watermark == cache.watermark
@@ -2,10 +2,16 @@ import pytest
 from datetime import datetime
 from uuid import uuid4
 from unittest.mock import Mock, MagicMock
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
 
+from app.database import Base
 from app.models.timer import Timer
+from app.repos.timer_repo import TimerRepo
+from app.services.clock import ManualClock
 from app.services.timer_service import TimerService
-from app.schemas.timer import UrgencyLevel, TimerStatus
+from app.schemas.timer import TimerCommand, UrgencyLevel, TimerStatus
 
 
 @pytest.fixture
@@ -417,3 +423,147 @@ class TestTimerServiceUrgency:
         assert "facial_expression" in response
         assert response["colour_intensity"] == 0.7
         assert isinstance(response["facial_expression"], str)
+
+
+class TestTimerServiceBatch:
+    """Tests for batch command application."""
+
+    def test_apply_batch_single_load_and_commit(self, timer_service, mock_repo, sample_timer):
+        """Test batch loads timers once and writes events in one commit."""
+        mock_repo.get_timers.return_value = [sample_timer]
+
+        results = timer_service.apply_batch([
+            {"id": sample_timer.id, "op": "start", "args": {}},
+            {"id": sample_timer.id, "op": "pause", "args": {}},
+        ])
+
+        assert [r["ok"] for r in results] == [True, True]
+        assert results[0]["timer"]["status"] == TimerStatus.running
+        assert results[1]["timer"]["status"] == TimerStatus.paused
+        mock_repo.get_timers.assert_called_once()
+        mock_repo.save_batch.assert_called_once()
+        events = mock_repo.save_batch.call_args.args[0]
+        assert [e["event_type"] for e in events] == ["started", "paused"]
+        mock_repo.update_timer.assert_not_called()
+        mock_repo.record_event.assert_not_called()
+
+    def test_apply_batch_statements_do_not_grow_with_timers(self):
+        """Test updates and events each go out as one executemany statement."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        service = TimerService(TimerRepo(sessionmaker(bind=engine, expire_on_commit=False)()))
+        ids = [service.create_timer(60).id for _ in range(20)]
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, parameters, context, executemany: statements.append(
+                (statement.split()[0], executemany)
+            ),
+        )
+
+        service.apply_batch([{"id": timer_id, "op": "start"} for timer_id in ids])
+
+        writes = [entry for entry in statements if entry[0] in ("UPDATE", "INSERT")]
+        assert writes == [("UPDATE", True), ("INSERT", True)]
+
+    def test_apply_batch_reports_failures_in_order(self, timer_service, mock_repo, sample_timer):
+        """Test unknown timers and invalid transitions fail individually."""
+        mock_repo.get_timers.return_value = [sample_timer]
+        missing_id = uuid4()
+
+        results = timer_service.apply_batch([
+            {"id": missing_id, "op": "start", "args": {}},
+            {"id": sample_timer.id, "op": "pause", "args": {}},
+            {"id": sample_timer.id, "op": "reset", "args": {"duration_seconds": 90}},
+        ])
+
+        assert results[0] == {"id": str(missing_id), "op": "start", "ok": False, "error": "Timer not found"}
+        assert results[1]["ok"] is False
+        assert results[2]["ok"] is True
+        assert results[2]["timer"]["remaining_seconds"] == 90
+        assert results[2]["timer"]["reset_count"] == 1
+
+    def test_apply_batch_tick_to_expiry(self, timer_service, mock_repo, sample_timer):
+        """Test tick command records expiry only when reaching zero."""
+        sample_timer.status = TimerStatus.running
+        sample_timer.remaining_seconds = 2
+        mock_repo.get_timers.return_value = [sample_timer]
+
+        results = timer_service.apply_batch([
+            {"id": sample_timer.id, "op": "tick", "args": {}},
+            {"id": sample_timer.id, "op": "tick", "args": {"delta_seconds": 5}},
+        ])
+
+        assert results[0]["timer"]["remaining_seconds"] == 1
+        assert results[1]["timer"]["status"] == TimerStatus.expired
+        events = mock_repo.save_batch.call_args.args[0]
+        assert [e["event_type"] for e in events] == ["expired"]
+
+    def test_apply_batch_rejects_non_positive_tick(self, timer_service, mock_repo, sample_timer):
+        """Test a tick that would add time fails alone and leaves the timer untouched."""
+        sample_timer.status = TimerStatus.running
+        sample_timer.remaining_seconds = 30
+        mock_repo.get_timers.return_value = [sample_timer]
+
+        results = timer_service.apply_batch([
+            {"id": sample_timer.id, "op": "tick", "args": {"delta_seconds": -100}},
+            {"id": sample_timer.id, "op": "tick", "args": {"delta_seconds": 0}},
+            {"id": sample_timer.id, "op": "tick", "args": {}},
+        ])
+
+        assert [r["ok"] for r in results] == [False, False, True]
+        assert results[0]["error"] == "delta_seconds must be at least 1"
+        assert results[2]["timer"]["remaining_seconds"] == 29
+
+    def test_command_args_are_typed(self):
+        """Test batch arguments reject unknown keys and out-of-range durations."""
+        command = TimerCommand(id=uuid4(), op="reset", args={"duration_seconds": 90})
+        assert command.model_dump(exclude_none=True)["args"] == {"duration_seconds": 90}
+        for args in ({"duration_seconds": 0}, {"duration_seconds": 4000}, {"seconds": 5}):
+            with pytest.raises(ValidationError):
+                TimerCommand(id=uuid4(), op="reset", args=args)
+
+
+class TestTimerServiceClock:
+    """Tests for injected time source."""
+
+    def test_start_timer_uses_injected_clock(self, mock_repo, sample_timer):
+        """Test transitions are stamped from the service clock."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        clock.advance(30)
+        service = TimerService(mock_repo, clock)
+        mock_repo.get_timer.return_value = sample_timer
+        mock_repo.update_timer.return_value = sample_timer
+
+        service.start_timer(sample_timer.id)
+
+        kwargs = mock_repo.update_timer.call_args.kwargs
+        assert kwargs["started_at"] == datetime(2024, 1, 1, 12, 0, 30)
+
+    def test_manual_clock_deadline_translation(self):
+        """Test wall-clock deadlines map onto the monotonic timeline."""
+        clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+        clock.advance(5)
+
+        assert clock.monotonic_deadline(datetime(2024, 1, 1, 12, 0, 15)) == 15.0
+
+
+class TestTimerServiceCompactState:
+    """Tests for the compact polling representation."""
+
+    def test_compact_state_fields(self, timer_service, mock_repo, sample_timer):
+        """Test compact state carries remaining, status, urgency and epoch-ms version."""
+        sample_timer.remaining_seconds = 10
+        sample_timer.duration_seconds = 60
+        sample_timer.updated_at = datetime(1970, 1, 1, 0, 0, 1, 500000)
+        mock_repo.get_active_timer.return_value = sample_timer
+
+        state = timer_service.get_compact_state()
+
+        assert state == {
+            "remaining": 10,
+            "status": "stopped",
+            "urgency": int(UrgencyLevel.anxious),
+            "version": 1500,
+        }
@@ -0,0 +1,320 @@
+import hashlib
+import hmac
+import json
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models.timer import Timer
+from app.models.webhook import WebhookDelivery
+from app.repos.event_store_repo import EventSourcedTimerRepo
+from app.repos.program_repo import ProgramRepo
+from app.repos.timer_repo import TimerRepo
+from app.repos.webhook_repo import WebhookRepo
+from app.services.clock import ManualClock
+from app.services.program_service import ProgramService
+from app.services.timer_service import TimerService
+from app.routers import webhooks as webhooks_router
+from app.services.webhooks import (
+    SIGNATURE_HEADER,
+    UnsafeDestination,
+    WebhookDispatcher,
+    check_destination,
+)
+from benchmarks.harness import app_client, stand_in_engine
+
+
+def later():
+    """Clock just past the real time that transitions are recorded at."""
+    return ManualClock(datetime.utcnow() + timedelta(minutes=1))
+
+
+class Receiver:
+    """Webhook endpoint answering with queued status codes, 200 once they run out."""
+
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return httpx.Response(self.statuses.pop(0) if self.statuses else 200)
+
+    def events(self, index=-1):
+        return [delivery["event"] for delivery in json.loads(self.requests[index].content)["deliveries"]]
+
+
+async def seed(factory, events=("alarm", "expired"), secret=None, url="http://hooks.test/timer"):
+    """Create a running 2-second timer subscribed to ``events``."""
+    async with factory() as session:
+
+        def _seed(db):
+            timer = Timer(name="Station", duration_seconds=2, remaining_seconds=2, status="stopped")
+            db.add(timer)
+            db.commit()
+            WebhookRepo(db).create_subscription(timer.id, url, events, secret)
+            return timer.id
+
+        return await session.run_sync(_seed)
+
+
+async def transition(factory, call):
+    async with factory() as session:
+        return await session.run_sync(lambda db: call(TimerService(TimerRepo(db))))
+
+
+async def outbox(factory):
+    async with factory() as session:
+        return (await session.execute(select(WebhookDelivery))).scalars().all()
+
+
+def resolver(*addresses):
+    """Resolver answering every host with ``addresses``."""
+    async def resolve(host, port):
+        return list(addresses)
+    return resolve
+
+
+def dispatcher(factory, receiver, clock, **kwargs):
+    kwargs.setdefault("resolve", resolver("93.184.216.34"))
+    return WebhookDispatcher(factory, transport=httpx.MockTransport(receiver), clock=clock, **kwargs)
+
+
+class TestStaging:
+    """Test writing outbox rows with the transitions that fire them."""
+
+    @pytest.mark.asyncio
+    async def test_expiry_fires_expired_and_alarm(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory)
+            await transition(factory, lambda service: service.start_timer(timer_id))
+            await transition(factory, lambda service: service.tick_timer(timer_id))
+            assert await outbox(factory) == []
+
+            await transition(factory, lambda service: service.tick_timer(timer_id))
+            rows = await outbox(factory)
+            assert sorted(row.event for row in rows) == ["alarm", "expired"]
+            payload = json.loads(rows[0].payload)
+            assert payload["timer_id"] == str(timer_id)
+            assert payload["urgency_level"] == "alarm"
+            assert payload["remaining_seconds"] == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_commands_stage_in_their_transaction(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory, events=("started", "paused"))
+            async with factory() as session:
+                await session.run_sync(
+                    lambda db: TimerRepo(db).save_batch(
+                        [
+                            {"timer_id": timer_id, "event_type": "started", "urgency_level": 0},
+                            {"timer_id": timer_id, "event_type": "reset", "urgency_level": 0},
+                        ]
+                    )
+                )
+            assert [row.event for row in await outbox(factory)] == ["started"]
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("event_sourced", [False, True])
+    async def test_finished_program_stages_expiry_of_its_timers(self, event_sourced):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory)
+            clock = ManualClock(datetime(2024, 1, 1, 12, 0, 0))
+
+            def run_program(db):
+                timers = EventSourcedTimerRepo(db, clock=clock) if event_sourced else TimerRepo(db)
+                service = ProgramService(ProgramRepo(db, timers))
+                program = service.create_program(
+                    "Circuit", [{"name": "Work", "kind": "work", "duration_seconds": 30}],
+                    timer_ids=[timer_id],
+                )
+                service.start_program(program.id, clock.now())
+                return service.advance_program(program.id, clock.now() + timedelta(seconds=30))
+
+            async with factory() as session:
+                program = await session.run_sync(run_program)
+
+            assert program.status == "finished"
+            rows = await outbox(factory)
+            assert sorted(row.event for row in rows) == ["alarm", "expired"]
+            assert {json.loads(row.payload)["timer_id"] for row in rows} == {str(timer_id)}
+
+
+class TestDestinations:
+    """Test refusing endpoints on the server's own network."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "address", ["127.0.0.1", "10.1.2.3", "192.168.0.10", "169.254.169.254", "::1", "fd00::1"]
+    )
+    async def test_non_public_addresses_are_refused(self, address):
+        with pytest.raises(UnsafeDestination, match="non-public"):
+            await check_destination("https://hooks.test/timer", resolve=resolver("93.184.216.34", address))
+
+    @pytest.mark.asyncio
+    async def test_public_and_allowed_hosts_pass(self):
+        await check_destination("https://hooks.test/timer", resolve=resolver("93.184.216.34"))
+        await check_destination(
+            "http://Receiver.internal:8080/", ["receiver.internal"], resolver("10.0.0.5")
+        )
+        with pytest.raises(UnsafeDestination, match="non-public"):
+            await check_destination("http://127.0.0.1:8000/admin")
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_host_is_refused(self):
+        async def fail(host, port):
+            raise OSError("Name or service not known")
+
+        with pytest.raises(UnsafeDestination, match="Cannot resolve"):
+            await check_destination("https://hooks.test/timer", resolve=fail)
+
+
+class TestDispatcher:
+    """Test delivering the outbox over HTTP."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_one_signed_post(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory, events=("started", "paused", "reset"), secret="s3cret-key")
+            for call in ("start_timer", "pause_timer", "reset_timer"):
+                await transition(factory, lambda service: getattr(service, call)(timer_id))
+            receiver = Receiver()
+            worker = dispatcher(factory, receiver, later())
+            try:
+                assert await worker.dispatch_once() == 3
+            finally:
+                await worker.close()
+
+            assert len(receiver.requests) == 1
+            assert receiver.events() == ["started", "paused", "reset"]
+            request = receiver.requests[0]
+            expected = hmac.new(b"s3cret-key", request.content, hashlib.sha256).hexdigest()
+            assert request.headers[SIGNATURE_HEADER] == f"sha256={expected}"
+            assert await outbox(factory) == []
+
+    @pytest.mark.asyncio
+    async def test_failures_back_off_then_retire(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory, events=("started",))
+            await transition(factory, lambda service: service.start_timer(timer_id))
+            clock = later()
+            receiver = Receiver(500, 500, 500)
+            worker = dispatcher(
+                factory, receiver, clock, max_attempts=2, backoff_seconds=10, failure_threshold=10
+            )
+            try:
+                await worker.dispatch_once()
+                (row,) = await outbox(factory)
+                assert row.attempts == 1 and row.last_error == "HTTP 500"
+                assert clock.now() + timedelta(seconds=5) <= row.next_attempt_at
+                assert row.next_attempt_at <= clock.now() + timedelta(seconds=10)
+
+                assert await worker.dispatch_once() == 0
+                clock.advance(10)
+                await worker.dispatch_once()
+                (row,) = await outbox(factory)
+                assert row.attempts == 2 and row.next_attempt_at is None
+
+                clock.advance(3600)
+                assert await worker.dispatch_once() == 0
+            finally:
+                await worker.close()
+            assert len(receiver.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_postpones_without_requests(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory, events=("started", "paused"))
+            clock = later()
+            receiver = Receiver(503)
+            worker = dispatcher(
+                factory, receiver, clock, failure_threshold=1, reset_timeout_seconds=60, backoff_seconds=1
+            )
+            try:
+                await transition(factory, lambda service: service.start_timer(timer_id))
+                await worker.dispatch_once()
+                await transition(factory, lambda service: service.pause_timer(timer_id))
+                clock.advance(5)
+                assert await worker.dispatch_once() == 2
+                assert len(receiver.requests) == 1
+                rows = await outbox(factory)
+                assert {row.last_error for row in rows} == {"circuit open"}
+                assert {row.attempts for row in rows} == {0, 1}
+
+                clock.advance(60)
+                await worker.dispatch_once()
+            finally:
+                await worker.close()
+            assert receiver.events() == ["started", "paused"]
+            assert await outbox(factory) == []
+
+
+    @pytest.mark.asyncio
+    async def test_destination_now_private_is_retired_without_request(self):
+        async with stand_in_engine() as engine:
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            timer_id = await seed(factory, events=("started",))
+            await transition(factory, lambda service: service.start_timer(timer_id))
+            receiver = Receiver()
+            worker = dispatcher(factory, receiver, later(), resolve=resolver("169.254.169.254"))
+            try:
+                assert await worker.dispatch_once() == 1
+            finally:
+                await worker.close()
+            assert receiver.requests == []
+            (row,) = await outbox(factory)
+            assert row.next_attempt_at is None
+            assert "non-public" in row.last_error
+
+
+@pytest.fixture
+def example_hosts(monkeypatch):
+    """Let routes register receivers on the unresolvable example.test host."""
+    monkeypatch.setattr(webhooks_router.settings, "webhook_allowed_hosts", ["example.test"])
+
+
+@pytest.mark.usefixtures("example_hosts")
+class TestWebhookRoutes:
+    """Test managing subscriptions."""
+
+    @pytest.mark.asyncio
+    async def test_subscribe_list_and_delete(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            timer_id = (await client.post("/api/timer", json={"duration": 60})).json()["id"]
+            path = f"/api/timer/{timer_id}/webhooks"
+
+            created = await client.post(path, json={"url": "https://example.test/hook", "secret": "long-secret"})
+            assert created.status_code == 201
+            body = created.json()
+            assert body["events"] == ["alarm", "expired"]
+            assert body["signed"] is True
+            assert "secret" not in body
+
+            assert [hook["id"] for hook in (await client.get(path)).json()] == [body["id"]]
+            assert (await client.delete(f"{path}/{body['id']}")).status_code == 204
+            assert (await client.get(path)).json() == []
+            assert (await client.delete(f"{path}/{body['id']}")).status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_rejects_unknown_timers_and_bad_urls(self):
+        async with stand_in_engine() as engine, app_client(engine) as client:
+            timer_id = (await client.post("/api/timer", json={"duration": 60})).json()["id"]
+            missing = "00000000-0000-0000-0000-000000000000"
+            hook = {"url": "https://example.test/hook"}
+            assert (await client.post(f"/api/timer/{missing}/webhooks", json=hook)).status_code == 404
+            response = await client.post(f"/api/timer/{timer_id}/webhooks", json={"url": "ftp://x"})
+            assert response.status_code == 422
+            for url in ("http://127.0.0.1:8000/", "http://169.254.169.254/latest/meta-data"):
+                response = await client.post(f"/api/timer/{timer_id}/webhooks", json={"url": url})
+                assert response.status_code == 400
+                assert "non-public" in response.json()["detail"]
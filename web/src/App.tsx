@@ -4,6 +4,7 @@ import { TimerDisplay } from './components/TimerDisplay';
 import { ControlButtons } from './components/ControlButtons';
 import { SettingsPanel } from './components/SettingsPanel';
 import { intensityToBackground } from './utils/colour';
+import { faceImageUrl } from './api';
 import './App.css';
 
 export function App(): JSX.Element {
@@ -64,6 +65,9 @@ export function App(): JSX.Element {
         {error && <div className="error-banner">{error}</div>}
 
         <div className="face-section">
+          {urgencyState.face_url && (
+            <img className="face-image" src={faceImageUrl(urgencyState.face_url)} alt={facialState} />
+          )}
           <div className="facial-state">{facialState}</div>
         </div>
 
@@ -5,6 +5,8 @@ import {
   TimerConfigRequest,
   TimerResponse,
   UrgencyResponse,
+  ServerTime,
+  CompactTimerState,
 } from './types';
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api';
@@ -16,6 +18,14 @@ const client: AxiosInstance = axios.create({
   },
 });
 
+export function setAuthToken(token: string | null): void {
+  if (token) {
+    client.defaults.headers.common['Authorization'] = `Bearer ${token}`;
+  } else {
+    delete client.defaults.headers.common['Authorization'];
+  }
+}
+
 export async function getTimerState(): Promise<TimerState> {
   const response = await client.get<TimerResponse>('/timer');
   return response.data as TimerState;
@@ -47,4 +57,39 @@ export async function getUrgency(): Promise<UrgencyState> {
   return response.data as UrgencyState;
 }
 
+/**
+ * Minimal polling state; ``version`` changes whenever the timer does.
+ */
+export async function getCompactState(): Promise<CompactTimerState> {
+  const response = await client.get<CompactTimerState>('/timer', {
+    params: { compact: true },
+  });
+  return response.data;
+}
+
+export async function getServerTime(): Promise<ServerTime> {
+  const response = await client.get<ServerTime>('/time', {
+    params: { client_time_ms: Date.now() },
+  });
+  return response.data;
+}
+
+/**
+ * Estimate server clock offset in milliseconds (server minus client),
+ * assuming a symmetric round trip.
+ */
+export async function estimateClockOffset(): Promise<number> {
+  const sentAt = Date.now();
+  const { epoch_ms } = await getServerTime();
+  const receivedAt = Date.now();
+  return epoch_ms - (sentAt + (receivedAt - sentAt) / 2);
+}
+
+/**
+ * Absolute URL of a server-rendered face; ``path`` is an urgency ``face_url``.
+ */
+export function faceImageUrl(path: string): string {
+  return new URL(path, API_BASE_URL).toString();
+}
+
 export default client;
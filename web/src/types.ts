@@ -34,6 +34,7 @@ export interface UrgencyState {
   colour_intensity: number;
   remaining_percent: number;
   facial_expression: FacialState;
+  face_url?: string;
 }
 
 /**
@@ -71,6 +72,7 @@ export interface UrgencyResponse {
   colour_intensity: number;
   remaining_percent: number;
   facial_expression: FacialState;
+  face_url?: string;
 }
 
 /**
@@ -88,6 +90,25 @@ export interface TimerEvent {
   timer_state: TimerState;
 }
 
+/**
+ * Compact polling state from /timer?compact=true; version is epoch ms.
+ */
+export interface CompactTimerState {
+  remaining: number;
+  status: 'stopped' | 'running' | 'paused' | 'expired';
+  urgency: number;
+  version: number;
+}
+
+/**
+ * Response from /time endpoint.
+ */
+export interface ServerTime {
+  epoch_ms: number;
+  server_time: string;
+  client_time_ms: number | null;
+}
+
 /**
  * Generic API error response.
  */